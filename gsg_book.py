@@ -0,0 +1,119 @@
+"""Build an opening book offline: deep searches of the first turns, saved for every game.
+
+Plays AI-vs-AI games from derived seeds up to turn --turns with a wider and deeper
+BeamSearchAI than games use, and books the turn it plays from each new position
+(gsg_sim.OpeningBook). Positions the book already knows are played from it, so a
+rerun extends the book instead of redoing it. The book is tied to the decks it was
+built from: built or read with other decks, it starts over.
+
+    python gsg_book.py build openings.db --games 500 --turns 4 --width 4 --depth 3
+    python gsg_book.py info openings.db
+    python gsg_sim.py --ai both --spectate --book openings.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from gsg_sim import (
+    BeamSearchAI,
+    Card,
+    GameState,
+    OpeningBook,
+    ai_take_turn,
+    derive_seed,
+    end_of_turn,
+    load_decks,
+    reset_game,
+    setup_game,
+    start_of_turn,
+)
+
+
+@dataclass
+class BuildStats:
+    games: int = 0
+    searched: int = 0  # positions searched and booked
+    booked: int = 0  # positions played from the book
+    seconds: float = 0.0
+
+
+def build_book(
+    book: OpeningBook,
+    narc: List[Card],
+    pcu: List[Card],
+    *,
+    games: int = 100,
+    seed: int = 0,
+    ai: Optional[BeamSearchAI] = None,
+) -> BuildStats:
+    """Play `games` games up to book.max_turn, booking every turn not yet in the book."""
+    ai = ai or BeamSearchAI(width=4, depth=3)
+    stats = BuildStats()
+    started = time.perf_counter()
+    gs: Optional[GameState] = None
+    for i in range(games):
+        game_seed = derive_seed(seed, "book", i)
+        if gs is None:
+            gs = setup_game(narc, pcu, seed=game_seed)
+        reset_game(gs, seed=game_seed)
+        with gs.quiet():
+            start_of_turn(gs)
+            while gs.turn_number <= book.max_turn and gs.result is None:
+                p = gs.turn_player
+                if book.lookup(gs, p) is None:
+                    book.record_turn(gs, p, ai)
+                    stats.searched += 1
+                else:
+                    ai_take_turn(gs, p, ai, book=book)
+                    stats.booked += 1
+                if gs.result is None:
+                    end_of_turn(gs)
+        stats.games += 1
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or inspect an AI opening book")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="search the opening turns of many games into the book")
+    b.add_argument("book")
+    b.add_argument("--games", type=int, default=100)
+    b.add_argument("--seed", type=int, default=0)
+    b.add_argument("--turns", type=int, default=4, help="book positions up to this turn")
+    b.add_argument("--width", type=int, default=4)
+    b.add_argument("--depth", type=int, default=3)
+    b.add_argument("--max-entries", type=int, default=100_000)
+    i = sub.add_parser("info", help="size and decks of a book")
+    i.add_argument("book")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "info":
+        book = OpeningBook(args.book)
+        print(f"{args.book}: {len(book)} positions, decks {book.deck_hash or '-'}")
+        book.close()
+        return 0
+    book = OpeningBook(args.book, max_entries=args.max_entries, max_turn=args.turns)
+    try:
+        stats = build_book(
+            book,
+            *load_decks(),
+            games=args.games,
+            seed=args.seed,
+            ai=BeamSearchAI(width=args.width, depth=args.depth),
+        )
+        print(
+            f"{stats.games} games: {stats.searched} positions searched, {stats.booked} from"
+            f" the book, {len(book)} booked ({stats.seconds:.1f}s)"
+        )
+    finally:
+        book.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+"""Per-card impact statistics gathered while games are simulated.
+
+CardStatsCollector observes a game's event bus (gs.events.observe) and keeps a few
+counters per card for the game in progress: whether it was in play, wind enemies put on it,
+abilities it used and squad leaders it finished off. When end_game() is called, it folds
+those counters into CardStats. CardStats holds streaming accumulators (counts, and
+means and variances by Welford's method) that merge exactly across workers, so a sweep
+never keeps game logs. The bus mutes observers during AI search, so only moves actually
+played are counted.
+
+    collector = CardStatsCollector()
+    collector.begin_game(gs)
+    winner = simulate_game(gs)
+    collector.end_game(gs, winner)
+    print(format_report(collector.stats))
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from gsg_sim import EventKind, GameEvent, GameState, card_template_id, is_squad_leader
+
+
+@dataclass
+class RunningStats:
+    """Count, mean and variance of a stream of numbers; merge() combines two streams."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.n:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta * delta * self.n * other.n / n
+            self.n = n
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class CardImpact:
+    games: int = 0  # games in which the card was in play
+    wins: int = 0  # ... and its side won
+    leader_kills: int = 0  # squad leaders destroyed while its ability resolved
+    wind: RunningStats = field(default_factory=RunningStats)  # enemy wind received per game
+    uses: RunningStats = field(default_factory=RunningStats)  # ability uses per game
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    def merge(self, other: "CardImpact") -> "CardImpact":
+        self.games += other.games
+        self.wins += other.wins
+        self.leader_kills += other.leader_kills
+        self.wind.merge(other.wind)
+        self.uses.merge(other.uses)
+        return self
+
+
+@dataclass
+class CardStats:
+    """CardImpact per card template id ("NARC:Krax"), over the games folded in."""
+
+    games: int = 0
+    cards: Dict[str, CardImpact] = field(default_factory=dict)
+
+    def card(self, tid: str) -> CardImpact:
+        impact = self.cards.get(tid)
+        if impact is None:
+            impact = self.cards[tid] = CardImpact()
+        return impact
+
+    def merge(self, other: "CardStats") -> "CardStats":
+        self.games += other.games
+        for tid, impact in other.cards.items():
+            self.card(tid).merge(impact)
+        return self
+
+    def to_json(self) -> Dict[str, Any]:
+        def acc(r: RunningStats) -> List[float]:
+            return [r.n, r.mean, r.m2]
+
+        return {
+            "games": self.games,
+            "cards": {
+                tid: [c.games, c.wins, c.leader_kills, acc(c.wind), acc(c.uses)]
+                for tid, c in self.cards.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "CardStats":
+        cards = {
+            tid: CardImpact(g, w, k, RunningStats(*wind), RunningStats(*uses))
+            for tid, (g, w, k, wind, uses) in data["cards"].items()
+        }
+        return cls(data["games"], cards)
+
+
+class CardStatsCollector:
+    """Bus observer that turns one game at a time into CardStats."""
+
+    def __init__(self, stats: Optional[CardStats] = None):
+        self.stats = stats if stats is not None else CardStats()
+        self._game: Dict[int, List[Any]] = {}  # id(card) -> [tid, side, wind, uses]
+        self._acting: Optional[Tuple[int, str]] = None  # (id(card), side) last to act
+        self._kills: List[str] = []
+        self._gs: Optional[GameState] = None
+
+    def _entry(self, card, side: str) -> List[Any]:
+        entry = self._game.get(id(card))
+        if entry is None:
+            entry = self._game[id(card)] = [card_template_id(card), side, 0, 0]
+        return entry
+
+    def begin_game(self, gs: GameState) -> None:
+        """Start counting gs (attaches to its bus; the cards already in play count)."""
+        self.end_game(None, None)
+        self._game.clear()
+        self._kills.clear()
+        self._acting = None
+        self._gs = gs
+        for p in (gs.p1, gs.p2):
+            for c in p.board:
+                self._entry(c, p.name)
+        gs.events.observe(self.on_event)
+
+    def on_event(self, event: GameEvent) -> None:
+        kind = event.kind
+        if kind is EventKind.WIND_RECEIVED:
+            # only enemy wind: deploy costs paid from its own board are emitted too
+            if event.source is not None and event.source is not event.owner:
+                self._entry(event.card, event.owner.name)[2] += event.amount
+        elif kind is EventKind.ABILITY_USED:
+            self._entry(event.card, event.owner.name)[3] += 1
+            self._acting = (id(event.card), event.owner.name)
+        elif kind is EventKind.DEPLOY:
+            self._entry(event.card, event.owner.name)
+        elif kind is EventKind.DESTROY and is_squad_leader(event.card):
+            # credited to the enemy ability being resolved (gs.acting), if any
+            acting = self._acting
+            if acting and self._gs.acting and acting[1] != event.owner.name:
+                self._kills.append(self._game[acting[0]][0])
+
+    def end_game(self, gs: Optional[GameState], winner: Optional[str]) -> None:
+        """Fold the game into stats; winner is the winning side's name (None: no winner)."""
+        if self._gs is not None:
+            self._gs.events.unobserve(self.on_event)
+        self._gs = None
+        if gs is None:
+            return
+        stats = self.stats
+        stats.games += 1
+        for tid, side, wind, uses in self._game.values():
+            impact = stats.card(tid)
+            impact.games += 1
+            impact.wins += side == winner
+            impact.wind.add(wind)
+            impact.uses.add(uses)
+        for tid in self._kills:
+            stats.card(tid).leader_kills += 1
+        self._game.clear()
+
+
+def format_report(stats: CardStats, top: int = 20, min_games: int = 1) -> str:
+    rows = [(tid, c) for tid, c in stats.cards.items() if c.games >= min_games]
+    rows.sort(key=lambda r: (-r[1].win_rate, r[0]))
+    lines = [
+        f"{stats.games} games",
+        f"{'card':<32} {'games':>7} {'win%':>6} {'wind/g':>12} {'uses/g':>12} {'SL kills':>8}",
+    ]
+    for tid, c in rows[:top]:
+        lines.append(
+            f"{tid:<32} {c.games:>7} {c.win_rate:>6.1%} "
+            f"{c.wind.mean:>6.2f}±{c.wind.stdev:<5.2f} {c.uses.mean:>6.2f}±{c.uses.stdev:<5.2f} "
+            f"{c.leader_kills:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,360 @@
+"""Engine fuzzer: random legal and illegal actions from seeded games, invariants checked
+after every step.
+
+Each game starts from setup_game(seed) and applies a stream of random actions: deploys
+(plain and with explicit cost payments), ability uses with random sources and targets,
+wind payments and turn ends. Indexes are mostly in range, sometimes out of range, and
+a share of actions are taken for the seat that is not on turn. After each action the
+game is checked (every card in exactly one zone, wind and resources in range, triggers
+attached only to cards in play, ...). A run stops when the game has a result. Any
+exception, or a broken invariant, is a failure. Failing action sequences are shrunk by delta
+debugging to a minimal one that fails the same way, and can be replayed with
+replay(seed, actions).
+
+    python gsg_fuzz.py --games 2000 --steps 300 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from gsg_sim import (
+    CounterRNG,
+    GameState,
+    Player,
+    board_keys,
+    build_cards,
+    deploy_from_hand,
+    deploy_with_cost,
+    distribute_wind,
+    end_of_turn,
+    load_deck_json,
+    reset_game,
+    setup_game,
+    start_of_turn,
+    use_ability,
+)
+
+FuzzAction = Tuple[Any, ...]  # ("deploy", seat, hand_idx), ("use", seat, src, abil, tgt), ...
+
+_KINDS = ("deploy", "deploy_cost", "use", "wind", "end")
+_WEIGHTS = (3, 1, 5, 1, 1)
+_WRONG_SEAT = 0.1  # share of actions taken for the seat that is not on turn
+_WILD_INDEX = 0.15  # share of indexes drawn from outside the valid range
+
+
+class InvariantError(AssertionError):
+    """The game reached a state the engine should never produce."""
+
+
+@dataclass
+class FuzzFailure:
+    seed: int
+    actions: List[FuzzAction]
+    error: str
+    signature: str  # exception type and the engine line it was raised at
+
+    def __str__(self) -> str:
+        steps = "\n".join(f"  {i:>3}: {a!r}" for i, a in enumerate(self.actions))
+        return f"seed {self.seed}: {self.error}\n  [{self.signature}]\n{steps}"
+
+
+@dataclass
+class FuzzReport:
+    games: int = 0
+    steps: int = 0
+    seconds: float = 0.0
+    failures: Dict[str, FuzzFailure] = field(default_factory=dict)  # signature -> shortest
+
+    def add(self, failure: FuzzFailure) -> None:
+        known = self.failures.get(failure.signature)
+        if known is None or len(failure.actions) < len(known.actions):
+            self.failures[failure.signature] = failure
+
+    def merge(self, other: "FuzzReport") -> "FuzzReport":
+        self.games += other.games
+        self.steps += other.steps
+        for f in other.failures.values():
+            self.add(f)
+        return self
+
+
+# --- Games and actions ---
+_DECKS: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+_GAME: Optional[GameState] = None  # reused across games via reset_game
+
+
+def _init_worker(decks: Tuple[Dict[str, Any], Dict[str, Any]]) -> None:
+    global _DECKS, _GAME
+    _DECKS, _GAME = decks, None
+
+
+def load_raw_decks(folder: str = ".") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    return (
+        load_deck_json(os.path.join(folder, "narc_deck.json")),
+        load_deck_json(os.path.join(folder, "pcu_deck.json")),
+    )
+
+
+def new_game(seed: int) -> GameState:
+    """The opening position for seed. Each call resets and returns the same GameState."""
+    global _GAME
+    first = "p1" if seed % 2 else "p2"
+    if _GAME is None:
+        narc, pcu = _DECKS
+        _GAME = setup_game(
+            build_cards(narc, faction="NARC"),
+            build_cards(pcu, faction="PCU"),
+            seed=seed,
+            first=first,
+        )
+    else:
+        reset_game(_GAME, seed=seed, first=first)
+    with _GAME.quiet():
+        start_of_turn(_GAME)
+    return _GAME
+
+
+def _seat_players(gs: GameState, seat: int) -> Tuple[Player, Player]:
+    return (gs.p1, gs.p2) if seat == 0 else (gs.p2, gs.p1)
+
+
+def random_action(gs: GameState, rng: random.Random) -> FuzzAction:
+    """A random action for the current position; not necessarily a legal one."""
+    seat = 0 if gs.turn_player is gs.p1 else 1
+    if rng.random() < _WRONG_SEAT:
+        seat ^= 1
+    player, enemy = _seat_players(gs, seat)
+
+    def index(n: int) -> int:
+        if n == 0 or rng.random() < _WILD_INDEX:
+            return rng.randrange(-1, n + 2)
+        return rng.randrange(n)
+
+    kind = rng.choices(_KINDS, _WEIGHTS)[0]
+    if kind == "deploy":
+        return ("deploy", seat, index(len(player.hand)))
+    if kind == "deploy_cost":
+        splits = tuple(
+            (index(len(player.board)), rng.randrange(0, 4)) for _ in range(rng.randrange(3))
+        )
+        dead = len(gs.shared_dead)
+        mech = tuple(index(dead) for _ in range(rng.randrange(3)))
+        bio = tuple(index(dead) for _ in range(rng.randrange(3)))
+        return ("deploy_cost", seat, index(len(player.hand)), splits, mech, bio)
+    if kind == "use":
+        src = index(len(player.board))
+        abilities = len(player.board[src].abilities) if 0 <= src < len(player.board) else 0
+        n_targets = rng.choice((0, 1, 1, 1, 2))
+        targets = tuple(index(len(enemy.board)) for _ in range(n_targets))
+        tgt = None if not targets else targets[0] if len(targets) == 1 else targets
+        return ("use", seat, src, index(abilities), tgt)
+    if kind == "wind":
+        return ("wind", seat, rng.randrange(0, 5))
+    return ("end",)
+
+
+def apply_fuzz_action(gs: GameState, act: FuzzAction) -> None:
+    kind = act[0]
+    if kind == "end":
+        end_of_turn(gs)
+        return
+    player, _ = _seat_players(gs, act[1])
+    if kind == "deploy":
+        deploy_from_hand(gs, player, act[2])
+    elif kind == "deploy_cost":
+        _, _, idx, splits, mech, bio = act
+        deploy_with_cost(
+            gs, player, idx, lambda *_: list(splits), lambda *_: (list(mech), list(bio))
+        )
+    elif kind == "use":
+        use_ability(gs, player, act[2], act[3], act[4])
+    elif kind == "wind":
+        distribute_wind(player, act[2], auto=True)
+    else:
+        raise ValueError(f"unknown fuzz action {act!r}")
+
+
+# --- Invariants ---
+_ZONES = ("board", "hand", "deck", "retired", "dead_pool")
+
+
+def check_invariants(gs: GameState, total_cards: int) -> None:
+    """Raise InvariantError if gs is inconsistent."""
+    ids: List[int] = []
+    for p in (gs.p1, gs.p2):
+        if p.game is not gs:
+            raise InvariantError(f"{p.name} is not attached to the game")
+        if min(p.gear, p.meat, p.power) < 0:
+            raise InvariantError(f"{p.name} has negative resources")
+        for z in _ZONES:
+            zone = getattr(p, z)
+            if z != "deck" and zone.uids() != [c.uid for c in zone]:
+                raise InvariantError(f"{p.name}.{z} order and index disagree")
+            ids.extend(map(id, zone))
+        for c in p.board:
+            if not 0 <= c.wind < 4:
+                raise InvariantError(f"{c.name} is in play with {c.wind} wind")
+        if p.board.counts != Counter(k for c in p.board for k in board_keys(c)):
+            raise InvariantError(f"{p.name}'s board counts disagree with the board")
+    ids.extend(map(id, gs.shared_dead))
+    if len(set(ids)) != len(ids):
+        raise InvariantError("a card is in two zones at once")
+    if len(ids) != total_cards:
+        raise InvariantError(f"{total_cards - len(ids)} card(s) left every zone")
+    if gs.turn_player is not gs.p1 and gs.turn_player is not gs.p2:
+        raise InvariantError("turn player is not seated")
+    in_play = {id(c) for p in (gs.p1, gs.p2) for c in p.board}
+    bus = gs.events
+    listening = {i for subs in bus._by_kind.values() for i in subs}
+    listening.update(i for _, i in bus._by_subject)
+    if not listening <= in_play:
+        raise InvariantError("a card out of play still has triggers attached")
+
+
+def _card_count(gs: GameState) -> int:
+    return len(gs.shared_dead) + sum(len(getattr(p, z)) for p in (gs.p1, gs.p2) for z in _ZONES)
+
+
+# --- Running and shrinking ---
+def _signature(exc: BaseException) -> str:
+    frames = traceback.extract_tb(exc.__traceback__)
+    where = f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}" if frames else "?"
+    return f"{type(exc).__name__} at {where}"
+
+
+def _run(
+    seed: int, actions: Optional[Sequence[FuzzAction]], steps: int, rng: random.Random
+) -> Tuple[List[FuzzAction], Optional[BaseException]]:
+    """Play actions (or `steps` random ones). Returns the actions applied and the error."""
+    done: List[FuzzAction] = []
+    try:
+        gs = new_game(seed)
+        total = _card_count(gs)
+        check_invariants(gs, total)
+        with gs.quiet():
+            for i in range(len(actions) if actions is not None else steps):
+                act = actions[i] if actions is not None else random_action(gs, rng)
+                done.append(act)
+                apply_fuzz_action(gs, act)
+                check_invariants(gs, total)
+                if gs.result is not None:
+                    break  # a squad leader was destroyed: game over
+    except Exception as e:
+        return done, e
+    return done, None
+
+
+def replay(seed: int, actions: Sequence[FuzzAction]) -> Optional[BaseException]:
+    """Replay a recorded sequence; returns the error it raises, if any."""
+    return _run(seed, actions, 0, random.Random(0))[1]
+
+
+def minimize(seed: int, actions: List[FuzzAction], signature: str) -> List[FuzzAction]:
+    """Shrink actions (delta debugging) while replaying them still fails with signature."""
+
+    def fails(seq: List[FuzzAction]) -> bool:
+        err = _run(seed, seq, 0, random.Random(0))[1]
+        return err is not None and _signature(err) == signature
+
+    n = 2
+    while len(actions) >= 2:
+        size = -(-len(actions) // n)
+        chunks = [actions[i : i + size] for i in range(0, len(actions), size)]
+        for i in range(len(chunks)):
+            rest = [a for j, c in enumerate(chunks) if j != i for a in c]
+            if fails(rest):
+                actions, n = rest, max(n - 1, 2)
+                break
+        else:
+            if n >= len(actions):
+                break
+            n = min(n * 2, len(actions))
+    return actions
+
+
+def fuzz_game(seed: int, steps: int, shrink: bool = True) -> Tuple[int, Optional[FuzzFailure]]:
+    """Fuzz one game. Returns the number of steps played and the failure, if any."""
+    actions, err = _run(seed, None, steps, CounterRNG(seed, "fuzz"))
+    if err is None:
+        return len(actions), None
+    sig = _signature(err)
+    if shrink:
+        actions = minimize(seed, actions, sig)
+        err = _run(seed, actions, 0, random.Random(0))[1] or err
+    msg = f"{type(err).__name__}: {err}"
+    return len(actions), FuzzFailure(seed, actions, msg, sig)
+
+
+def _fuzz_batch(seeds: Sequence[int], steps: int, shrink: bool) -> FuzzReport:
+    report = FuzzReport()
+    for seed in seeds:
+        n, failure = fuzz_game(seed, steps, shrink)
+        report.games += 1
+        report.steps += n
+        if failure is not None:
+            report.add(failure)
+    return report
+
+
+def fuzz(
+    seeds: Sequence[int],
+    *,
+    steps: int = 200,
+    workers: Optional[int] = None,
+    batch: int = 16,
+    shrink: bool = True,
+    decks: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+) -> FuzzReport:
+    """Fuzz one game per seed, up to `steps` actions each.
+
+    workers=0 runs in this process; None uses one worker per CPU. decks are the raw deck
+    JSON documents (default: narc_deck.json and pcu_deck.json in the current folder).
+    Failures are deduplicated by signature, keeping the shortest sequence.
+    """
+    decks = decks or load_raw_decks()
+    started = time.perf_counter()
+    chunks = [list(seeds[i : i + batch]) for i in range(0, len(seeds), batch)]
+    report = FuzzReport()
+    if workers == 0:
+        _init_worker(decks)
+        for chunk in chunks:
+            report.merge(_fuzz_batch(chunk, steps, shrink))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(decks,)) as pool:
+            futures = [pool.submit(_fuzz_batch, chunk, steps, shrink) for chunk in chunks]
+            for fut in futures:
+                report.merge(fut.result())
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fuzz the engine with random actions")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=200, help="max actions per game")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    parser.add_argument("--workers", type=int, default=None, help="0 runs in-process")
+    parser.add_argument("--no-shrink", action="store_true", help="report sequences as found")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.games)
+    report = fuzz(seeds, steps=args.steps, workers=args.workers, shrink=not args.no_shrink)
+    rate = report.steps / report.seconds if report.seconds else 0.0
+    print(f"{report.games} games, {report.steps} steps in {report.seconds:.1f}s ({rate:.0f}/s)")
+    for failure in report.failures.values():
+        print(f"\n{failure}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
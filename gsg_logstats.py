@@ -0,0 +1,290 @@
+"""Streaming statistics over archived game logs (game_log.txt and captured engine output).
+
+Logs are streamed in blocks of whole lines and tokenised into records ("NARC pays 1 wind
+with Lokar Simmons", "NARC: Lokar Simmons uses RESOURCEFUL — draw 1 card(s)", "[destroy]
+...", ...), which are folded into grouped counters as they stream past: ability usage,
+wind paid per card, destructions by cause and game lengths. Memory use depends on the
+block size and the number of distinct cards and game lengths, not on the size of the logs.
+
+With an index file, each log's byte offset, fingerprint, parser state and aggregates are
+saved after a scan, so the next scan only reads what was appended since. A log that was
+truncated or replaced is detected by its fingerprint and scanned again from the start.
+
+    python gsg_logstats.py logs/*.txt --index logs/stats.idx --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+INDEX_VERSION = 2
+_HEAD_BYTES = 4096  # fingerprint: hash of the start of the file ...
+_TAIL_BYTES = 256  # ... and of the bytes just before the saved offset
+
+_CHUNK = 8 << 20  # bytes read per block; only whole lines are scanned
+
+
+def _rx(pattern: str) -> "re.Pattern[bytes]":
+    return re.compile(pattern.encode("utf-8"), re.M)
+
+
+# Order-independent counters: one findall per chunk, counted by Counter in C. Starting
+# with a literal (rather than ^) lets the regex engine skip ahead between matches.
+_WIND = _rx(r" pays (\d+) wind with ([^\n]+?) \(now \d+\)\r?$")
+_DEPLOY = _rx(r" deploys ([^\n]+?)\r?$")
+# Records whose meaning depends on what came before, visited in order. Each alternative
+# ends with an empty marker group, so match.lastgroup names the record kind.
+_EVENTS = _rx(
+    r"^(?:=== game start ===(?P<start>)"
+    r"|=== game end(?: \([^)\n]*\))? ===(?P<end>)"
+    r"|(?:TURN (?P<n>\d+): )?AI\([^)\n]+\) begins turn(?P<turn>)"
+    r"|\[destroy\] [^:\n]+:(?P<card>[^\n]+?)"
+    r"(?: -> [^\n]+| \((?:linked to (?P<link>[^\n]+)|burn)\))(?P<destroy>)"
+    r"|\[gameover\] leader destroyed: [^\n]*winner=(?P<winner>[^\n]+?)(?P<gameover>)"
+    r"|[^:\n]+: (?P<user>[^\n]+?) uses (?P<ability>[^\n]+?)(?: — [^\n]*)?(?P<used>)"
+    r")\r?$"
+)
+
+
+def _text(b: bytes) -> str:
+    return b.decode("utf-8", "replace")
+
+
+@dataclass
+class LogStats:
+    """Grouped counters built from log records; merge() combines scans of several logs."""
+
+    ability_uses: Counter = field(default_factory=Counter)  # (card, ability) -> uses
+    wind_paid: Counter = field(default_factory=Counter)  # card -> wind paid with it
+    deploys: Counter = field(default_factory=Counter)  # card -> deploys
+    destroyed: Counter = field(default_factory=Counter)  # (card, cause) -> destructions
+    winners: Counter = field(default_factory=Counter)  # faction -> games won
+    game_lengths: Counter = field(default_factory=Counter)  # turns -> games that long
+
+    @property
+    def games(self) -> int:
+        return sum(self.game_lengths.values())
+
+    def destruction_causes(self) -> Counter:
+        out: Counter = Counter()
+        for (_, cause), n in self.destroyed.items():
+            out[cause] += n
+        return out
+
+    def merge(self, other: "LogStats") -> "LogStats":
+        self.ability_uses.update(other.ability_uses)
+        self.wind_paid.update(other.wind_paid)
+        self.deploys.update(other.deploys)
+        self.destroyed.update(other.destroyed)
+        self.winners.update(other.winners)
+        self.game_lengths.update(other.game_lengths)
+        return self
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "ability_uses": [[c, a, n] for (c, a), n in self.ability_uses.items()],
+            "wind_paid": dict(self.wind_paid),
+            "deploys": dict(self.deploys),
+            "destroyed": [[c, why, n] for (c, why), n in self.destroyed.items()],
+            "winners": dict(self.winners),
+            "game_lengths": [[t, n] for t, n in sorted(self.game_lengths.items())],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "LogStats":
+        return cls(
+            ability_uses=Counter({(c, a): n for c, a, n in data["ability_uses"]}),
+            wind_paid=Counter(data["wind_paid"]),
+            deploys=Counter(data["deploys"]),
+            destroyed=Counter({(c, why): n for c, why, n in data["destroyed"]}),
+            winners=Counter(data["winners"]),
+            game_lengths=Counter({t: n for t, n in data["game_lengths"]}),
+        )
+
+
+class _GameTracker:
+    """Per-log parser state: the game in progress and the last ability used in it."""
+
+    def __init__(self, stats: LogStats, state: Optional[Dict[str, Any]] = None):
+        self.stats = stats
+        state = state or {}
+        self.in_game: bool = state.get("in_game", False)
+        self.turns: int = state.get("turns", 0)
+        self.last_ability: Optional[str] = state.get("last_ability")
+
+    def state(self) -> Dict[str, Any]:
+        return {"in_game": self.in_game, "turns": self.turns, "last_ability": self.last_ability}
+
+    def _finish(self, winner: Optional[str] = None) -> None:
+        if self.in_game:
+            self.stats.game_lengths[self.turns] += 1
+            if winner:
+                self.stats.winners[winner] += 1
+        self.in_game, self.turns, self.last_ability = False, 0, None
+
+    def feed(self, chunk: bytes) -> None:
+        """Fold a block of whole log lines into the stats."""
+        s = self.stats
+        for (n, card), k in Counter(_WIND.findall(chunk)).items():
+            s.wind_paid[_text(card)] += int(n) * k
+        for card, k in Counter(_DEPLOY.findall(chunk)).items():
+            s.deploys[_text(card)] += k
+        for m in _EVENTS.finditer(chunk):
+            kind = m.lastgroup
+            if kind == "used":
+                self.last_ability = _text(m.group("ability"))
+                s.ability_uses[(_text(m.group("user")), self.last_ability)] += 1
+            elif kind == "destroy":
+                link = m.group("link")
+                cause = f"linked to {_text(link)}" if link else self.last_ability or "unknown"
+                s.destroyed[(_text(m.group("card")), cause)] += 1
+            elif kind == "turn":
+                self.in_game = True
+                self.turns = max(self.turns + 1, int(m.group("n") or 0))
+            elif kind == "start":
+                self._finish()
+                self.in_game = True
+            elif kind == "gameover":
+                self._finish(_text(m.group("winner")))
+            else:
+                self._finish()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _fingerprint(fh, offset: int) -> Tuple[str, str]:
+    fh.seek(0)
+    head = _digest(fh.read(min(offset, _HEAD_BYTES)))
+    start = max(0, offset - _TAIL_BYTES)
+    fh.seek(start)
+    tail = _digest(fh.read(offset - start))
+    return head, tail
+
+
+def _scan_file(path: str, entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bring one log's index entry up to date, reading only bytes past its offset."""
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        offset = 0
+        if entry and entry["offset"] <= size:
+            if list(_fingerprint(fh, entry["offset"])) == [entry["head"], entry["tail"]]:
+                offset = entry["offset"]
+        if offset:
+            stats = LogStats.from_json(entry["stats"])
+            tracker = _GameTracker(stats, entry["state"])
+        else:
+            stats = LogStats()
+            tracker = _GameTracker(stats)
+        fh.seek(offset)
+        carry = b""
+        while True:
+            block = fh.read(_CHUNK)
+            if not block:
+                break  # carry is a partial last line a writer is still appending
+            buf = carry + block
+            cut = buf.rfind(b"\n") + 1
+            carry = buf[cut:]
+            if cut:
+                tracker.feed(buf[:cut])
+                offset += cut
+        head, tail = _fingerprint(fh, offset)
+    return {
+        "offset": offset,
+        "head": head,
+        "tail": tail,
+        "state": tracker.state(),
+        "stats": stats.to_json(),
+    }
+
+
+def _load_index(index_path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not index_path or not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, "r", encoding="utf-8") as fh:
+            saved = json.load(fh)
+        if saved.get("version") == INDEX_VERSION:
+            return saved["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {}
+
+
+def scan_logs(paths: Iterable[str], *, index_path: Optional[str] = None) -> LogStats:
+    """Aggregate stats over paths, resuming each log from index_path when it is given.
+
+    Games still in progress at the end of a log are not counted until they finish.
+    """
+    files = _load_index(index_path)
+    total = LogStats()
+    for path in paths:
+        key = os.path.abspath(path)
+        files[key] = _scan_file(path, files.get(key))
+        total.merge(LogStats.from_json(files[key]["stats"]))
+    if index_path:
+        tmp = f"{index_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "files": files}, fh, separators=(",", ":"))
+        os.replace(tmp, index_path)
+    return total
+
+
+def format_report(stats: LogStats, top: int = 10) -> str:
+    lines: List[str] = []
+    games = stats.games
+    if games:
+        lengths = sorted(stats.game_lengths.items())
+        mean = sum(t * n for t, n in lengths) / games
+        seen, median = 0, lengths[-1][0]
+        for t, n in lengths:
+            seen += n
+            if seen > games // 2:
+                median = t
+                break
+        lines.append(
+            f"games: {games}  turns: mean {mean:.1f}, median {median}, max {lengths[-1][0]}"
+        )
+    else:
+        lines.append("games: 0")
+    if stats.winners:
+        lines.append("wins: " + ", ".join(f"{k} {n}" for k, n in stats.winners.most_common()))
+
+    def section(title: str, counter: Counter, label) -> None:
+        if counter:
+            lines.append(f"\n{title}")
+            for key, n in counter.most_common(top):
+                lines.append(f"  {n:>8}  {label(key)}")
+
+    section("ability uses", stats.ability_uses, lambda k: f"{k[0]}: {k[1]}")
+    section("wind paid", stats.wind_paid, str)
+    section("deploys", stats.deploys, str)
+    section("destruction causes", stats.destruction_causes(), str)
+    section("destroyed", stats.destroyed, lambda k: f"{k[0]} ({k[1]})")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Aggregate statistics over game logs")
+    parser.add_argument("logs", nargs="+", help="game_log.txt-style files")
+    parser.add_argument("--index", help="index file; rescans only read newly appended lines")
+    parser.add_argument("--top", type=int, default=10, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print the aggregates as JSON")
+    args = parser.parse_args(argv)
+    stats = scan_logs(args.logs, index_path=args.index)
+    if args.json:
+        print(json.dumps(stats.to_json(), indent=1))
+    else:
+        print(format_report(stats, args.top))
+
+
+if __name__ == "__main__":
+    main()
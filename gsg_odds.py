@@ -0,0 +1,227 @@
+"""Exact draw odds for a deck: what are the chances of holding certain cards by some turn?
+
+Each player's squad leader starts on the board. The rest of the deck is shuffled, and
+they draw 6 cards, then 1 more at the start of each of their own turns. So by the start
+of their t-th turn, they have seen 6 + t cards drawn without replacement from the deck.
+The chance that those cards meet a set of conditions ("at least one 1w goon", "two
+squad goons and Krax") is then a hypergeometric count, not something to sample:
+
+    deck = draw_deck(load_deck_json("narc_deck.json"), "NARC")
+    p = probability(deck, [parse_condition("wind=1")], cards_seen(turn=3))
+    p = probability(deck, [parse_condition("2x rank=sg"), parse_condition("name=Krax")], 6)
+
+Answers are exact Fractions. The deck is expanded by each goon's "duplicates" as printed.
+Pass duplicates=False to get the deck the simulator deals, one of each goon.
+
+    python gsg_odds.py narc_deck.json                        # per-card table, turns 0-5
+    python gsg_odds.py pcu_deck.json "wind=1" --turn 3       # "1w goon by my 3rd turn"
+    python gsg_odds.py narc_deck.json "2x rank=sg" "name=Bruut Enforcer"
+"""
+
+from __future__ import annotations
+
+import argparse
+import operator
+import os
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from math import comb
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from gsg_sim import Card, build_card, find_squad_leader, load_deck_json, parse_rank
+
+OPENING_HAND = 6
+
+
+@dataclass(frozen=True)
+class DrawDeck:
+    """The cards a player draws from: (card, copies) per goon, squad leader removed."""
+
+    faction: str
+    entries: Tuple[Tuple[Card, int], ...]
+
+    @property
+    def size(self) -> int:
+        return sum(n for _, n in self.entries)
+
+    def count(self, pred: Callable[[Card], bool]) -> int:
+        return sum(n for c, n in self.entries if pred(c))
+
+
+def _copies(raw: Dict[str, Any]) -> int:
+    try:
+        return max(int(raw.get("duplicates", 1) or 1), 0)
+    except (TypeError, ValueError):
+        return 1
+
+
+def draw_deck(deck_obj: Dict[str, Any], faction: str, *, duplicates: bool = True) -> DrawDeck:
+    """The draw pile of a deck JSON: every goon times its "duplicates" (or once each, as
+    the simulator deals it, with duplicates=False), less the squad leader on the board.
+    Raises ValueError if the deck has no squad leader."""
+    goons = deck_obj.get("goons", [])
+    cards = [build_card(raw, faction) for raw in goons]
+    leader = find_squad_leader(cards)
+    if leader is None:
+        raise ValueError(f"{faction} deck has no squad leader")
+    entries = []
+    for c, raw in zip(cards, goons):
+        n = _copies(raw) if duplicates else 1
+        n -= c is leader
+        if n > 0:
+            entries.append((c, n))
+    return DrawDeck(faction, tuple(entries))
+
+
+def cards_seen(turn: int = 0, hand: int = OPENING_HAND) -> int:
+    """Cards drawn by the start of a player's own turn `turn` (0: just the opening hand)."""
+    return hand + max(turn, 0)
+
+
+# --- Conditions ---
+@dataclass(frozen=True)
+class Condition:
+    """At least `at_least` of the cards seen satisfy pred."""
+
+    label: str
+    pred: Callable[[Card], bool]
+    at_least: int = 1
+
+
+_CONDITION = re.compile(r"^\s*(?:(\d+)\s*x\s+)?([a-z]+)\s*(<=|>=|=)\s*(.+?)\s*$")
+_COST_TOKEN = re.compile(r"(\d+)\s*([wgm])")
+
+
+def _cost(text: str) -> Tuple[int, int, int]:
+    cost = {"w": 0, "g": 0, "m": 0}
+    for n, kind in _COST_TOKEN.findall(text):
+        cost[kind] += int(n)
+    return cost["w"], cost["g"], cost["m"]
+
+
+_FIELDS: Dict[str, Tuple[Callable[[Card], Any], Callable[[str], Any]]] = {
+    "name": (lambda c: c.name.strip().lower(), str),
+    "rank": (lambda c: c.rank, parse_rank),
+    "icon": (lambda c: c.traits, str),
+    "cost": (lambda c: (c.deploy_wind, c.deploy_gear, c.deploy_meat), _cost),
+    "wind": (lambda c: c.deploy_wind, lambda v: int(v.rstrip("w"))),
+}
+_OPS = {"=": operator.eq, "<=": operator.le, ">=": operator.ge}
+
+
+def parse_condition(text: str) -> Condition:
+    """Condition from "[Nx ]field=value". Fields: name, rank (sl, sg, bg, titan), icon,
+    cost (the whole deploy cost: "1w", "2w1g", "0") and wind (the wind cost; also takes
+    <= and >=). Raises ValueError on anything else."""
+    m = _CONDITION.match(text.lower())
+    if not m:
+        raise ValueError(f"not a condition: {text!r} (expected e.g. '2x rank=sg')")
+    count, field, op, value = m.groups()
+    if field not in _FIELDS:
+        raise ValueError(f"unknown field {field!r} in {text!r}")
+    if op != "=" and field != "wind":
+        raise ValueError(f"{field} only supports '=': {text!r}")
+    get, parse = _FIELDS[field]
+    try:
+        target = parse(value)
+    except ValueError:
+        raise ValueError(f"bad {field} value in {text!r}") from None
+    compare = operator.contains if field == "icon" else _OPS[op]
+    return Condition(text.strip(), lambda c: compare(get(c), target), int(count or 1))
+
+
+# --- Probabilities ---
+def at_least(population: int, successes: int, draws: int, k: int = 1) -> Fraction:
+    """P(X >= k) for X hypergeometric: draws without replacement from population cards,
+    successes of which count."""
+    draws = min(draws, population)
+    if k <= 0:
+        return Fraction(1)
+    hits = sum(
+        comb(successes, i) * comb(population - successes, draws - i)
+        for i in range(k, min(successes, draws) + 1)
+    )
+    return Fraction(hits, comb(population, draws))
+
+
+def probability(deck: DrawDeck, conditions: Sequence[Condition], draws: int) -> Fraction:
+    """Exact chance that `draws` cards from the shuffled deck meet every condition.
+
+    Conditions may overlap (one card can count for several). Cards are grouped by which
+    conditions they satisfy, and the hands are counted group by group, tracking how far
+    each condition is from being met (a multivariate hypergeometric count).
+    """
+    draws = min(draws, deck.size)
+    if len(conditions) == 1:
+        cond = conditions[0]
+        return at_least(deck.size, deck.count(cond.pred), draws, cond.at_least)
+    groups: Dict[Tuple[bool, ...], int] = {}
+    for c, n in deck.entries:
+        sig = tuple(bool(cond.pred(c)) for cond in conditions)
+        groups[sig] = groups.get(sig, 0) + n
+    need = tuple(cond.at_least for cond in conditions)
+    # (cards drawn so far, progress per condition, capped at its need) -> number of hands
+    ways: Dict[Tuple[int, Tuple[int, ...]], int] = {(0, (0,) * len(need)): 1}
+    for sig, size in groups.items():
+        nxt: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+        for (drawn, got), w in ways.items():
+            for j in range(min(size, draws - drawn) + 1):
+                key = (
+                    drawn + j,
+                    tuple(min(g + j * s, k) for g, s, k in zip(got, sig, need)),
+                )
+                nxt[key] = nxt.get(key, 0) + w * comb(size, j)
+        ways = nxt
+    return Fraction(ways.get((draws, need), 0), comb(deck.size, draws))
+
+
+def card_table(deck: DrawDeck, turns: int = 5) -> List[Tuple[str, int, List[Fraction]]]:
+    """(name, copies, P(at least one copy seen) by own turn 0..turns) per goon."""
+    rows = []
+    for c, n in deck.entries:
+        odds = [at_least(deck.size, n, cards_seen(t), 1) for t in range(turns + 1)]
+        rows.append((c.name, n, odds))
+    return rows
+
+
+def format_table(deck: DrawDeck, turns: int = 5) -> str:
+    head = "".join(f"{'T' + str(t):>7}" for t in range(turns + 1))
+    lines = [f"{deck.faction}: {deck.size} cards to draw", f"{'card':<28} {'n':>3}{head}"]
+    for name, n, odds in card_table(deck, turns):
+        lines.append(f"{name:<28} {n:>3}" + "".join(f"{float(p):>7.1%}" for p in odds))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Exact opening-hand and draw probabilities")
+    parser.add_argument("deck", help="deck JSON file")
+    parser.add_argument("conditions", nargs="*", help="e.g. 'wind=1', '2x rank=sg', 'name=Krax'")
+    parser.add_argument("--faction", default=None, help="default: from the file name")
+    parser.add_argument("--turn", type=int, default=None, help="own turn (0: opening hand)")
+    parser.add_argument("--hand", type=int, default=OPENING_HAND)
+    parser.add_argument("--turns", type=int, default=5, help="table columns")
+    parser.add_argument(
+        "--no-duplicates", action="store_true", help="one of each goon, as the simulator deals"
+    )
+    args = parser.parse_args(argv)
+
+    faction = args.faction or os.path.basename(args.deck).split("_")[0].upper()
+    try:
+        deck = draw_deck(load_deck_json(args.deck), faction, duplicates=not args.no_duplicates)
+        conditions = [parse_condition(t) for t in args.conditions]
+    except ValueError as e:
+        parser.error(str(e))
+    if not conditions:
+        print(format_table(deck, args.turns))
+        return 0
+    label = " and ".join(c.label for c in conditions)
+    turns = range(args.turns + 1) if args.turn is None else [args.turn]
+    for t in turns:
+        p = probability(deck, conditions, cards_seen(t, args.hand))
+        print(f"turn {t} ({cards_seen(t, args.hand)} cards seen): P({label}) = {float(p):.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,234 @@
+"""Queryable store for simulation results, on stdlib sqlite3.
+
+One row per game: seed, deck hash (gsg_sim.deck_hash of the two decklists), first player,
+winner, turns and the game-over cause (GameState.result.reason). The database runs in
+WAL mode, so any number of processes can read while workers append in batches. Each
+batch is one transaction, and writers wait for each other (busy timeout) instead of
+failing. A game is identified by its seed and deck hash, so importing the same results twice (e.g. after
+a worker was restarted) adds nothing.
+
+Besides the indexes on deck hash, seed and winner, a trigger keeps per-block tallies of
+games by (decks, first player, winner). Block size is 4096 ids. Win-rate queries add
+up whole blocks from the tallies and count only the rows of the partial block at the
+edge, so they take milliseconds however many games are stored. For example, NARC's win
+rate going first over the last million games:
+
+    python gsg_results.py results.db import sweeps/balance
+    python gsg_results.py results.db winrate NARC --first NARC --last 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id        INTEGER PRIMARY KEY,
+    seed      INTEGER NOT NULL,
+    deck_hash TEXT    NOT NULL,
+    first     TEXT    NOT NULL,
+    winner    TEXT,             -- NULL: a draw
+    turns     INTEGER NOT NULL,
+    cause     TEXT,
+    added     REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_deck ON games (deck_hash, id);
+CREATE UNIQUE INDEX IF NOT EXISTS games_seed ON games (seed, deck_hash);
+CREATE INDEX IF NOT EXISTS games_winner ON games (winner, id);
+CREATE TABLE IF NOT EXISTS tallies (
+    block     INTEGER NOT NULL, -- id >> BLOCK_BITS
+    deck_hash TEXT    NOT NULL,
+    first     TEXT    NOT NULL,
+    winner    TEXT    NOT NULL, -- '': a draw
+    games     INTEGER NOT NULL,
+    PRIMARY KEY (block, deck_hash, first, winner)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS games_tally AFTER INSERT ON games BEGIN
+    INSERT INTO tallies VALUES (NEW.id >> 12, NEW.deck_hash, NEW.first, COALESCE(NEW.winner, ''), 1)
+    ON CONFLICT DO UPDATE SET games = games + 1;
+END;
+"""
+BLOCK_BITS = 12  # must match the shift in the games_tally trigger
+
+_INSERT = (
+    "INSERT OR IGNORE INTO games (seed, deck_hash, first, winner, turns, cause, added)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_I64 = 1 << 64
+
+
+def _to_i64(seed: int) -> int:
+    """sqlite integers are signed 64-bit; game seeds are unsigned."""
+    return seed - _I64 if seed >= 1 << 63 else seed
+
+
+def _from_i64(val: int) -> int:
+    return val + _I64 if val < 0 else val
+
+
+class ResultsStore:
+    """A results database; use one instance per process (or thread)."""
+
+    def __init__(self, path: str, *, batch: int = 5000, timeout: float = 60.0):
+        self.path = path
+        self.batch = batch
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._pending: List[Tuple[Any, ...]] = []
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Queue one game result (a gsg_sweep result row); written in batches."""
+        self._pending.append(
+            (
+                _to_i64(result["seed"]),
+                result["decks"],
+                result["first"],
+                result["winner"],
+                result["turns"],
+                result.get("cause"),
+                time.time(),
+            )
+        )
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def add_many(self, results: Iterable[Dict[str, Any]]) -> None:
+        for r in results:
+            self.add(r)
+
+    def flush(self) -> None:
+        """Write queued results in one transaction."""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(_INSERT, rows)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # --- Queries ---
+    def _since(self, last: Optional[int]) -> int:
+        """Smallest id among the last `last` games (ids only grow)."""
+        if last is None:
+            return 0
+        (top,) = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()
+        return top - last + 1
+
+    def _outcomes(
+        self, last: Optional[int], first: Optional[str], deck_hash: Optional[str]
+    ) -> Counter:
+        """Games by winner ('' for none) among the last `last` games, filtered."""
+        since = self._since(last)
+        block = since >> BLOCK_BITS if since > 0 else -1
+        where, args = "", []
+        if first is not None:
+            where, args = where + " AND first = ?", args + [first]
+        if deck_hash is not None:
+            where, args = where + " AND deck_hash = ?", args + [deck_hash]
+        out: Counter = Counter()
+        sql = f"SELECT winner, SUM(games) FROM tallies WHERE block > ?{where} GROUP BY winner"
+        for winner, n in self.conn.execute(sql, [block] + args):
+            out[winner] += n
+        if block >= 0:  # the rows of the first block that are in range
+            sql = (
+                "SELECT COALESCE(winner, ''), COUNT(*) FROM games"
+                f" WHERE id >= ? AND id < ?{where} GROUP BY 1"
+            )
+            for winner, n in self.conn.execute(sql, [since, (block + 1) << BLOCK_BITS] + args):
+                out[winner] += n
+        return out
+
+    def count(self, *, last: Optional[int] = None, deck_hash: Optional[str] = None) -> int:
+        return sum(self._outcomes(last, None, deck_hash).values())
+
+    def win_rate(
+        self,
+        winner: str,
+        *,
+        first: Optional[str] = None,
+        last: Optional[int] = None,
+        deck_hash: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """(wins, games) for winner among the last `last` games (default: all of them),
+        optionally only where `first` went first and/or with the given decks."""
+        games = self._outcomes(last, first, deck_hash)
+        return games[winner], sum(games.values())
+
+    def causes(self, *, last: Optional[int] = None, top: int = 10) -> List[Tuple[str, int]]:
+        return self.conn.execute(
+            "SELECT cause, COUNT(*) AS n FROM games WHERE id >= ? AND cause IS NOT NULL"
+            " GROUP BY cause ORDER BY n DESC LIMIT ?",
+            (self._since(last), top),
+        ).fetchall()
+
+    def by_seed(self, seed: int) -> List[Dict[str, Any]]:
+        cur = self.conn.execute(
+            "SELECT id, seed, deck_hash, first, winner, turns, cause FROM games WHERE seed = ?",
+            (_to_i64(seed),),
+        )
+        cols = [d[0] for d in cur.description]
+        rows = [dict(zip(cols, row)) for row in cur]
+        for r in rows:
+            r["seed"] = _from_i64(r["seed"])
+        return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulation results database")
+    parser.add_argument("db", help="sqlite file (created if missing)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("import", help="add the results of a finished gsg_sweep directory")
+    p.add_argument("sweep")
+    p = sub.add_parser("winrate")
+    p.add_argument("winner")
+    p.add_argument("--first", default=None)
+    p.add_argument("--last", type=int, default=None, help="only the last N games")
+    p.add_argument("--decks", default=None, help="deck hash")
+    p = sub.add_parser("causes")
+    p.add_argument("--last", type=int, default=None)
+    p.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.db) as store:
+        if args.cmd == "import":
+            from gsg_sweep import iter_results
+
+            before = store.count()
+            store.add_many(iter_results(args.sweep))
+            store.flush()
+            print(f"{store.count() - before} games added")
+        elif args.cmd == "winrate":
+            started = time.perf_counter()
+            wins, games = store.win_rate(
+                args.winner, first=args.first, last=args.last, deck_hash=args.decks
+            )
+            ms = (time.perf_counter() - started) * 1000
+            rate = wins / games if games else 0.0
+            print(f"{args.winner}: {wins}/{games} ({rate:.1%})  [{ms:.1f} ms]")
+        else:
+            for cause, n in store.causes(last=args.last, top=args.top):
+                print(f"{n:>8}  {cause}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
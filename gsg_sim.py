@@ -7,17 +7,29 @@ from __future__ import annotations
 
 # Standard library imports
 import argparse
+import contextlib
+import functools
+import gc
+import hashlib
+import itertools
 import json
 import os
 import random
 import re
+import struct
 import sys
-from dataclasses import dataclass, field
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Tuple  # Third-party imports
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from rich.console import Console
-from rich.table import Table
+# Third-party imports: Rich is imported lazily by _load_rich() so that headless runs,
+# --help and short-lived workers never pay for it. Likewise the standard modules only one
+# optional feature needs are imported where it starts: mmap in CardCatalog, tracemalloc in
+# MemoryTracker, sqlite3 in OpeningBook.
 
 # === END IMPORT SENTRY ===
 
@@ -49,16 +61,28 @@ def _infer_wind_from_text(text: str) -> int:
     return 0
 
 
-# --- Globals for game log ---
-_GLOG = None
-GAMELOG_PATH = None
-_LOG = None
+# --- Optional Rich support (populated on first use by _load_rich) ---
+Console = None
+Table = None
+
+
+def _load_rich() -> bool:
+    """Import Rich on demand. Returns False if it is not installed."""
+    global Console, Table
+    if Console is None or Table is None:
+        try:
+            from rich.console import Console as _Console
+            from rich.table import Table as _Table
+        except ImportError:
+            return False
+        Console, Table = _Console, _Table
+    return True
 
 
 # --- UI Classes ---
 class TerminalUI:
-    def render(self, gs):
-        print("\033[2J\033[H", end="")
+    def render(self, gs, file=None):
+        print("\033[2J\033[H", end="", file=file)
         p1, p2 = gs.p1, gs.p2
 
         def row(c, i):
@@ -68,71 +92,131 @@ class TerminalUI:
             rank_str = rank.name if hasattr(rank, "name") else str(rank)
             return f"[{i:>2}] {c.name:<20} {rank_str} | wind={wind} | {abil}"[:100]
 
-        print(f"Board P1 ({p1.name})")
+        print(f"Board P1 ({p1.name})", file=file)
         for i, c in enumerate(p1.board):
-            print(row(c, i))
-        print(f"\nBoard P2 ({p2.name})")
+            print(row(c, i), file=file)
+        print(f"\nBoard P2 ({p2.name})", file=file)
         for i, c in enumerate(p2.board):
-            print(row(c, i))
+            print(row(c, i), file=file)
         human = gs.turn_player
-        print(f"\n{human.name} hand ({len(human.hand)}):")
+        print(f"\n{human.name} hand ({len(human.hand)}):", file=file)
         for i, c in enumerate(human.hand):
             name = c.name
             rank = getattr(c, "rank", "?")
             rank_str = rank.name if hasattr(rank, "name") else str(rank)
             line = f"  {i:>2}: {name} [{rank_str}]"
             if len(line) > 100:
-                print(f"{i:>2}: {name[:60]}... [{rank_str}]")
+                print(f"{i:>2}: {name[:60]}... [{rank_str}]", file=file)
             else:
-                print(line)
+                print(line, file=file)
+
+    HELP = (
+        "commands: help | quit(q) | end(e) | show | deploy(d) <hand_idx> | "
+        "use(u) <src_idx> <abil_idx> [tgt_idx ...]"
+    )
+
+    ai_mode = "none"
+
+    def configure_runtime(self, ai="none"):
+        self.ai_mode = ai
+
+    def play_ai_turns(self, gs, max_turns=200):
+        """Play and end turns for AI seats until a human seat is on turn (or max_turns)."""
+        for _ in range(max_turns):
+            p = gs.turn_player
+            if gs.result is not None or not _is_ai(self.ai_mode, p is gs.p1):
+                return
+            print(f"TURN {gs.turn_number}: AI({p.name}) begins turn")
+            for act in ai_take_turn(gs, p):
+                print(f"AI({p.name}) {' '.join(str(x) for x in act if x is not None)}")
+            end_of_turn(gs)
 
     def run_loop(self, gs):
-        HELP = (
-            "commands: help | quit(q) | end(e) | deploy(d) <hand_idx> | "
-            "use(u) <src_idx> <abil_idx> [tgt_idx]"
-        )
-        print(HELP)
-        while True:
+        print(self.HELP)
+        while gs.result is None:
+            self.play_ai_turns(gs)
             self.render(gs)
+            if gs.result is not None:
+                break
             line = input("> ").strip()
-            if not line:
-                continue
-            cmd, *rest = line.lower().split()
-            if cmd in {"quit", "q", "exit"}:
+            if self.execute(gs, line) is None:
                 break
-            if cmd in {"help", "?"}:
-                print(HELP)
-                continue
-            if cmd in {"end", "e"}:
-                end_of_turn(gs)
-                continue
-            if cmd in {"deploy", "d"}:
-                if not rest:
-                    print("usage: deploy <hand_idx>")
-                    continue
-                try:
-                    i = int(rest[0])
-                except ValueError:
-                    print("hand_idx must be int")
-                    continue
-                ok = deploy_from_hand(gs, gs.turn_player, i)
-                if not ok:
-                    print("deploy failed")
-                continue
-            if cmd in {"use", "u"}:
-                if len(rest) < 2:
-                    print("usage: use <src_idx> <abil_idx> [tgt_idx]")
-                    continue
-            print("unknown cmd; type help")
+
+    def run_script(self, gs, lines) -> int:
+        """Apply a stream of commands without redrawing in between; render once at the end.
+
+        'show' renders on request. Stops when the game ends. Returns 0 if every command
+        succeeded, else 1.
+        """
+        failed = 0
+        self.play_ai_turns(gs)
+        for n, raw in enumerate(lines, 1):
+            line = raw.strip()
+            ok = self.execute(gs, line)
+            if ok is None or gs.result is not None:
+                break
+            if not ok:
+                failed += 1
+                print(f"script line {n} failed: {line}", file=sys.stderr)
+        self.render(gs)
+        return 1 if failed else 0
+
+    def execute(self, gs, line) -> Optional[bool]:
+        """Apply one command. Returns True/False for success/failure, None on quit."""
+        if not line or line.startswith("#"):
+            return True
+        cmd, *rest = line.lower().split()
+        if cmd in {"quit", "q", "exit"}:
+            return None
+        if cmd in {"help", "?"}:
+            print(self.HELP)
+            return True
+        if cmd in {"show", "render"}:
+            self.render(gs)
+            return True
+        if cmd in {"end", "e"}:
+            end_of_turn(gs)
+            self.play_ai_turns(gs)
+            return True
+        if cmd in {"deploy", "d"}:
+            if not rest:
+                print("usage: deploy <hand_idx>")
+                return False
+            try:
+                i = int(rest[0])
+            except ValueError:
+                print("hand_idx must be int")
+                return False
+            ok = deploy_from_hand(gs, gs.turn_player, i)
+            if not ok:
+                print("deploy failed")
+            return ok
+        if cmd in {"use", "u"}:
+            if len(rest) < 2:
+                print("usage: use <src_idx> <abil_idx> [tgt_idx ...]")
+                return False
+            try:
+                sidx, aidx, *tidx = [int(x) for x in rest]
+            except ValueError:
+                print("indexes must be int")
+                return False
+            tgt = tidx[0] if len(tidx) == 1 else (tidx or None)
+            ok = use_ability(gs, gs.turn_player, sidx, aidx, tgt)
+            if not ok:
+                print("use failed")
+            return ok
+        print("unknown cmd; type help")
+        return False
 
 
 class RichUI(TerminalUI):
     def __init__(self):
-        if Console is None or Table is None:
+        if not _load_rich():
             raise RuntimeError("Rich is not available")
         self.console = Console()
 
-    def render(self, gs):
+    def render(self, gs, file=None):
+        console = self.console if file is None else Console(file=file)
         # Avoid clearing the screen to prevent blank frames
         # self.console.clear()
 
@@ -165,13 +249,13 @@ class RichUI(TerminalUI):
 
         # Always print a quick text summary first (debug/visibility)
         p1, p2 = gs.p1, gs.p2
-        self.console.print(
+        console.print(
             f"[bold]P1 {p1.name}[/bold]: board={len(p1.board)} hand={len(p1.hand)}"
             f"    |    "
             f"[bold]P2 {p2.name}[/bold]: board={len(p2.board)} hand={len(p2.hand)}"
         )
-        self.console.print(board_table(f"Board P1: {p1.name}", p1))
-        self.console.print(board_table(f"Board P2: {p2.name}", p2))
+        console.print(board_table(f"Board P1: {p1.name}", p1))
+        console.print(board_table(f"Board P2: {p2.name}", p2))
 
         # Hand of current player under their board
         h = Table(
@@ -190,7 +274,7 @@ class RichUI(TerminalUI):
                 rank.name if hasattr(rank, "name") else (str(rank) if rank is not None else "?")
             )
             h.add_row(str(i), c.name, rank_str)
-        self.console.print(h)
+        console.print(h)
 
 
 @dataclass
@@ -225,7 +309,259 @@ class Ability:
     idx: int = 0
 
 
+# --- Status expiry ---
+ExpiryKey = Tuple[int, str, str]  # (turn_number, "start_of_turn" | "end_of_turn", "p1" | "p2")
+
+
+# Versions stamped on mutable engine tables (zones, the timer wheel, the trigger index) on
+# every change; unique across tables, so an unchanged version means unchanged contents
+# and a rollback can skip the table.
+_STATE_VERSIONS = itertools.count(1)
+
+
+class StatusTimers:
+    """Timer wheel for card statuses, bucketed by the (turn, phase, seat) they expire at.
+
+    Draining a key only touches the cards scheduled under it. Entries whose status was
+    removed or re-granted in the meantime are skipped (the status data is the token).
+    """
+
+    def __init__(self):
+        self._slots: Dict[ExpiryKey, List[Tuple["Card", str, Dict[str, Any]]]] = {}
+        self._version = next(_STATE_VERSIONS)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._slots.values())
+
+    def schedule(self, key: ExpiryKey, card: "Card", name: str, data: Dict[str, Any]) -> None:
+        self._slots.setdefault(key, []).append((card, name, data))
+        self._version = next(_STATE_VERSIONS)
+
+    def drain(self, key: ExpiryKey) -> List[Tuple["Card", str]]:
+        """Remove every status due at key; returns the (card, status) pairs expired."""
+        expired: List[Tuple["Card", str]] = []
+        due = self._slots.pop(key, ())
+        if due:
+            self._version = next(_STATE_VERSIONS)
+        for card, name, data in due:
+            if card.statuses.get(name) is data:
+                del card.statuses[name]
+                expired.append((card, name))
+        return expired
+
+    def rebuild(self, cards) -> None:
+        """Re-schedule from the "due" keys stored on statuses (after a checkpoint load)."""
+        self._slots.clear()
+        self._version = next(_STATE_VERSIONS)
+        for c in cards:
+            for name, data in c.statuses.items():
+                due = data.get("due") if isinstance(data, dict) else None
+                if due:
+                    self.schedule(tuple(due), c, name, data)
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        return (self._version, {k: list(v) for k, v in self._slots.items()})
+
+    def restore(self, snap: Tuple[Any, ...]) -> None:
+        """Back to snapshot() (a no-op if nothing was scheduled or drained since)."""
+        if self._version != snap[0]:
+            self._slots = {k: list(v) for k, v in snap[1].items()}
+            self._version = snap[0]
+
+
+# --- Event bus for passive / triggered abilities ---
+class EventKind(Enum):
+    DEPLOY = auto()
+    DESTROY = auto()
+    START_OF_TURN = auto()
+    END_OF_TURN = auto()
+    WIND_RECEIVED = auto()
+    ABILITY_USED = auto()  # after the cost is paid, before the effects resolve
+
+
+@dataclass
+class GameEvent:
+    kind: EventKind
+    owner: "Player"  # controller of card (or the turn player for turn events)
+    card: Optional["Card"] = None
+    amount: int = 0
+    source: Optional["Player"] = None
+    dest: str = ""  # DESTROY: zone the card goes to; listeners may redirect it
+    ability: Optional["Ability"] = None  # ABILITY_USED
+
+
+TriggerHandler = Callable[[GameEvent, "Card", "Player"], None]
+# card name (lowercase) -> [(kind, self_only, handler)], filled by @trigger below
+_TRIGGERS: Dict[str, List[Tuple[EventKind, bool, TriggerHandler]]] = {}
+
+
+def trigger(card_name: str, kind: EventKind, *, self_only: bool = False):
+    """Register handler(event, card, owner) for card_name while it is in play.
+
+    self_only handlers only hear events about that card itself.
+    """
+
+    def deco(fn: TriggerHandler) -> TriggerHandler:
+        _TRIGGERS.setdefault(card_name.strip().lower(), []).append((kind, self_only, fn))
+        return fn
+
+    return deco
+
+
+class EventBus:
+    """Per-game dispatch of GameEvents to the in-play cards that registered triggers.
+
+    Cards are attached when they enter play and detached when they leave. Listeners are
+    indexed by kind (and by subject for self-only triggers), so emitting an event only
+    visits interested cards, in the order they were attached.
+
+    Observers (observe()) hear every event after the cards do. They are for bookkeeping
+    outside the rules, such as statistics, and are muted while the AI searches.
+    """
+
+    def __init__(self):
+        self._by_kind: Dict[EventKind, Dict[int, List[Tuple]]] = {}
+        self._by_subject: Dict[Tuple[EventKind, int], List[Tuple]] = {}
+        self._observers: List[Callable[[GameEvent], None]] = []
+        self._version = next(_STATE_VERSIONS)
+
+    def observe(self, fn: Callable[[GameEvent], None]) -> None:
+        self._observers.append(fn)
+
+    def unobserve(self, fn: Callable[[GameEvent], None]) -> None:
+        with contextlib.suppress(ValueError):
+            self._observers.remove(fn)
+
+    @contextlib.contextmanager
+    def muted(self):
+        """Silence observers (not card triggers) for the duration."""
+        observers, self._observers = self._observers, []
+        try:
+            yield
+        finally:
+            self._observers = observers
+
+    def attach(self, owner: "Player", card: "Card") -> None:
+        for kind, self_only, fn in _TRIGGERS.get(card.name.strip().lower(), ()):
+            if self_only:
+                self._by_subject.setdefault((kind, id(card)), []).append((card, owner, fn))
+            else:
+                subs = self._by_kind.setdefault(kind, {})
+                subs.setdefault(id(card), []).append((card, owner, fn))
+        self._version = next(_STATE_VERSIONS)
+
+    def clear(self) -> None:
+        """Detach every card; observers stay."""
+        self._by_kind.clear()
+        self._by_subject.clear()
+        self._version = next(_STATE_VERSIONS)
+
+    def detach(self, card: "Card") -> None:
+        for kind, self_only, _ in _TRIGGERS.get(card.name.strip().lower(), ()):
+            if self_only:
+                self._by_subject.pop((kind, id(card)), None)
+            else:
+                self._by_kind.get(kind, {}).pop(id(card), None)
+        self._version = next(_STATE_VERSIONS)
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        by_kind = {k: {i: list(v) for i, v in d.items()} for k, d in self._by_kind.items()}
+        return (self._version, by_kind, {k: list(v) for k, v in self._by_subject.items()})
+
+    def restore(self, snap: Tuple[Any, ...]) -> None:
+        """Back to snapshot()'s triggers (a no-op if no card was attached or detached since)."""
+        if self._version != snap[0]:
+            version, by_kind, by_subject = snap
+            self._by_kind = {k: {i: list(v) for i, v in d.items()} for k, d in by_kind.items()}
+            self._by_subject = {k: list(v) for k, v in by_subject.items()}
+            self._version = version
+
+    def emit(self, event: GameEvent) -> GameEvent:
+        listeners: List[Tuple] = []
+        if event.card is not None:
+            listeners.extend(self._by_subject.get((event.kind, id(event.card)), ()))
+        for subs in self._by_kind.get(event.kind, {}).values():
+            listeners.extend(subs)
+        for card, owner, fn in listeners:
+            fn(event, card, owner)
+        for fn in self._observers:
+            fn(event)
+        return event
+
+    def listener_count(self, kind: EventKind) -> int:
+        n = sum(len(v) for v in self._by_kind.get(kind, {}).values())
+        return n + sum(len(v) for k, v in self._by_subject.items() if k[0] is kind)
+
+
+# --- Random streams ---
+def new_seed() -> int:
+    """A fresh 64-bit seed from the OS, for games started without one."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+def derive_seed(*path: Any) -> int:
+    """64-bit seed named by path, e.g. (master_seed, game_index): computed directly, so
+    seed K of a series needs none of the ones before it."""
+    digest = hashlib.blake2b("/".join(map(str, path)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class CounterRNG(random.Random):
+    """random.Random whose n-th 64-bit draw is blake2b(n), keyed by a hash of a path such as
+    (seed, "deal").
+
+    Streams with different paths are independent, and none depends on how much any other
+    has been used. The state is just (key, counter), so saving and restoring it is free.
+    Only random() and getrandbits() are overridden; shuffle(), choice() etc. build on them.
+    """
+
+    def __init__(self, *path: Any):
+        super().__init__(path)
+
+    def seed(self, path: Any = None, version: int = 2) -> None:
+        if path is None:
+            self.key = os.urandom(16)
+        else:
+            text = "/".join(map(str, path)) if isinstance(path, tuple) else str(path)
+            self.key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        self.counter = 0
+        self.gauss_next = None
+
+    def _next(self) -> int:
+        n = self.counter
+        self.counter = n + 1
+        block = hashlib.blake2b(n.to_bytes(8, "little"), digest_size=8, key=self.key)
+        return int.from_bytes(block.digest(), "little")
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        out, have = 0, 0
+        while have < k:
+            out |= self._next() << have
+            have += 64
+        return out & ((1 << k) - 1)
+
+    def getstate(self) -> Tuple[Any, ...]:
+        return (self.key, self.counter, self.gauss_next)
+
+    def setstate(self, state: Tuple[Any, ...]) -> None:
+        self.key, self.counter, self.gauss_next = state
+
+
 # --- GameState dataclass ---
+@dataclass(frozen=True)
+class GameResult:
+    """How a game ended: the winner's name, why, and on which turn."""
+
+    winner: str
+    reason: str
+    turn: int
+
+
 @dataclass
 class GameState:
     p1: "Player"
@@ -233,24 +569,280 @@ class GameState:
     turn_player: "Player"
     phase: str = "start"
     turn_number: int = 1
+    # Deck shuffles; every other use of randomness has its own stream (see stream()).
+    rng: random.Random = field(default_factory=random.Random)
+    shared_dead: "Zone" = field(default_factory=lambda: Zone())
+    timers: StatusTimers = field(default_factory=StatusTimers, repr=False, compare=False)
+    events: EventBus = field(default_factory=EventBus, repr=False, compare=False)
+    memory: Optional["MemoryTracker"] = field(default=None, repr=False, compare=False)
+    # The ability being resolved, for game-over reasons, and the result once a squad leader
+    # has been destroyed. A game with a result is over: the engine takes no more actions.
+    acting: Optional[str] = field(default=None, repr=False, compare=False)
+    result: Optional[GameResult] = field(default=None, repr=False, compare=False)
+    # Each seat's cards as dealt by setup_game (squad leader first); reset_game reuses them.
+    roster: Optional[Tuple[Tuple["Card", ...], Tuple["Card", ...]]] = field(
+        default=None, repr=False, compare=False
+    )
+    # The game's seed (set by setup_game) and the named streams drawn from it so far.
+    seed: Optional[int] = field(default=None, compare=False)
+    streams: Dict[str, random.Random] = field(default_factory=dict, repr=False, compare=False)
+    # Effects queued by the ability being resolved.
+    effects: "EffectStack" = field(default_factory=lambda: EffectStack(), repr=False, compare=False)
+    # Where the engine's messages go (see say()): out, or sys.stdout when it is None, plus
+    # a copy to gamelog if set. Everything mutable about a game hangs off its GameState,
+    # so games on different threads share nothing.
+    out: Optional[Any] = field(default=None, repr=False, compare=False)
+    gamelog: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.shared_dead, Zone):
+            self.shared_dead = Zone(self.shared_dead)
+        for p in (self.p1, self.p2):
+            p.game = self
+            for c in p.board:
+                self.events.attach(p, c)
+
+    @property
+    def over(self) -> bool:
+        return self.result is not None
+
+    @contextlib.contextmanager
+    def quiet(self, log: bool = False):
+        """Silence this game's messages (and with log=True its gamelog copy as well, for
+        moves that will be undone). Other games, and sys.stdout, are left alone."""
+        saved = self.out, self.gamelog
+        self.out = _NullWriter()
+        if log:
+            self.gamelog = None
+        try:
+            yield self
+        finally:
+            self.out, self.gamelog = saved
+
+    def stream(self, purpose: str) -> random.Random:
+        """The game's random stream for purpose ("first", ...), made from seed on first use."""
+        rng = self.streams.get(purpose)
+        if rng is None:
+            rng = self.streams[purpose] = CounterRNG(self.seed, purpose)
+        return rng
+
+    def seed_streams(self, seed: Optional[int]) -> None:
+        """Start over every random stream from seed (None: a fresh one)."""
+        self.seed = new_seed() if seed is None else seed
+        self.rng = CounterRNG(self.seed, "deal")
+        self.streams.clear()
+
+    def rng_state(self) -> Tuple[Any, Dict[str, Any]]:
+        return self.rng.getstate(), {k: r.getstate() for k, r in self.streams.items()}
+
+    def set_rng_state(self, state: Tuple[Any, Dict[str, Any]]) -> None:
+        main, streams = state
+        self.rng.setstate(main)
+        for k in [k for k in self.streams if k not in streams]:
+            del self.streams[k]
+        for k, st in streams.items():
+            self.stream(k).setstate(st)
+
+
+# --- Memory accounting ---
+class _PhaseFrame:
+    __slots__ = ("name", "start", "peak")
+
+    def __init__(self, name: str, start: int):
+        self.name, self.start, self.peak = name, start, start
+
+
+class MemoryTracker:
+    """tracemalloc-based accounting for long simulation runs.
+
+    Attach to a game with begin_game(gs); engine phases decorated with @_engine_phase then
+    report their net allocation and peak. end_game(gs) records the game's peak and keeps
+    weak references to its state, and leaks() lists whatever is still alive afterwards.
+    """
+
+    def __init__(self, frames: int = 1):
+        import tracemalloc
+
+        self._tm = tracemalloc
+        self.frames = frames
+        # phase -> [calls, net bytes, max peak above the phase's starting point]
+        self.phases: Dict[str, List[int]] = {}
+        self.game_peaks: List[int] = []
+        self._stack: List[_PhaseFrame] = []
+        self._game_start = 0
+        self._game_peak = 0
+        self._watched: List[Tuple[str, Any]] = []
+        self._baseline = None
+        self._owns_tracing = False
+
+    def start(self) -> "MemoryTracker":
+        if not self._tm.is_tracing():
+            self._tm.start(self.frames)
+            self._owns_tracing = True
+        self._baseline = self._tm.take_snapshot()
+        return self
+
+    def stop(self) -> None:
+        if self._owns_tracing:
+            self._tm.stop()
+            self._owns_tracing = False
+
+    def __enter__(self) -> "MemoryTracker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def enter(self, name: str) -> None:
+        cur, peak = self._tm.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, peak)
+        self._game_peak = max(self._game_peak, peak)
+        self._tm.reset_peak()
+        self._stack.append(_PhaseFrame(name, cur))
+
+    def exit(self) -> None:
+        cur, peak = self._tm.get_traced_memory()
+        frame = self._stack.pop()
+        frame.peak = max(frame.peak, peak)
+        stats = self.phases.setdefault(frame.name, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += cur - frame.start
+        stats[2] = max(stats[2], frame.peak - frame.start)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, frame.peak)
+        self._game_peak = max(self._game_peak, frame.peak)
+        self._tm.reset_peak()
+
+    def begin_game(self, gs: GameState) -> None:
+        gs.memory = self
+        self._tm.reset_peak()
+        self._game_start = self._game_peak = self._tm.get_traced_memory()[0]
+
+    def end_game(self, gs: GameState) -> None:
+        """Record the game's peak and watch its objects for survival (see leaks())."""
+        self._game_peak = max(self._game_peak, self._tm.get_traced_memory()[1])
+        self.game_peaks.append(self._game_peak - self._game_start)
+        gs.memory = None
+        self._watched = [(f"GameState turn {gs.turn_number}", weakref.ref(gs))]
+        for p in (gs.p1, gs.p2):
+            self._watched.append((f"Player {p.name}", weakref.ref(p)))
+            for z in ("board", "hand", "deck", "retired", "dead_pool"):
+                for c in getattr(p, z):
+                    self._watched.append((f"Card {c.name} ({p.name} {z})", weakref.ref(c)))
+        for c in gs.shared_dead:
+            self._watched.append((f"Card {c.name} (shared_dead)", weakref.ref(c)))
+
+    def leaks(self) -> List[str]:
+        """Objects of the last finished game still alive once the caller has dropped it."""
+        gc.collect()
+        out = [label for label, ref in self._watched if ref() is not None]
+        return out
+
+    def top_growth(self, limit: int = 10) -> List[str]:
+        """Source lines whose live allocations grew most since start()."""
+        if self._baseline is None:
+            return []
+        diff = self._tm.take_snapshot().compare_to(self._baseline, "lineno")
+        return [str(st) for st in diff[:limit] if st.size_diff > 0]
+
+    def report(self) -> str:
+        lines = ["phase            calls      net KiB     peak KiB"]
+        for name, (calls, net, peak) in sorted(self.phases.items()):
+            lines.append(f"{name:<14} {calls:>7} {net / 1024:>12.1f} {peak / 1024:>12.1f}")
+        if self.game_peaks:
+            peaks = self.game_peaks
+            lines.append(
+                f"games={len(peaks)} peak KiB: last={peaks[-1] / 1024:.1f} "
+                f"max={max(peaks) / 1024:.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _engine_phase(name: str):
+    """Attribute allocations in the decorated gs-first engine call to phase `name`."""
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(gs, *args, **kwargs):
+            mt = getattr(gs, "memory", None)
+            if mt is None:
+                return fn(gs, *args, **kwargs)
+            mt.enter(name)
+            try:
+                return fn(gs, *args, **kwargs)
+            finally:
+                mt.exit()
+
+        return wrapper
+
+    return deco
 
 
 # --- shuffle_deck helper ---
 def shuffle_deck(gs: GameState, player: "Player"):
-    random.shuffle(player.deck)
+    gs.rng.shuffle(player.deck)
 
 
 def _opponent_of(gs: "GameState", p: "Player") -> "Player":
     return gs.p2 if p is gs.p1 else gs.p1
 
 
+def _seat(gs: "GameState", p: "Player") -> str:
+    return "p1" if p is gs.p1 else "p2"
+
+
+def expiry_key(gs: "GameState", owner: "Player", expires: Any) -> Optional[ExpiryKey]:
+    """Turn/phase/seat at which a status granted now with expires=(phase, whose) runs out.
+
+    phase is "start_of_turn" or "end_of_turn"; whose is "owner" (the card's controller) or
+    "opponent". Turns alternate, so a seat's next turn is one or two turn numbers away.
+    """
+    if not expires:
+        return None
+    phase, whose = expires
+    if phase not in ("start_of_turn", "end_of_turn"):
+        return None
+    seat_player = owner if whose == "owner" else _opponent_of(gs, owner)
+    on_turn = seat_player is gs.turn_player
+    if phase == "start_of_turn":
+        turn = gs.turn_number + (2 if on_turn else 1)
+    else:
+        turn = gs.turn_number + (0 if on_turn else 1)
+    return (turn, phase, _seat(gs, seat_player))
+
+
+def grant_status(
+    gs: "GameState", owner: "Player", card: "Card", name: str, expires: Any = None
+) -> None:
+    """Put a status on card (controlled by owner) and schedule its expiry, if any."""
+    data: Dict[str, Any] = {"expires": expires}
+    due = expiry_key(gs, owner, expires)
+    if due is not None:
+        data["due"] = due
+        gs.timers.schedule(due, card, name, data)
+    card.statuses[name] = data
+
+
+@_engine_phase("start_of_turn")
 def start_of_turn(gs: "GameState") -> None:
     """Start-of-turn upkeep for the active player.
     - Draw 1 card.
     - Reset per-turn ability usage counters on their board.
-    - Expire simple start-of-turn statuses if you track them.
+    - Expire start-of-turn statuses that are due (only those cards are touched).
     - Set phase to 'main'.
     """
+    p = gs.turn_player
+    gs.phase = "start"
+    draw(gs, p, 1)
+    for c in p.board:
+        c.used_this_turn = 0
+        c.new_this_turn = False
+    gs.timers.drain((gs.turn_number, "start_of_turn", _seat(gs, p)))
+    gs.events.emit(GameEvent(EventKind.START_OF_TURN, p))
+    gs.phase = "main"
 
 
 # --- Engine stubs for UI integration ---
@@ -265,17 +857,24 @@ def draw(gs, player, n=1):
     return drawn
 
 
+@_engine_phase("deploy")
 def deploy_from_hand(gs, player, hand_idx):
     # Enforce deploy cost
+    if gs.result is not None:
+        return False
     if 0 <= hand_idx < len(player.hand):
         card = player.hand[hand_idx]
+        if not requirement_met(player, card):
+            return False
         # dc = getattr(card, "deploy_cost", None)  # Unused variable removed
         wind = getattr(card, "deploy_wind", 0)
         gear = getattr(card, "deploy_gear", 0)
         meat = getattr(card, "deploy_meat", 0)
         # Wind must be distributed via distribute_wind
         if wind > 0:
-            if not distribute_wind(gs, player, card, wind):
+            if wind > wind_capacity(player):
+                return False
+            if not distribute_wind(player, wind, auto=True):
                 return False
         # Gear and Meat must be burned from Dead Pool
         if gear > 0:
@@ -284,18 +883,31 @@ def deploy_from_hand(gs, player, hand_idx):
         if meat > 0:
             if not burn_dead_pool(gs, player, "biological", meat):
                 return False
-        player.board.append(card)
         player.hand.pop(hand_idx)
+        enter_play(gs, player, card)
         return True
     return False
 
 
+def enter_play(gs, player, card):
+    """Put card on player's board, attach its triggers and announce the deploy."""
+    card.new_this_turn = True
+    player.board.append(card)
+    gs.events.attach(player, card)
+    gs.events.emit(GameEvent(EventKind.DEPLOY, player, card))
+
+
+@_engine_phase("end_of_turn")
 def end_of_turn(gs):
-    # Minimal stub: rotate turn player and increment turn number
+    # Expire end-of-turn statuses, rotate turn player and run the next start of turn
+    if gs.result is not None:
+        return  # a finished game stays as it ended
+    gs.phase = "end"
+    gs.events.emit(GameEvent(EventKind.END_OF_TURN, gs.turn_player))
+    gs.timers.drain((gs.turn_number, "end_of_turn", _seat(gs, gs.turn_player)))
     gs.turn_number += 1
     gs.turn_player = gs.p2 if gs.turn_player is gs.p1 else gs.p1
-    gs.phase = "start"
-    draw(gs, gs.turn_player, 1)
+    start_of_turn(gs)
 
 
 # --- Engine stubs for UI integration ---
@@ -324,16 +936,237 @@ def find_squad_leader(cards: List[Card]) -> Optional[Card]:
 
 
 # --- Model Classes ---
+# Card uids are unique per process, not per game; cards may be built on any thread.
+_CARD_UIDS = itertools.count(1)
+_CARD_UIDS_LOCK = threading.Lock()
+
+
+def _new_uid() -> int:
+    with _CARD_UIDS_LOCK:
+        return next(_CARD_UIDS)
+
+
+def _reserve_uids(highest: int) -> None:
+    """Make sure uids handed out from now on are above highest (e.g. after a load)."""
+    global _CARD_UIDS
+    with _CARD_UIDS_LOCK:
+        _CARD_UIDS = itertools.count(max(next(_CARD_UIDS), highest + 1))
+
+
+class Zone:
+    """Ordered card container keyed by Card.uid (a slot map).
+
+    append, remove, get(uid) and `card in zone` are O(1); iteration and positional access
+    follow insertion order, so a Zone reads like the list it replaces. Membership is by
+    instance, not by equality: equal-looking copies of a card are different entries.
+
+    Every change gives the zone a new version (unique across zones), so snapshot() and
+    restore() can tell an untouched zone from one that needs its cards put back.
+    """
+
+    __slots__ = ("_cards", "_order", "_version")
+
+    def __init__(self, cards: Iterable["Card"] = ()):
+        self._cards: Dict[int, Card] = {}
+        self._reset(cards)
+
+    def _changed(self) -> None:
+        self._order = None
+        self._version = next(_STATE_VERSIONS)
+
+    def _list(self) -> List["Card"]:
+        order = self._order
+        if order is None:
+            order = self._order = list(self._cards.values())
+        return order
+
+    def _reset(self, cards: Iterable["Card"]) -> None:
+        self._cards = {c.uid: c for c in cards}
+        self._changed()
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        return (self._version, dict(self._cards))
+
+    def restore(self, snap: Tuple[Any, ...]) -> None:
+        """Back to the contents of snapshot() (a no-op if the zone has not changed since).
+        The zone takes the snapshot's version again: it holds exactly those cards."""
+        if self._version != snap[0]:
+            self._cards = dict(snap[1])
+            self._order = None
+            self._version = snap[0]
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __reversed__(self):
+        return reversed(self._list())
+
+    def __getitem__(self, i):
+        return self._list()[i]
+
+    def __setitem__(self, i, value) -> None:
+        cards = list(self._list())
+        cards[i] = value
+        self._reset(cards)
+
+    def __delitem__(self, i) -> None:
+        cards = list(self._list())
+        del cards[i]
+        self._reset(cards)
+
+    def __contains__(self, card: Any) -> bool:
+        return self._cards.get(getattr(card, "uid", None)) is card
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Zone, list, tuple)):
+            return self._list() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Iterable["Card"]) -> List["Card"]:
+        return self._list() + list(other)
+
+    def __radd__(self, other: Iterable["Card"]) -> List["Card"]:
+        return list(other) + self._list()
+
+    def __repr__(self) -> str:
+        return f"Zone({self._list()!r})"
+
+    def get(self, uid: int) -> Optional["Card"]:
+        return self._cards.get(uid)
+
+    def uids(self) -> List[int]:
+        return list(self._cards)
+
+    def append(self, card: "Card") -> None:
+        self._cards[card.uid] = card
+        self._changed()
+
+    def extend(self, cards: Iterable["Card"]) -> None:
+        for c in cards:
+            self._cards[c.uid] = c
+        self._changed()
+
+    def discard(self, card: "Card") -> bool:
+        """Remove card if it is in the zone; returns whether it was."""
+        if self._cards.get(card.uid) is not card:
+            return False
+        del self._cards[card.uid]
+        self._changed()
+        return True
+
+    def remove(self, card: "Card") -> None:
+        if not self.discard(card):
+            raise ValueError(f"{card.name} is not in this zone")
+
+    def pop(self, i: int = -1) -> "Card":
+        if i == -1 and self._cards:
+            card = self._cards.popitem()[1]
+        else:
+            card = self._list()[i]
+            del self._cards[card.uid]
+        self._changed()
+        return card
+
+    def index(self, card: "Card") -> int:
+        if card in self:
+            for i, c in enumerate(self._list()):
+                if c is card:
+                    return i
+        raise ValueError(f"{card.name} is not in this zone")
+
+    def clear(self) -> None:
+        self._cards.clear()
+        self._changed()
+
+
+def board_keys(card: "Card") -> Iterator[Tuple[str, Any]]:
+    """The Board.counts keys a card in play contributes to (what requirements count)."""
+    yield ("rank", card.rank)
+    yield ("faction", card.faction.lower())
+    yield ("name", card.name.strip().lower())
+    for t in card.traits:
+        yield ("icon", t)
+
+
+class Board(Zone):
+    """A Zone that also counts its cards by rank, icon, faction and name.
+
+    counts is kept up to date on every insert and removal, so a deploy requirement
+    ("control 2 goons with the diamond icon") is a few dict lookups, not a board scan.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self, cards: Iterable["Card"] = ()):
+        self.counts: Counter = Counter()
+        super().__init__(cards)
+
+    def _reset(self, cards: Iterable["Card"]) -> None:
+        super()._reset(cards)
+        self.counts.clear()
+        for c in self._cards.values():
+            self.counts.update(board_keys(c))
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        return (*super().snapshot(), dict(self.counts))
+
+    def restore(self, snap: Tuple[Any, ...]) -> None:
+        if self._version != snap[0]:
+            super().restore(snap)
+            self.counts = Counter(snap[2])
+
+    def append(self, card: "Card") -> None:
+        old = self._cards.get(card.uid)
+        if old is not None:
+            self.counts.subtract(board_keys(old))
+        super().append(card)
+        self.counts.update(board_keys(card))
+
+    def extend(self, cards: Iterable["Card"]) -> None:
+        for c in cards:
+            self.append(c)
+
+    def discard(self, card: "Card") -> bool:
+        if not super().discard(card):
+            return False
+        self.counts.subtract(board_keys(card))
+        return True
+
+    def pop(self, i: int = -1) -> "Card":
+        card = super().pop(i)
+        self.counts.subtract(board_keys(card))
+        return card
+
+    def clear(self) -> None:
+        super().clear()
+        self.counts.clear()
+
+
 @dataclass
 class Player:
     name: str
-    board: List["Card"] = field(default_factory=list)
-    hand: List["Card"] = field(default_factory=list)
+    board: Board = field(default_factory=Board)
+    hand: Zone = field(default_factory=Zone)
     deck: List["Card"] = field(default_factory=list)
-    retired: List["Card"] = field(default_factory=list)
+    retired: Zone = field(default_factory=Zone)
+    dead_pool: Zone = field(default_factory=Zone)
     gear: int = 0
     meat: int = 0
     power: int = 0
+    game: Optional["GameState"] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        # The deck stays a list: it is a draw stack that gets shuffled in place.
+        if not isinstance(self.board, Board):
+            self.board = Board(self.board)
+        for z in ("hand", "retired", "dead_pool"):
+            if not isinstance(getattr(self, z), Zone):
+                setattr(self, z, Zone(getattr(self, z)))
 
 
 @dataclass
@@ -351,6 +1184,19 @@ class Card:
     image_url_mini: str = ""
     image_url_full: str = ""
     statuses: Dict[str, Any] = field(default_factory=dict)
+    used_this_turn: int = 0
+    new_this_turn: bool = False
+    requirement: Optional["Requirement"] = field(default=None, repr=False)
+    # Stable per-instance id; Zones are keyed by it. Copies made with replace() get a new one.
+    uid: int = field(init=False, default_factory=_new_uid, compare=False, repr=False)
+
+    @property
+    def is_titan(self) -> bool:
+        return self.rank == Rank.TITAN
+
+    @property
+    def deploy_cost(self) -> Dict[str, int]:
+        return {"wind": self.deploy_wind, "gear": self.deploy_gear, "meat": self.deploy_meat}
 
 
 # --- Helper for burning gear/meat from dead pool ---
@@ -365,14 +1211,43 @@ def record(msg):
     print(msg)
 
 
-def can_target_card(card, ability):
-    return True
+def say(gs: Optional["GameState"], msg: str) -> None:
+    """Write an engine message for gs: to gs.out (sys.stdout if None), and a copy to
+    gs.gamelog if it has one. Messages for no game go to sys.stdout."""
+    if gs is None:
+        print(msg)
+        return
+    print(msg, file=gs.out)
+    if gs.gamelog is not None:
+        print(msg, file=gs.gamelog)
 
 
-def pay_cost(player, cost):
+def can_target_card(gs, source, target, player, enemy, ability):
+    """Enemy goons under cover, and a protected enemy SL, cannot be targeted."""
+    if enemy is not player and target in enemy.board:
+        if "cover" in target.statuses or _is_leader_protected(enemy, target):
+            return False
     return True
 
 
+def wind_capacity(owner) -> int:
+    """Wind owner's board can still pay (goons pay up to 3, not on the turn they deploy)."""
+    return sum(3 - c.wind for c in owner.board if not c.new_this_turn and c.wind < 3)
+
+
+def pay_cost(gs, player, ability, pending_destroy):
+    """Pay an ability's cost: wind from the player's goons, gear/meat from the dead pool."""
+    cost = getattr(ability, "cost", None) or {}
+    wind = int(cost.get("wind", 0) or 0)
+    if wind > wind_capacity(player):
+        return False
+    if cost.get("gear") and not burn_dead_pool(gs, player, "mechanical", cost["gear"]):
+        return False
+    if cost.get("meat") and not burn_dead_pool(gs, player, "biological", cost["meat"]):
+        return False
+    return bool(distribute_wind(player, wind, auto=True))
+
+
 def is_mechanical(card):
     return "mechanical" in getattr(card, "traits", [])
 
@@ -393,16 +1268,8 @@ def _use_ability_cli(gs, player, sidx, aidx, tidx=None):
     print(f"Use ability: {player.name} src={sidx} abil={aidx} tgt={tidx}")
 
 
-def ai_take_turn(gs, player):
-    print(f"AI {player.name} turn")
-
-
-def _is_ai(ai_mode, who_is_p1):
-    return False
-
-
 def _select_ui(kind: str):
-    if kind == "rich" and Console is not None:
+    if kind == "rich" and _load_rich():
         return RichUI()
     return TerminalUI()
 
@@ -544,8 +1411,13 @@ def _name_matches(card_name: str, patterns: List[str]) -> bool:
     return any(p in n for p in (s.strip().lower() for s in patterns if s))
 
 
+@functools.lru_cache(maxsize=None)
+def _is_leader_name(name: str) -> bool:
+    return _name_matches(name, _UNIQUE_NAME_HINTS)
+
+
 def is_squad_leader(c: Card) -> bool:
-    return c.stars > 0 or _name_matches(c.name, _UNIQUE_NAME_HINTS)
+    return c.stars > 0 or _is_leader_name(c.name)
 
 
 def is_squad_goon(c: Card) -> bool:
@@ -580,7 +1452,7 @@ def conflicts_with_unique(g: GameState, c: Card) -> bool:
     if not is_unique(c):
         return False
     key = (c.name or "").strip().lower()
-    for side in (g.narc_player, g.pcu_player):
+    for side in (g.p1, g.p2):
         for x in side.board:
             if is_unique(x) and (x.name or "").strip().lower() == key:
                 return True
@@ -614,56 +1486,86 @@ def _is_leader_protected(owner: Player, target: Card) -> bool:
 
 
 def destroy_if_needed(owner: Player, c: Card) -> None:
-    # If Vex is destroyed, also destroy Nives
-    if (c.name or "").strip().lower() == "vex":
-        for goon in list(owner.board):
-            if (goon.name or "").strip().lower() == "nives":
-                owner.board.remove(goon)
-                owner.dead_pool.append(goon)
-                print("Nives destroyed because Vex was destroyed.")
-                print(f"[destroy] {owner.name}:Nives (linked to Vex)")
-                print(f"{owner.name}'s Nives destroyed (linked to Vex)")
     if c.wind >= 4:
-        # If Krax is destroyed, also destroy Dragoon
-        if (c.name or "").strip().lower() == "krax":
-            for goon in list(owner.board):
-                if (goon.name or "").strip().lower() == "dragoon":
-                    owner.board.remove(goon)
-                    owner.dead_pool.append(goon)
-                    print("Dragoon destroyed because Krax was destroyed.")
-                    print(f"[destroy] {owner.name}:Dragoon (linked to Krax)")
-                    print(f"{owner.name}'s Dragoon destroyed (linked to Krax)")
-        if c in owner.board:
-            owner.board.remove(c)
-        # Meatjacker returns to owner's hand when destroyed
-        if (c.name or "").strip().lower() == "meatjacker":
-            owner.hand.append(c)
-            print(f"{c.name} destroyed and returns to hand!")
-            print(f"[destroy] {owner.name}:{c.name} -> Hand (Meatjacker rule)")
-            print(f"{owner.name}'s {c.name} destroyed and returns to hand")
-        elif c.is_titan:
-            print(f"{c.name} (Titan) destroyed and burned!")
-            print(f"[destroy] {owner.name}:{c.name} (burn)")
-            print(f"{owner.name}'s {c.name} destroyed")
-        else:
-            owner.dead_pool.append(c)
-            print(f"{c.name} destroyed → Dead Pool")
-            print(f"[destroy] {owner.name}:{c.name} -> Dead Pool")
-            print(f"{owner.name}'s {c.name} destroyed")
-        if is_squad_leader(c):
-            loser = owner.name
-            winner = "PCU" if loser == "NARC" else "NARC"
-            print(f"GAME OVER — {loser}'s Squad Leader ({c.name}) was destroyed. {winner} wins!")
-            print(f"[gameover] leader destroyed: loser={loser}, card={c.name}, winner={winner}")
-            if _GLOG:
-                _GLOG.write("=== game end ===\n")
-                _GLOG.flush()
-                _GLOG.close()
-            print(f"Full game log saved to: {GAMELOG_PATH}")
-            if _LOG:
-                _LOG.flush()
-                _LOG.close()
-            raise SystemExit(0)
+        destroy_card(owner, c)
+
+
+def destroy_card(owner: Player, c: Card, cause: Optional[str] = None) -> None:
+    """Move c from owner's board to the zone it is destroyed into, firing DESTROY triggers.
+
+    cause ("linked to Krax"), if given, is logged in place of the destination: each
+    destruction writes exactly one [destroy] record. Destroying a squad leader ends the
+    game: its GameState gets a result (the first one stands if both leaders fall at once).
+    """
+    if not owner.board.discard(c):
+        return
+    by_wind = c.wind >= 4
+    titan = c.rank == Rank.TITAN
+    event = GameEvent(EventKind.DESTROY, owner, c, dest="retired" if titan else "dead_pool")
+    bus = owner.game.events if owner.game is not None else None
+    if bus is not None:
+        bus.emit(event)
+        bus.detach(c)
+    getattr(owner, event.dest).append(c)
+    if event.dest == "hand":
+        # It can be deployed again: it comes back without the wind and statuses it died with
+        c.wind = 0
+        c.statuses.clear()
+    if cause is not None:
+        say(owner.game, f"[destroy] {owner.name}:{c.name} ({cause})")
+        say(owner.game, f"{owner.name}'s {c.name} destroyed ({cause})")
+    elif event.dest == "hand":
+        say(owner.game, f"{c.name} destroyed and returns to hand!")
+        say(owner.game, f"[destroy] {owner.name}:{c.name} -> Hand")
+        say(owner.game, f"{owner.name}'s {c.name} destroyed and returns to hand")
+    elif titan:
+        say(owner.game, f"{c.name} (Titan) destroyed and burned!")
+        say(owner.game, f"[destroy] {owner.name}:{c.name} (burn)")
+        say(owner.game, f"{owner.name}'s {c.name} destroyed")
+    else:
+        say(owner.game, f"{c.name} destroyed → Dead Pool")
+        say(owner.game, f"[destroy] {owner.name}:{c.name} -> Dead Pool")
+        say(owner.game, f"{owner.name}'s {c.name} destroyed")
+    g = owner.game
+    if is_squad_leader(c) and (g is None or g.result is None):
+        loser = owner.name
+        winner = "PCU" if loser == "NARC" else "NARC"
+        say(g, f"GAME OVER — {loser}'s Squad Leader ({c.name}) was destroyed. {winner} wins!")
+        say(g, f"[gameover] leader destroyed: loser={loser}, card={c.name}, winner={winner}")
+        if g is None:
+            return
+        reason = f"{c.name} {'took 4 wind' if by_wind else 'was destroyed'}"
+        if g.acting:
+            reason += f" ({g.acting})"
+        g.result = GameResult(winner, reason, g.turn_number)
+        if g.gamelog is not None:
+            g.gamelog.write("=== game end ===\n")
+            g.gamelog.flush()
+            say(g, f"Full game log saved to: {getattr(g.gamelog, 'name', '?')}")
+
+
+def _destroy_linked(event: GameEvent, card: Card, owner: Player, partner: str) -> None:
+    if event.owner is owner and event.card.name.strip().lower() == partner:
+        say(owner.game, f"{card.name} destroyed because {event.card.name} was destroyed.")
+        destroy_card(owner, card, cause=f"linked to {event.card.name}")
+
+
+@trigger("nives", EventKind.DESTROY)
+def _nives_follows_vex(event: GameEvent, card: Card, owner: Player) -> None:
+    # If Vex is destroyed, so is Nives
+    _destroy_linked(event, card, owner, "vex")
+
+
+@trigger("dragoon", EventKind.DESTROY)
+def _dragoon_follows_krax(event: GameEvent, card: Card, owner: Player) -> None:
+    # If Krax is destroyed, so is Dragoon
+    _destroy_linked(event, card, owner, "krax")
+
+
+@trigger("meatjacker", EventKind.DESTROY, self_only=True)
+def _meatjacker_returns(event: GameEvent, card: Card, owner: Player) -> None:
+    # Meatjacker returns to its owner's hand when destroyed
+    event.dest = "hand"
 
 
 def _apply_wind_safely(targets: List[Card], total: int) -> int:
@@ -697,7 +1599,7 @@ def distribute_wind(
     if total <= 0:
         return True
     if not owner.board:
-        print("No goons in play to pay wind.")
+        say(owner.game, "No goons in play to pay wind.")
         return False
 
     before = {id(c): (c, c.wind) for c in owner.board}
@@ -707,7 +1609,7 @@ def distribute_wind(
         for _, (card, w0) in before.items():
             if card.wind > w0:
                 for step in range(w0 + 1, card.wind + 1):
-                    print(f"{owner.name} pays 1 wind with {card.name} (now {step})")
+                    say(owner.game, f"{owner.name} pays 1 wind with {card.name} (now {step})")
         for c in list(owner.board):
             destroy_if_needed(owner, c)
         return paid >= total
@@ -716,19 +1618,25 @@ def distribute_wind(
     for _, (card, w0) in before.items():
         if card.wind > w0:
             for step in range(w0 + 1, card.wind + 1):
-                print(f"{owner.name} pays 1 wind with {card.name} (now {step})")
+                say(owner.game, f"{owner.name} pays 1 wind with {card.name} (now {step})")
     for c in list(owner.board):
         destroy_if_needed(owner, c)
     return paid >= total
 
 
 def apply_wind_with_resist(
-    attacker_owner: Player, defender_owner: Player, target: Card, amount: int
+    attacker_owner: Player,
+    defender_owner: Player,
+    target: Card,
+    amount: int,
+    pending: Optional[List[Tuple[Player, Card]]] = None,
 ) -> int:
+    """Add amount wind to target, less 1 for resist against an enemy, and with Krax's wind
+    redirected to Dragoon. Cards this pushes to 4+ wind are appended to pending."""
     if amount <= 0:
         return 0
     is_enemy = attacker_owner is not defender_owner
-    has_resist = "resist" in target.statuses or False
+    has_resist = "resist" in target.statuses or "resist" in target.traits
     reduction = 1 if (is_enemy and has_resist) else 0
     actual = max(0, amount - reduction)
     if target.name.strip().lower() == "krax":
@@ -740,10 +1648,19 @@ def apply_wind_with_resist(
             redirected = min(actual, actual)
             dragoon.wind += redirected
             actual -= redirected
+            if pending is not None and redirected and dragoon.wind >= 4:
+                pending.append((defender_owner, dragoon))
     target.wind += actual
+    if pending is not None and target.wind >= 4:
+        pending.append((defender_owner, target))
+    if actual and defender_owner.game is not None:
+        defender_owner.game.events.emit(
+            GameEvent(EventKind.WIND_RECEIVED, defender_owner, target, actual, attacker_owner)
+        )
     return actual
 
 
+@_engine_phase("cleanup")
 def post_resolve_cleanup(gs: GameState, pending_destroy: List[Tuple[Player, Card]]) -> None:
     seen = set()
     queue: List[Tuple[Player, Card]] = []
@@ -752,14 +1669,23 @@ def post_resolve_cleanup(gs: GameState, pending_destroy: List[Tuple[Player, Card
             seen.add(id(c))
             queue.append((owner, c))
     for owner, c in queue:
-        if c in owner.board and c.wind >= 4:
-            owner.board.remove(c)
-            if c.rank == Rank.TITAN:
-                owner.retired.append(c)
-            elif c.name.strip().lower() == "meatjacker":
-                owner.hand.append(c)
-            else:
-                owner.dead_pool.append(c)
+        destroy_if_needed(owner, c)
+
+
+def effect_targets(effect: Effect) -> str:
+    """Target selector of an effect: "target" (the chosen targets), "each_enemy",
+    "each_friendly" or "each" (both boards). params["trait"] narrows area selectors."""
+    return (effect.params or {}).get("targets", "target")
+
+
+def ability_max_targets(ability: "Ability") -> int:
+    """How many targets a player may choose for ability (0 if it needs none)."""
+    counts = [
+        int((e.params or {}).get("count", 1))
+        for e in ability.effects
+        if effect_targets(e) == "target"
+    ]
+    return max(counts, default=0)
 
 
 class EffectStack:
@@ -769,77 +1695,119 @@ class EffectStack:
     def push(self, eff: Effect):
         self._q.append(eff)
 
+    def clear(self) -> None:
+        self._q.clear()
+
+    @staticmethod
+    def _select(g: GameState, eff: Effect, ctx: Dict[str, Any]) -> List[Tuple[Player, Card]]:
+        """(owner, card) pairs eff applies to, in one pass over the boards involved."""
+        sel = effect_targets(eff)
+        if sel == "target":
+            count = int((eff.params or {}).get("count", 1))
+            return ctx.get("targets", [])[:count]
+        src_owner: Player = ctx["player"]
+        enemy = g.p2 if src_owner is g.p1 else g.p1
+        sides = {"each_enemy": (enemy,), "each_friendly": (src_owner,)}.get(sel, (g.p1, g.p2))
+        trait = (eff.params or {}).get("trait")
+        return [(p, c) for p in sides for c in p.board if trait is None or trait in c.traits]
+
     def resolve(self, ctx: Dict[str, Any]):
+        """Apply queued effects to their targets. Destruction is not done here: cards pushed
+        to 4+ wind or destroyed outright are collected in ctx["pending_destroy"]."""
+        g: GameState = ctx["game"]
+        src_owner: Player = ctx["player"]
+        pending = ctx["pending_destroy"]
         while self._q:
             eff = self._q.pop(0)
-            op = eff.op.lower()
-            args = eff.args or {}
-            g: GameState = ctx["game"]
-            src_owner: Player = ctx["player"]
-            enemy = g.p2 if src_owner is g.p1 else g.p1
-            target = ctx.get("target")
-            pending = ctx["pending_destroy"]
-            if op == "add_wind" and target is not None:
-                apply_wind_with_resist(src_owner, enemy, target, int(args.get("amount", 0)))
-                if target.wind >= 4:
-                    pending.append((enemy, target))
-            elif op == "destroy" and target is not None:
-                target.wind = 4
-                pending.append((enemy, target))
-            elif op == "grant_status" and target is not None:
-                status_name = args.get("status", "cover").lower()
-                expires = args.get("expires")
-                target.statuses[status_name] = {"expires": expires}
-            # extend with more ops as needed
-
-
-effect_stack = EffectStack()
-
-
+            op = eff.kind.lower()
+            args = eff.params or {}
+            selected = self._select(g, eff, ctx)
+            shares = None
+            if args.get("distribute") and selected:
+                # the whole amount is dealt out; targets chosen first take what is left over
+                share, extra = divmod(int(args.get("amount", 0)), len(selected))
+                shares = [share + (i < extra) for i in range(len(selected))]
+            for i, (owner, target) in enumerate(selected):
+                if op == "add_wind":
+                    amount = int(args.get("amount", 0)) if shares is None else shares[i]
+                    if amount < 0:
+                        target.wind = max(0, target.wind + amount)
+                    else:
+                        apply_wind_with_resist(src_owner, owner, target, amount, pending)
+                elif op == "destroy":
+                    target.wind = 4
+                    pending.append((owner, target))
+                elif op == "grant_status":
+                    status_name = args.get("status", "cover").lower()
+                    grant_status(g, owner, target, status_name, args.get("expires"))
+                # extend with more ops as needed
+
+
+@_engine_phase("ability")
 def use_ability(g, p, c_idx, a_idx, t_idx=None):
+    """p's card at c_idx uses its ability a_idx. t_idx is an enemy board index, or a
+    sequence of them for abilities with several targets; area effects need none. Wind
+    distributed among the targets is split evenly, the first targets taking the rest."""
+    if g.result is not None:
+        say(g, "The game is over.")
+        return False
     try:
         card = p.board[c_idx]
     except Exception:
-        print("Invalid source index.")
+        say(g, "Invalid source index.")
         return False
     try:
         ability = card.abilities[a_idx]
     except Exception:
-        print("Invalid ability index.")
+        say(g, "Invalid ability index.")
         return False
     enemy = g.p2 if p is g.p1 else g.p1
     limit = getattr(ability, "limit_per_turn", 1)
     used = getattr(card, "used_this_turn", 0)
     if limit is not None and used >= limit:
-        print(f"{card.name} has already used {ability.name} this turn.")
+        say(g, f"{card.name} has already used {ability.name} this turn.")
         return False
-    target = None
-    if t_idx is not None:
-        if 0 <= t_idx < len(enemy.board):
-            target = enemy.board[t_idx]
-        else:
-            print("Invalid target index.")
+    if t_idx is None:
+        t_idxs = []
+    elif isinstance(t_idx, int):
+        t_idxs = [t_idx]
+    else:
+        t_idxs = list(t_idx)
+    if len(t_idxs) > max(1, ability_max_targets(ability)) or len(set(t_idxs)) < len(t_idxs):
+        say(g, "Too many targets.")
+        return False
+    targets: List[Tuple[Player, Card]] = []
+    for i in t_idxs:
+        if not 0 <= i < len(enemy.board):
+            say(g, "Invalid target index.")
             return False
+        target = enemy.board[i]
         if not can_target_card(g, card, target, p, enemy, ability):
-            print("Illegal target.")
+            say(g, "Illegal target.")
             return False
+        targets.append((enemy, target))
     pending_destroy: List[Tuple[Player, Card]] = []
+    g.acting = f"{p.name}'s {card.name}: {ability.name}"
     if not pay_cost(g, p, ability, pending_destroy):
-        print("Could not pay cost.")
+        say(g, "Could not pay cost.")
+        g.acting = None
         return False
+    g.events.emit(GameEvent(EventKind.ABILITY_USED, p, card, ability=ability))
     for eff in getattr(ability, "effects", []):
-        effect_stack.push(eff)
+        g.effects.push(eff)
     context = {
         "game": g,
         "player": p,
         "source": card,
         "ability": ability,
-        "target": target,
+        "target": targets[0][1] if targets else None,
+        "targets": targets,
         "pending_destroy": pending_destroy,
     }
-    effect_stack.resolve(context)
+    g.effects.resolve(context)
     card.used_this_turn = used + 1
     post_resolve_cleanup(g, pending_destroy)
+    g.acting = None
     return True
 
 
@@ -874,66 +1842,263 @@ def build_cards(deck_obj: Dict[str, Any], faction: str) -> List[Card]:
     - Accepts only tokens like "<int><w|g|m>" (e.g., 1w, 2g, 3m) and "p" (passive).
     - Unknown tokens are ignored safely.
     """
-    cards: List[Card] = []
+    return [build_card(raw, faction) for raw in deck_obj.get("goons", [])]
+
+
+_AREA_TARGETS = (
+    (re.compile(r"\b(?:all|each) enemy goons?\b"), "each_enemy"),
+    (re.compile(r"\bplayer's goons\b"), "each_friendly"),
+)
+_SPLIT_WIND = re.compile(r"(?:add )?(\d+) wind to (\d+) target goons")
+_DISTRIBUTE_WIND = re.compile(r"distribute (\d+) wind among (\d+) target goons")
+_ADD_WIND = re.compile(r"add (\d+) wind")
+
+
+def _parse_effects(text: str, raw: Dict[str, Any]) -> List[Effect]:
+    """Effects of one ability, from its lowercased rules text."""
+    area = next((sel for rx, sel in _AREA_TARGETS if rx.search(text)), None)
+    if "destroy" in text:
+        return [Effect("destroy", {})]
+    if "remove 1 wind" in text:
+        return [Effect("add_wind", {"amount": -1})]
+    m = _SPLIT_WIND.search(text)
+    if m:
+        return [Effect("add_wind", {"amount": int(m.group(1)), "count": int(m.group(2))})]
+    m = _DISTRIBUTE_WIND.search(text)
+    if m:
+        params = {"amount": int(m.group(1)), "count": int(m.group(2)), "distribute": True}
+        return [Effect("add_wind", params)]
+    m = _ADD_WIND.search(text)
+    if m:
+        params: Dict[str, Any] = {"amount": int(m.group(1))}
+        if area:
+            params["targets"] = area
+        return [Effect("add_wind", params)]
+    if area == "each_friendly" and "gain resist" in text:
+        expires = ("start_of_turn", "owner")
+        return [Effect("grant_status", {"status": "resist", "expires": expires, "targets": area})]
+    if "may not be targeted" in text or "cover" in (raw.get("name") or "").lower():
+        return [Effect("grant_status", {"status": "cover", "expires": ("start_of_turn", "owner")})]
+    return []
+
+
+_ICON_RANKS = {"diamond": Rank.SG, "star": Rank.SL, "omega": Rank.TITAN}  # card_badges()
+_REQ_COUNT = r"(\d+|a|an|" + "|".join(_WORD_NUMS) + ")"
+_REQ_ICON = re.compile(r"control " + _REQ_COUNT + r" goons? with the ([a-z_]+) icons?")
+_REQ_KIND = re.compile(r"control " + _REQ_COUNT + r" ([a-z_ ]+?) goons?\b")
+_REQ_NAME = re.compile(r"^(.+?) (?:must be|is) in play\b")
+
+
+@dataclass(frozen=True)
+class Requirement:
+    """A deploy requirement compiled from its rules text: every clause (a Board.counts key
+    and the minimum count) must hold on the deploying player's board."""
+
+    text: str
+    clauses: Tuple[Tuple[Tuple[str, Any], int], ...]
+
+    def met(self, board: Board) -> bool:
+        counts = board.counts
+        return all(counts[key] >= n for key, n in self.clauses)
+
+
+def compile_requirement(text: str) -> Optional[Requirement]:
+    """Requirement for a goon's "requirements" text; None if there is nothing to enforce.
 
-    for raw in deck_obj.get("goons", []):
-        name = raw["name"]
-        rank = parse_rank(raw.get("rank", "Basic Goon"))
-        deploy_cost: Dict[str, int] = {}
-        for tok in raw.get("deploy_cost", []):
+    Understands "<Name> must be in play", "control N goons with the <icon> icon" (the rank
+    badges diamond, star and omega, or an icon such as mechanical) and "control N <rank or
+    faction> goons". Phrasings it does not recognise are ignored, like unknown cost tokens.
+    """
+    t = " ".join((text or "").lower().split())
+    clauses: List[Tuple[Tuple[str, Any], int]] = []
+    for part in re.split(r"\s*(?:,|;|\band\b)\s*", t.rstrip(".")):
+        m = _REQ_NAME.match(part)
+        if m:
+            clauses.append((("name", m.group(1)), 1))
+            continue
+        m = _REQ_ICON.search(part) or _REQ_KIND.search(part)
+        if not m:
+            continue
+        n = m.group(1)
+        n = int(n) if n.isdigit() else _WORD_NUMS.get(n, 1)
+        what = m.group(2)
+        if what in _ICON_RANKS:
+            key: Tuple[str, Any] = ("rank", _ICON_RANKS[what])
+        elif m.re is _REQ_ICON:
+            key = ("icon", what)
+        elif what in {"squad", "squad leader", "basic", "titan"}:
+            key = ("rank", parse_rank({"squad": "sg"}.get(what, what)))
+        else:
+            key = ("faction", what)
+        clauses.append((key, n))
+    return Requirement(text, tuple(clauses)) if clauses else None
+
+
+def requirement_met(player: "Player", card: Card) -> bool:
+    return card.requirement is None or card.requirement.met(player.board)
+
+
+def build_card(raw: Dict[str, Any], faction: str) -> Card:
+    """Build one Card from a single "goons" entry of a deck JSON."""
+    name = raw["name"]
+    rank = parse_rank(raw.get("rank", "Basic Goon"))
+    deploy_cost: Dict[str, int] = {}
+    for tok in raw.get("deploy_cost", []):
+        t = str(tok or "").strip().lower()
+        m = re.fullmatch(r"(\d+)\s*([wgm])", t)
+        if not m:
+            continue
+        n = int(m.group(1))
+        key = {"w": "wind", "g": "gear", "m": "meat"}[m.group(2)]
+        deploy_cost[key] = deploy_cost.get(key, 0) + n
+    abilities: List[Ability] = []
+    for a in raw.get("abilities", []):
+        cost: Dict[str, int] = {}
+        passive = False
+        for tok in a.get("cost", []):
             t = str(tok or "").strip().lower()
+            if t == "p":
+                passive = True
+                continue
             m = re.fullmatch(r"(\d+)\s*([wgm])", t)
             if not m:
                 continue
             n = int(m.group(1))
             key = {"w": "wind", "g": "gear", "m": "meat"}[m.group(2)]
-            deploy_cost[key] = deploy_cost.get(key, 0) + n
-        abilities: List[Ability] = []
-        for a in raw.get("abilities", []):
-            cost: Dict[str, int] = {}
-            passive = False
-            for tok in a.get("cost", []):
-                t = str(tok or "").strip().lower()
-                if t == "p":
-                    passive = True
-                    continue
-                m = re.fullmatch(r"(\d+)\s*([wgm])", t)
-                if not m:
-                    continue
-                n = int(m.group(1))
-                key = {"w": "wind", "g": "gear", "m": "meat"}[m.group(2)]
-                cost[key] = cost.get(key, 0) + n
-            text = (a.get("text") or "").lower()
-            effects: List[Effect] = []
-            if "destroy" in text:
-                effects.append(Effect("destroy", {}))
-            elif "remove 1 wind" in text:
-                effects.append(Effect("add_wind", {"amount": -1}))
-            elif "add 2 wind" in text:
-                effects.append(Effect("add_wind", {"amount": 2}))
-            elif "add 1 wind" in text:
-                effects.append(Effect("add_wind", {"amount": 1}))
-            elif "may not be targeted" in text or "cover" in (raw.get("name") or "").lower():
-                effects.append(
-                    Effect(
-                        "grant_status",
-                        {"status": "cover", "expires": ("start_of_turn", "owner")},
-                    )
-                )
-            abilities.append(Ability(a.get("name", "ABILITY"), cost, effects, passive=passive))
-        cards.append(
-            Card(
-                name=name,
-                rank=rank,
-                faction=faction,
-                abilities=abilities,
-                deploy_wind=deploy_cost.get("wind", 0),
-                deploy_gear=deploy_cost.get("gear", 0),
-                deploy_meat=deploy_cost.get("meat", 0),
-            )
-        )
+            cost[key] = cost.get(key, 0) + n
+        effects = _parse_effects((a.get("text") or "").lower(), raw)
+        abilities.append(Ability(a.get("name", "ABILITY"), cost, effects, passive=passive))
+    icons = {str(i).strip().lower() for i in raw.get("icons", []) if i}
+    return Card(
+        name=name,
+        rank=rank,
+        faction=faction,
+        traits=icons - {faction.lower(), str(raw.get("faction", "")).lower()},
+        abilities=abilities,
+        deploy_wind=deploy_cost.get("wind", 0),
+        deploy_gear=deploy_cost.get("gear", 0),
+        deploy_meat=deploy_cost.get("meat", 0),
+        requirement=compile_requirement(str(raw.get("requirements") or "")),
+    )
+
+
+# ============================== Card catalog ==============================
+# Large catalogs share the deck schema ({"goons": [...]}, each goon with its own "faction").
+# CardCatalog scans the file once for goon object boundaries without decoding it, then
+# parses and builds a goon only when it is first asked for.
+
+# Each match is one bracket plus the run of non-bracket text (whole strings included)
+# before it, so the scan loops once per bracket rather than once per token.
+_CATALOG_SEGMENT = re.compile(rb'[^"{}\[\]]*+(?:"(?:[^"\\]++|\\.)*+"[^"{}\[\]]*+)*+([{}\[\]])')
+_CATALOG_NAME = re.compile(rb'(?:[^"]++|"(?:[^"\\]++|\\.)*+")*?"name"\s*:\s*("(?:[^"\\]++|\\.)*+")')
+_CATALOG_GOONS = re.compile(rb'"goons"\s*:\s*$')
+_CATALOG_INDEX_VERSION = 1
+
+
+def _scan_catalog(buf) -> Dict[str, Tuple[int, int]]:
+    """Return {goon name: (start, end)} byte spans of every object in the "goons" array."""
+    index: Dict[str, Tuple[int, int]] = {}
+    depth = 0
+    goons_depth = -1  # depth inside the "goons" array once entered
+    start = -1
+    name = None
+    for m in _CATALOG_SEGMENT.finditer(buf):
+        ch = m.group(1)
+        if depth == goons_depth + 1 and name is None:
+            found = _CATALOG_NAME.match(buf, m.start(), m.start(1))
+            if found:
+                name = json.loads(found.group(1))
+        if ch == b"{" or ch == b"[":
+            if ch == b"[" and goons_depth < 0 and depth == 1:
+                if _CATALOG_GOONS.search(buf, m.start(), m.start(1)):
+                    goons_depth = 2
+            elif ch == b"{" and depth == goons_depth:
+                start, name = m.start(1), None
+            depth += 1
+            continue
+        depth -= 1
+        if depth < 0:
+            raise ValueError("unbalanced catalog JSON")
+        if depth == goons_depth and start >= 0:
+            if name is not None:
+                index.setdefault(name, (start, m.end()))
+            start = -1
+        elif depth == goons_depth - 1:
+            break
+    return index
+
+
+class CardCatalog:
+    """Indexed, lazily materialised view of a (possibly huge) deck/catalog JSON file.
 
-    return cards
+    index maps goon names to (start, end) byte offsets in the file. raw() decodes a single
+    goon, template() builds and caches its Card, and build_deck() returns fresh instances
+    for a list of names, so picking 40 cards out of thousands never parses the rest.
+    Pass index_path to persist the index next to the catalog between runs.
+    """
+
+    def __init__(self, path: str, *, index_path: Optional[str] = None):
+        import mmap
+
+        self.path = path
+        self._fh = open(path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._buf = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._templates: Dict[str, Card] = {}
+        self.index = self._load_index(index_path, size)
+
+    def _load_index(self, index_path: Optional[str], size: int) -> Dict[str, Tuple[int, int]]:
+        stamp = [_CATALOG_INDEX_VERSION, size, os.stat(self.path).st_mtime_ns]
+        if index_path and os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as fh:
+                    saved = json.load(fh)
+                if saved.get("stamp") == stamp:
+                    return {k: (v[0], v[1]) for k, v in saved["index"].items()}
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        index = _scan_catalog(self._buf)
+        if index_path:
+            tmp = f"{index_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"stamp": stamp, "index": index}, fh, separators=(",", ":"))
+            os.replace(tmp, index_path)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def names(self) -> List[str]:
+        return list(self.index)
+
+    def raw(self, name: str) -> Dict[str, Any]:
+        start, end = self.index[name]
+        return json.loads(self._buf[start:end])
+
+    def template(self, name: str) -> Card:
+        card = self._templates.get(name)
+        if card is None:
+            raw = self.raw(name)
+            card = self._templates[name] = build_card(raw, str(raw.get("faction", "")).upper())
+        return card
+
+    def build_deck(self, names: List[str]) -> List[Card]:
+        """Fresh card instances for names (repeat a name for multiple copies)."""
+        return [_instantiate(self.template(n)) for n in names]
+
+    def close(self) -> None:
+        if not isinstance(self._buf, bytes):
+            self._buf.close()  # the mmap
+        self._fh.close()
+
+    def __enter__(self) -> "CardCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 # --- Deploy cost payment API ---
@@ -957,6 +2122,7 @@ def pay_deploy_cost(
     wind_splits: list[tuple[int, int]],
     burn_mech_idxs: list[int],
     burn_bio_idxs: list[int],
+    pending: Optional[List[Tuple[Player, Card]]] = None,
 ) -> bool:
     dc = card.deploy_cost or {}
     need_w = int(dc.get("wind", 0) or 0)
@@ -966,6 +2132,9 @@ def pay_deploy_cost(
     if len(burn_mech_idxs) != need_g or len(burn_bio_idxs) != need_m:
         return False
     shared = gs.shared_dead
+    burn_idxs = list(burn_mech_idxs) + list(burn_bio_idxs)
+    if len(set(burn_idxs)) != len(burn_idxs) or any(i < 0 for i in burn_idxs):
+        return False
     try:
         sel_mech = [shared[i] for i in burn_mech_idxs]
         sel_bio = [shared[i] for i in burn_bio_idxs]
@@ -981,16 +2150,25 @@ def pay_deploy_cost(
         return False
     if any(i < 0 or i >= len(player.board) or a <= 0 for i, a in wind_splits):
         return False
+    # Like wind_capacity: a goon pays up to 3 wind, and not on the turn it was deployed
+    per_goon: Dict[int, int] = {}
+    for i, a in wind_splits:
+        per_goon[i] = per_goon.get(i, 0) + int(a)
+    for i, a in per_goon.items():
+        src = player.board[i]
+        if src.new_this_turn or src.wind + a > 3:
+            return False
 
-    # Burn shared dead selections → retired (distinct, descending index removal)
-    for idx in sorted(set(burn_mech_idxs + burn_bio_idxs), reverse=True):
-        burned = shared.pop(idx)
+    # Burn shared dead selections → retired (in descending index order)
+    for burned in [shared[i] for i in sorted(burn_idxs, reverse=True)]:
+        shared.remove(burned)
         player.retired.append(burned)
 
-    # Apply wind to payers (deferred death for deploy)
+    # Apply wind to payers; cards this destroys (e.g. Dragoon soaking Krax's wind) are
+    # appended to pending for the caller's cleanup
     for i, a in wind_splits:
         src = player.board[i]
-        apply_wind_with_resist(player, player, src, a)
+        apply_wind_with_resist(player, player, src, a, pending)
 
     return True
 
@@ -999,6 +2177,7 @@ WindSelector = Callable[[GameState, Player, "Card", dict], list[tuple[int, int]]
 BurnSelector = Callable[[GameState, Player, "Card", dict], tuple[list[int], list[int]]]
 
 
+@_engine_phase("deploy")
 def deploy_with_cost(
     gs: GameState,
     player: Player,
@@ -1006,12 +2185,12 @@ def deploy_with_cost(
     pick_wind: WindSelector,
     pick_burn: BurnSelector,
 ) -> bool:
-    if hand_idx < 0 or hand_idx >= len(player.hand):
+    if gs.result is not None or hand_idx < 0 or hand_idx >= len(player.hand):
         return False
     card = player.hand[hand_idx]
     dc = card.deploy_cost or {}
 
-    if not can_pay_deploy_cost(gs, player, card):
+    if not requirement_met(player, card) or not can_pay_deploy_cost(gs, player, card):
         return False
 
     need_w = int(dc.get("wind", 0) or 0)
@@ -1032,23 +2211,1057 @@ def deploy_with_cost(
         if mech_idx is None or bio_idx is None:
             return False
 
-    if not pay_deploy_cost(gs, player, card, wind_splits, mech_idx, bio_idx):
+    pending: List[Tuple[Player, Card]] = []
+    if not pay_deploy_cost(gs, player, card, wind_splits, mech_idx, bio_idx, pending):
         return False
 
-    player.board.append(card)
-    player.hand.pop(hand_idx)
-    post_resolve_cleanup(gs, [])
+    player.hand.remove(card)
+    enter_play(gs, player, card)
+    post_resolve_cleanup(gs, pending)
     return True
 
 
-def main():
-    # Load decks from local files in current folder
+# ============================== Checkpoints ==============================
+# Binary layout (little-endian), version 2:
+#   header   "GSGC" u8:version u32:turn_number u8:turn_seat str8:phase
+#   table    u16:count, then str16 template ids (cards reference them by index)
+#   players  x2: str8:name i32:gear i32:meat i32:power, then zones
+#            board/hand/deck/retired/dead_pool as u16:count + card records
+#   shared   u16:count + card records (gs.shared_dead)
+#   rng      gs.rng as an rng record, u8:has_seed [u64:seed], then u8:count of streams
+#            and for each str8:purpose + rng record
+# A card record is u32:uid u16:template i8:wind u8:rank u8:flags u8:used u16:len + JSON
+# statuses. An rng record is u8:kind: 0 none, 1 Mersenne Twister [u32 x 625 + gauss],
+# 2 CounterRNG [16s:key u64:counter + gauss], with gauss as u8:has_gauss [f64].
+# Version 2 added the uid, so ids in logs stay valid across a save and load. Version 3
+# added the seed and streams; version 2 files (a single rng record) still load.
+
+CHECKPOINT_MAGIC = b"GSGC"
+CHECKPOINT_VERSION = 3
+
+_CP_HEADER = struct.Struct("<4sBIB")
+_CP_U8 = struct.Struct("<B")
+_CP_U16 = struct.Struct("<H")
+_CP_PLAYER = struct.Struct("<iii")
+_CP_CARD = struct.Struct("<IHbBBBH")
+_CP_RNG = struct.Struct("<625I")
+_CP_CTR = struct.Struct("<16sQ")
+_CP_U64 = struct.Struct("<Q")
+_CP_F64 = struct.Struct("<d")
+
+_ZONES = ("board", "hand", "deck", "retired", "dead_pool")
+_FLAG_NEW = 1
+
+
+def card_template_id(card: Card) -> str:
+    """Stable id of the deck entry a card instance was built from."""
+    return f"{card.faction}:{card.name}"
+
+
+def card_templates(*decks: List[Card]) -> Dict[str, Card]:
+    """Map template ids to cards, as needed by load_checkpoint()."""
+    out: Dict[str, Card] = {}
+    for deck in decks:
+        for c in deck:
+            out.setdefault(card_template_id(c), c)
+    return out
+
+
+def deck_hash(*decks: Iterable[Card]) -> str:
+    """Fingerprint of decklists: changes when a card is added, removed or its rules change,
+    not when a deck is shuffled."""
+    h = hashlib.blake2b(digest_size=12)
+    for deck in decks:
+        entries = []
+        for c in deck:
+            abilities = [
+                (
+                    a.name,
+                    sorted(a.cost.items()),
+                    [(e.kind, sorted(e.params.items())) for e in a.effects],
+                )
+                for a in c.abilities
+            ]
+            costs = (c.deploy_wind, c.deploy_gear, c.deploy_meat)
+            needs = c.requirement.clauses if c.requirement else ()
+            entries.append(repr((card_template_id(c), str(c.rank), costs, abilities, needs)))
+        h.update("\n".join(sorted(entries)).encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+def _instantiate(template: Card) -> Card:
+    return replace(
+        template,
+        traits=set(template.traits),
+        abilities=list(template.abilities),
+        statuses={},
+        wind=0,
+        used_this_turn=0,
+        new_this_turn=False,
+    )
+
+
+def _tuplify(val: Any) -> Any:
+    if isinstance(val, list):
+        return tuple(_tuplify(v) for v in val)
+    if isinstance(val, dict):
+        return {k: _tuplify(v) for k, v in val.items()}
+    return val
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.buf = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, st: struct.Struct) -> Tuple[Any, ...]:
+        vals = st.unpack_from(self.buf, self.pos)
+        self.pos += st.size
+        return vals
+
+    def raw(self, n: int) -> bytes:
+        out = bytes(self.buf[self.pos : self.pos + n])
+        if len(out) != n:
+            raise ValueError("truncated checkpoint")
+        self.pos += n
+        return out
+
+    def str8(self) -> str:
+        (n,) = self.unpack(_CP_U8)
+        return self.raw(n).decode("utf-8")
+
+    def str16(self) -> str:
+        (n,) = self.unpack(_CP_U16)
+        return self.raw(n).decode("utf-8")
+
+
+def _str8(s: str) -> bytes:
+    b = s.encode("utf-8")
+    if len(b) > 255:  # cut at a character boundary, not inside a multibyte character
+        b = b[:255].decode("utf-8", errors="ignore").encode("utf-8")
+    return _CP_U8.pack(len(b)) + b
+
+
+def _str16(s: str) -> bytes:
+    b = s.encode("utf-8")
+    return _CP_U16.pack(len(b)) + b
+
+
+def save_checkpoint(gs: GameState) -> bytes:
+    """Serialise a game in progress. Cards are stored by template id plus instance state.
+    Raises ValueError if a card's wind is outside -128..127."""
+    table: Dict[str, int] = {}
+    body: List[bytes] = []
+
+    def zone(cards: Iterable[Card]) -> None:
+        cards = list(cards)
+        body.append(_CP_U16.pack(len(cards)))
+        for c in cards:
+            tid = card_template_id(c)
+            idx = table.get(tid)
+            if idx is None:
+                idx = table[tid] = len(table)
+            sts = b""
+            if c.statuses:
+                sts = json.dumps(c.statuses, separators=(",", ":")).encode("utf-8")
+            if not -128 <= c.wind <= 127:
+                raise ValueError(f"{c.name} has {c.wind} wind, more than a checkpoint holds")
+            rank = c.rank.value if isinstance(c.rank, Rank) else 0
+            flags = _FLAG_NEW if c.new_this_turn else 0
+            body.append(
+                _CP_CARD.pack(c.uid, idx, c.wind, rank, flags, min(c.used_this_turn, 255), len(sts))
+            )
+            if sts:
+                body.append(sts)
+
+    for p in (gs.p1, gs.p2):
+        body.append(_str8(p.name))
+        body.append(_CP_PLAYER.pack(p.gear, p.meat, p.power))
+        for z in _ZONES:
+            zone(getattr(p, z))
+    zone(gs.shared_dead)
+
+    def rng(r: Optional[random.Random]) -> None:
+        if r is None:
+            body.append(_CP_U8.pack(0))
+            return
+        if isinstance(r, CounterRNG):
+            key, counter, gauss = r.getstate()
+            body.append(_CP_U8.pack(2) + _CP_CTR.pack(key, counter))
+        else:
+            _, words, gauss = r.getstate()
+            body.append(_CP_U8.pack(1) + _CP_RNG.pack(*words))
+        if gauss is None:
+            body.append(_CP_U8.pack(0))
+        else:
+            body.append(_CP_U8.pack(1) + _CP_F64.pack(gauss))
+
+    rng(gs.rng)
+    if gs.seed is None:
+        body.append(_CP_U8.pack(0))
+    else:
+        body.append(_CP_U8.pack(1) + _CP_U64.pack(gs.seed))
+    body.append(_CP_U8.pack(len(gs.streams)))
+    for purpose, r in gs.streams.items():
+        body.append(_str8(purpose))
+        rng(r)
+
+    seat = 0 if gs.turn_player is gs.p1 else 1
+    head = [_CP_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, gs.turn_number, seat)]
+    head.append(_str8(gs.phase))
+    head.append(_CP_U16.pack(len(table)))
+    for tid in table:
+        head.append(_str16(tid))
+    return b"".join(head + body)
+
+
+def load_checkpoint(data: bytes, templates: Dict[str, Card]) -> GameState:
+    """Rebuild a GameState from save_checkpoint() output.
+
+    templates maps template ids (see card_template_id) to cards built from the same decks.
+    Raises ValueError on a foreign, truncated or incompatible checkpoint.
+    """
+    r = _Reader(data)
+    try:
+        magic, version, turn_number, seat = r.unpack(_CP_HEADER)
+    except struct.error as e:
+        raise ValueError(f"not a checkpoint: {e}") from None
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("not a checkpoint")
+    if version not in (2, CHECKPOINT_VERSION):
+        raise ValueError(f"unsupported checkpoint version {version}")
+    try:
+        phase = r.str8()
+        (n,) = r.unpack(_CP_U16)
+        table: List[Card] = []
+        for _ in range(n):
+            tid = r.str16()
+            if tid not in templates:
+                raise ValueError(f"unknown card template: {tid}")
+            table.append(templates[tid])
+
+        def zone() -> List[Card]:
+            (count,) = r.unpack(_CP_U16)
+            cards: List[Card] = []
+            for _ in range(count):
+                uid, idx, wind, rank, flags, used, slen = r.unpack(_CP_CARD)
+                c = _instantiate(table[idx])
+                c.uid = uid
+                c.wind = wind
+                if rank:
+                    c.rank = Rank(rank)
+                c.new_this_turn = bool(flags & _FLAG_NEW)
+                c.used_this_turn = used
+                if slen:
+                    c.statuses = _tuplify(json.loads(r.raw(slen)))
+                cards.append(c)
+            return cards
+
+        players: List[Player] = []
+        for _ in range(2):
+            name = r.str8()
+            gear, meat, power = r.unpack(_CP_PLAYER)
+            zones = {z: zone() for z in _ZONES}
+            players.append(Player(name, gear=gear, meat=meat, power=power, **zones))
+        shared_dead = zone()
+
+        def rng() -> random.Random:
+            (kind,) = r.unpack(_CP_U8)
+            if kind == 2:
+                out: random.Random = CounterRNG()
+                key, counter = r.unpack(_CP_CTR)
+            else:
+                out = random.Random()
+                words = r.unpack(_CP_RNG) if kind == 1 else None
+            (has_gauss,) = r.unpack(_CP_U8) if kind else (0,)
+            gauss = r.unpack(_CP_F64)[0] if has_gauss else None
+            if kind == 2:
+                out.setstate((key, counter, gauss))
+            elif kind == 1:
+                out.setstate((3, words, gauss))
+            return out
+
+        main_rng = rng()
+        seed: Optional[int] = None
+        streams: Dict[str, random.Random] = {}
+        if version >= 3:
+            (has_seed,) = r.unpack(_CP_U8)
+            seed = r.unpack(_CP_U64)[0] if has_seed else None
+            (n,) = r.unpack(_CP_U8)
+            for _ in range(n):
+                purpose = r.str8()
+                streams[purpose] = rng()
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"corrupt checkpoint: {e}") from None
+
+    p1, p2 = players
+    gs = GameState(
+        p1=p1,
+        p2=p2,
+        turn_player=p1 if seat == 0 else p2,
+        phase=phase,
+        turn_number=turn_number,
+        rng=main_rng,
+        shared_dead=shared_dead,
+        seed=seed,
+        streams=streams,
+    )
+    cards = [c for p in players for z in _ZONES for c in getattr(p, z)] + shared_dead
+    _reserve_uids(max((c.uid for c in cards), default=0))
+    gs.timers.rebuild(cards)
+    return gs
+
+
+def write_checkpoint(path: str, gs: GameState) -> None:
+    """Atomically write a checkpoint file (a crash never leaves a half-written file)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(save_checkpoint(gs))
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str, templates: Dict[str, Card]) -> GameState:
+    with open(path, "rb") as fh:
+        return load_checkpoint(fh.read(), templates)
+
+
+# ============================== AI ==============================
+# Seat AI: beam search over the actions of the current turn, scored by a memoized static
+# evaluation of the resulting position. There is no look-ahead into the opponent's reply,
+# which keeps a whole game in the tens of milliseconds for bulk simulation.
+
+Action = Tuple[Any, ...]  # ("deploy", hand_idx) | ("use", src_idx, abil_idx, tgt_idx|None)
+
+EVAL_WEIGHTS: Dict[str, float] = {
+    "win": 10_000.0,  # leader destroyed
+    "board": 4.0,  # per goon in play
+    "hand": 0.5,  # per card in hand
+    "wind": 0.6,  # per wind on goons in play
+    "near_lethal": 1.5,  # per goon at 3 wind (the next wind destroys it)
+    "exposed": 6.0,  # leader is targetable (no protectors left)
+    "leader_wind": 1.0,  # per wind on an exposed leader
+    "dead": 1.0,  # per own goon in the dead pool
+    "resources": 0.25,  # dead-pool gear/meat available for deploy costs in hand
+}
+
+
+class _NullWriter:
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def flush(self) -> None:
+        pass
+
+
+class _Rollback:
+    """In-place undo for the state a turn's deploys and abilities can touch.
+
+    Captures zone membership, per-card wind/usage/statuses of cards in play or in hand,
+    player resources and the trigger and timer tables. Search applies candidate actions
+    to the real game and restores it, instead of copying the whole game per candidate.
+    """
+
+    def __init__(self, gs: GameState):
+        self.gs = gs
+        self.players = []
+        self.cards = []
+        for p in (gs.p1, gs.p2):
+            zones = [getattr(p, z) for z in _ZONES]
+            snaps = [list(z) if isinstance(z, list) else z.snapshot() for z in zones]
+            self.players.append((zones, snaps, p, p.gear, p.meat, p.power))
+            for c in itertools.chain(p.board, p.hand):
+                sts = dict(c.statuses)
+                self.cards.append((c, c.wind, c.used_this_turn, c.new_this_turn, sts))
+        self.shared_dead = gs.shared_dead.snapshot()
+        self.bus = gs.events.snapshot()
+        self.timers = gs.timers.snapshot()
+        self.phase, self.acting, self.result = gs.phase, gs.acting, gs.result
+
+    def restore(self) -> None:
+        gs = self.gs
+        for zones, snaps, p, gear, meat, power in self.players:
+            for zone, snap in zip(zones, snaps):
+                if isinstance(zone, list):
+                    zone[:] = snap
+                else:
+                    zone.restore(snap)  # only the zones that changed are rebuilt
+            p.gear, p.meat, p.power = gear, meat, power
+        for c, wind, used, new, sts in self.cards:
+            c.wind, c.used_this_turn, c.new_this_turn = wind, used, new
+            if c.statuses != sts:
+                c.statuses.clear()
+                c.statuses.update(sts)
+        gs.shared_dead.restore(self.shared_dead)
+        gs.events.restore(self.bus)
+        gs.timers.restore(self.timers)
+        gs.phase, gs.acting, gs.result = self.phase, self.acting, self.result
+
+
+def legal_actions(gs: GameState, player: Player) -> List[Action]:
+    """Deploys and ability uses that player could attempt now (costs and targets checked)."""
+    enemy = _opponent_of(gs, player)
+    cap = wind_capacity(player)
+    acts: List[Action] = []
+    for i, c in enumerate(player.hand):
+        if c.deploy_wind <= cap and requirement_met(player, c):
+            acts.append(("deploy", i))
+    for si, c in enumerate(player.board):
+        if c.used_this_turn >= 1:
+            continue
+        for ai, ab in enumerate(c.abilities):
+            if ab.passive or int(ab.cost.get("wind", 0) or 0) > cap:
+                continue
+            acts.append(("use", si, ai, None))
+            if ab.effects and not ability_max_targets(ab):
+                continue  # area effects only
+            for ti, t in enumerate(enemy.board):
+                if can_target_card(gs, c, t, player, enemy, ab):
+                    acts.append(("use", si, ai, ti))
+    return acts
+
+
+def apply_action(gs: GameState, player: Player, action: Action) -> bool:
+    if action[0] == "deploy":
+        return deploy_from_hand(gs, player, action[1])
+    if action[0] == "use":
+        return use_ability(gs, player, *action[1:])
+    raise ValueError(f"unknown action: {action!r}")
+
+
+def _leader_on_board(p: Player) -> bool:
+    return any(is_squad_leader(c) for c in p.board)
+
+
+def _card_key(c: Card) -> Tuple:
+    return (c.name, c.wind, c.used_this_turn, c.new_this_turn, tuple(c.statuses))
+
+
+def state_key(gs: GameState, player: Player) -> Tuple:
+    """Hashable summary of everything evaluate() and the rest of the turn depend on."""
+    sides = []
+    for p in (gs.p1, gs.p2):
+        gear = sum(c.deploy_gear for c in p.hand)
+        meat = sum(c.deploy_meat for c in p.hand)
+        board = tuple(_card_key(c) for c in p.board)
+        sides.append((board, len(p.hand), gear, meat, len(p.dead_pool)))
+    return (player is gs.p1, *sides, len(gs.shared_dead))
+
+
+class BeamSearchAI:
+    """Greedy/beam turn planner over a memoized static evaluation.
+
+    Each search step expands the `width` best sequences found so far by one action, up to
+    `depth` actions; the best sequence is played if it beats the current position and the
+    search repeats from there, for at most `max_actions` actions per turn. width=1 is a
+    plain greedy player.
+    """
+
+    def __init__(
+        self,
+        width: int = 2,
+        depth: int = 2,
+        max_actions: int = 8,
+        weights: Optional[Dict[str, float]] = None,
+        cache_size: int = 100_000,
+    ):
+        self.width = max(1, width)
+        self.depth = max(1, depth)
+        self.max_actions = max_actions
+        self.weights = {**EVAL_WEIGHTS, **(weights or {})}
+        self.cache_size = cache_size
+        self._cache: Dict[Tuple, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _side(self, gs: GameState, p: Player) -> float:
+        w = self.weights
+        leader = None
+        wind = near = 0
+        for c in p.board:
+            wind += c.wind
+            if c.wind >= 3:
+                near += 1
+            if leader is None and is_squad_leader(c):
+                leader = c
+        if leader is None:
+            return -w["win"]
+        score = (
+            w["board"] * len(p.board)
+            + w["hand"] * len(p.hand)
+            - w["wind"] * wind
+            - w["near_lethal"] * near
+            - w["dead"] * len(p.dead_pool)
+        )
+        if not _is_leader_protected(p, leader):
+            score -= w["exposed"] + w["leader_wind"] * leader.wind
+        gear = sum(c.deploy_gear for c in p.hand)
+        meat = sum(c.deploy_meat for c in p.hand)
+        if gear or meat:
+            mech = sum(1 for c in gs.shared_dead if is_mechanical(c))
+            bio = sum(1 for c in gs.shared_dead if is_biological(c))
+            score += w["resources"] * (min(gear, mech) + min(meat, bio))
+        return score
+
+    def evaluate(self, gs: GameState, player: Player, key: Optional[Tuple] = None) -> float:
+        """Static score of gs from player's point of view (higher is better)."""
+        if key is None:
+            key = state_key(gs, player)
+        score = self._cache.get(key)
+        if score is not None:
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = self._side(gs, player) - self._side(gs, _opponent_of(gs, player))
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[key] = score
+        return score
+
+    def candidates(self, gs: GameState, player: Player) -> List[Action]:
+        """legal_actions() minus uses that cannot do anything: effectless abilities only
+        spend wind, and targeted effects do nothing without a target."""
+        out: List[Action] = []
+        for act in legal_actions(gs, player):
+            if act[0] == "use":
+                ab = player.board[act[1]].abilities[act[2]]
+                if not ab.effects or (act[3] is None and ability_max_targets(ab)):
+                    continue
+            out.append(act)
+        return out
+
+    def _expand(self, gs: GameState, player: Player, seq: List[Action], seen, out) -> None:
+        """Score every candidate following seq (already applied to gs) into out."""
+        if gs.result is not None or not (_leader_on_board(gs.p1) and _leader_on_board(gs.p2)):
+            return  # game over
+        undo = _Rollback(gs)
+        for act in self.candidates(gs, player):
+            if apply_action(gs, player, act):  # if a leader fell, evaluate() scores that
+                key = state_key(gs, player)
+                if key not in seen:
+                    seen.add(key)
+                    out.append((self.evaluate(gs, player, key), seq + [act]))
+            undo.restore()
+
+    def plan(self, gs: GameState, player: Player) -> Tuple[List[Action], float]:
+        """Best action sequence (at most depth long) and its score; [] if nothing helps.
+
+        Candidates are tried on gs itself and rolled back; gs (and its RNG) is left as found.
+        """
+        best: Tuple[float, List[Action]] = (self.evaluate(gs, player), [])
+        beam: List[Tuple[float, List[Action]]] = [best]
+        seen = {state_key(gs, player)}
+        root = _Rollback(gs)
+        rng_state = gs.rng_state()
+        try:
+            with gs.quiet(log=True), gs.events.muted():
+                for _ in range(self.depth):
+                    children: List[Tuple[float, List[Action]]] = []
+                    for _, seq in beam:
+                        for act in seq:  # after a winning action the rest are refused
+                            apply_action(gs, player, act)
+                        self._expand(gs, player, seq, seen, children)
+                        root.restore()
+                    if not children:
+                        break
+                    children.sort(key=lambda t: t[0], reverse=True)
+                    beam = children[: self.width]
+                    if beam[0][0] > best[0]:
+                        best = beam[0]
+        finally:
+            root.restore()
+            gs.set_rng_state(rng_state)
+        return best[1], best[0]
+
+    def take_turn(
+        self,
+        gs: GameState,
+        player: Player,
+        on_action: Optional[Callable[[Action], None]] = None,
+    ) -> List[Action]:
+        """Play player's best actions for this turn on gs; returns the actions taken.
+
+        on_action, if given, is called after each action is applied.
+        """
+        taken: List[Action] = []
+        while len(taken) < self.max_actions and gs.result is None:
+            seq, _ = self.plan(gs, player)
+            if not seq:
+                break
+            for act in seq[: self.max_actions - len(taken)]:
+                if not apply_action(gs, player, act):
+                    return taken
+                taken.append(act)
+                if on_action is not None:
+                    on_action(act)
+        return taken
+
+
+_DEFAULT_AI = threading.local()
+
+
+def default_ai() -> BeamSearchAI:
+    """This thread's default BeamSearchAI. Its evaluation cache is shared by every game the
+    thread plays, but not across threads."""
+    ai = getattr(_DEFAULT_AI, "ai", None)
+    if ai is None:
+        ai = _DEFAULT_AI.ai = BeamSearchAI()
+    return ai
+
+
+# ============================== Opening book ==============================
+# The first turns of every game start from a few positions (the squad leaders on board,
+# six-card hands from known decks), so the search would redo the same work each game.
+# An OpeningBook is an SQLite file mapping early positions to the turn a deep search
+# played from there; gsg_book.py builds one offline. Hands are keyed as multisets and
+# moves are stored by template id, so deals that differ only in card order share an
+# entry. The book remembers the deck_hash it was built for and empties itself when it
+# meets other decks.
+
+
+def _book_card(c: Card) -> Tuple:
+    return (
+        card_template_id(c),
+        c.wind,
+        c.used_this_turn,
+        c.new_this_turn,
+        tuple(sorted(c.statuses)),
+    )
+
+
+def opening_key(gs: GameState, player: Player) -> bytes:
+    """Digest of everything player's turn depends on (the hidden decks excepted)."""
+    enemy = _opponent_of(gs, player)
+    sides = []
+    for p in (player, enemy):
+        hand: Tuple = tuple(sorted(card_template_id(c) for c in p.hand))
+        if p is enemy:  # the search only sees its size and what it could pay for
+            hand = (
+                len(hand),
+                sum(c.deploy_gear for c in p.hand),
+                sum(c.deploy_meat for c in p.hand),
+            )
+        board = tuple(_book_card(c) for c in p.board)
+        sides.append((board, hand, len(p.dead_pool), p.gear, p.meat, p.power))
+    dead = tuple(sorted(card_template_id(c) for c in gs.shared_dead))
+    return hashlib.blake2b(repr((*sides, dead)).encode("utf-8"), digest_size=16).digest()
+
+
+class OpeningBook:
+    """Disk-backed map from early positions (opening_key) to the actions to play there.
+
+    Only positions up to turn max_turn are booked. At most max_entries are kept; beyond
+    that the latest-turn entries go first, since the earliest positions recur most.
+    A connection belongs to the thread that opened the book (see default_book()). Build a
+    book from one connection: len() is the row count at open plus this connection's writes.
+    """
+
+    def __init__(self, path: str, *, max_entries: int = 100_000, max_turn: int = 4):
+        import sqlite3
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_turn = max_turn
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS book (key BLOB PRIMARY KEY, turn INTEGER, moves TEXT)"
+        )
+        self.db.commit()
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'deck_hash'").fetchone()
+        self.deck_hash: Optional[str] = row[0] if row else None
+        # rows in the book, kept up to date by this connection's writes
+        self._rows: int = self.db.execute("SELECT COUNT(*) FROM book").fetchone()[0]
+        self._roster: Any = None
+        self._roster_ok = False
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _usable(self, gs: GameState) -> bool:
+        """Whether gs plays the decks the book holds, emptying the book if it was built
+        for other decks. Games not made by setup_game (no roster) are never booked."""
+        if gs.roster is not self._roster:
+            self._roster = gs.roster
+            self._roster_ok = gs.roster is not None
+            if self._roster_ok:
+                decks = deck_hash(*gs.roster)
+                if decks != self.deck_hash:
+                    self.db.execute("DELETE FROM book")
+                    self.db.execute("REPLACE INTO meta VALUES ('deck_hash', ?)", (decks,))
+                    self.db.commit()
+                    self.deck_hash = decks
+                    self._rows = 0
+        return self._roster_ok and gs.turn_number <= self.max_turn
+
+    def lookup(self, gs: GameState, player: Player) -> Optional[List[List[Any]]]:
+        """The booked moves for player's turn in gs, or None."""
+        if not self._usable(gs):
+            return None
+        row = self.db.execute(
+            "SELECT moves FROM book WHERE key = ?", (opening_key(gs, player),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, gs: GameState, player: Player, moves: List[List[Any]]) -> None:
+        """Book moves (as record_turn() writes them) for player's turn in gs."""
+        if self._usable(gs):
+            self._put(opening_key(gs, player), gs.turn_number, moves)
+
+    def _put(self, key: bytes, turn: int, moves: List[List[Any]]) -> None:
+        text = json.dumps(moves)
+        sql = "INSERT OR IGNORE INTO book VALUES (?, ?, ?)"
+        if self.db.execute(sql, (key, turn, text)).rowcount:
+            self._rows += 1
+            excess = self._rows - self.max_entries
+            if excess > 0:
+                self._rows -= self.db.execute(
+                    "DELETE FROM book WHERE key IN "
+                    "(SELECT key FROM book ORDER BY turn DESC, rowid DESC LIMIT ?)",
+                    (excess,),
+                ).rowcount
+        else:
+            self.db.execute("UPDATE book SET turn = ?, moves = ? WHERE key = ?", (turn, text, key))
+        self.db.commit()
+
+    @staticmethod
+    def decode(player: Player, move: List[Any]) -> Optional[Action]:
+        """A booked move as an action on player's current hand and board (None: no such
+        card in hand)."""
+        if move[0] == "deploy":
+            for i, c in enumerate(player.hand):
+                if card_template_id(c) == move[1]:
+                    return ("deploy", i)
+            return None
+        return tuple(move)
+
+    def record_turn(
+        self,
+        gs: GameState,
+        player: Player,
+        ai: BeamSearchAI,
+        on_action: Optional[Callable[[Action], None]] = None,
+    ) -> List[Action]:
+        """Play player's turn with ai and book what it played."""
+        key = opening_key(gs, player) if self._usable(gs) else None
+        turn = gs.turn_number
+        hand = list(player.hand)
+        moves: List[List[Any]] = []
+
+        def note(act: Action) -> None:
+            nonlocal hand
+            if act[0] == "deploy":  # by template id: hand positions depend on the deal
+                moves.append(["deploy", card_template_id(hand[act[1]])])
+            else:
+                moves.append(list(act))
+            hand = list(player.hand)
+            if on_action is not None:
+                on_action(act)
+
+        taken = ai.take_turn(gs, player, note)
+        if key is not None:
+            self._put(key, turn, moves)
+        return taken
+
+
+_BOOK_PATH: Optional[str] = None
+
+
+def use_opening_book(path: Optional[str]) -> None:
+    """Have ai_take_turn consult the opening book at path, on every thread (None: stop)."""
+    global _BOOK_PATH
+    _BOOK_PATH = path
+
+
+def default_book() -> Optional[OpeningBook]:
+    """This thread's connection to the book set by use_opening_book(), if any."""
+    book = getattr(_DEFAULT_AI, "book", None)
+    if book is not None and book.path != _BOOK_PATH:
+        book.close()
+        book = _DEFAULT_AI.book = None
+    if book is None and _BOOK_PATH is not None:
+        book = _DEFAULT_AI.book = OpeningBook(_BOOK_PATH)
+    return book
+
+
+def ai_take_turn(
+    gs: GameState,
+    player: Player,
+    ai: Optional[BeamSearchAI] = None,
+    on_action: Optional[Callable[[Action], None]] = None,
+    book: Optional[OpeningBook] = None,
+) -> List[Action]:
+    """Play player's turn with ai (default: default_ai()). Does not end the turn.
+
+    The opening book (book, or default_book()) is consulted first: if it knows the
+    position, its moves are played without searching.
+    """
+    if book is None:
+        book = default_book()
+    moves = book.lookup(gs, player) if book is not None else None
+    if moves is None:
+        return (ai or default_ai()).take_turn(gs, player, on_action)
+    taken: List[Action] = []
+    for move in moves:
+        act = OpeningBook.decode(player, move)
+        if act is None or not apply_action(gs, player, act):
+            # off the book (should not happen for a book of these decks): search the rest
+            return taken + (ai or default_ai()).take_turn(gs, player, on_action)
+        taken.append(act)
+        if on_action is not None:
+            on_action(act)
+    return taken
+
+
+def _is_ai(ai_mode, who_is_p1):
+    """Whether the seat (p1 is NARC, p2 is PCU) is played by the AI under --ai ai_mode."""
+    mode = (ai_mode or "none").lower()
+    return mode == "both" or mode in (("p1", "narc") if who_is_p1 else ("p2", "pcu"))
+
+
+def _position_key(gs: GameState) -> Tuple:
+    """Everything the AIs' play from the start of a turn depends on: the zones, card
+    state, pending timers (by how far off they are) and the RNG streams. AI games are
+    deterministic, so a game that reaches the same key twice repeats itself from there."""
+    sides = tuple(
+        (
+            tuple(_card_key(c) for c in p.board),
+            tuple(c.uid for c in p.hand),
+            tuple(c.uid for c in p.deck),
+            tuple(p.retired.uids()),
+            tuple(p.dead_pool.uids()),
+            p.gear,
+            p.meat,
+            p.power,
+        )
+        for p in (gs.p1, gs.p2)
+    )
+    due = tuple(sorted(key[0] - gs.turn_number for key in gs.timers._slots))
+    main, streams = gs.rng_state()
+    rng = (main, tuple(sorted(streams.items())))
+    return (gs.turn_player is gs.p1, sides, tuple(gs.shared_dead.uids()), due, rng)
+
+
+def simulate_game(
+    gs: GameState,
+    ais: Tuple[Optional[BeamSearchAI], Optional[BeamSearchAI]] = (None, None),
+    *,
+    max_turns: int = 200,
+    on_step: Optional[Callable[[GameState], None]] = None,
+) -> Optional[str]:
+    """Play gs to the end with an AI in both seats, silently.
+
+    on_step, if given, is called with gs after every action and every end of turn.
+    Returns the winner's name (also in gs.result), or None if max_turns is reached first
+    or the game goes round in circles: a turn starts from a position seen before
+    (_position_key), so the same turns would repeat until max_turns.
+    """
+    step = None if on_step is None else (lambda _act: on_step(gs))
+    seen: set = set()
+    with gs.quiet():
+        if gs.phase == "start":
+            start_of_turn(gs)
+        while gs.turn_number <= max_turns and gs.result is None:
+            if not (_leader_on_board(gs.p1) and _leader_on_board(gs.p2)):
+                break  # a position set up without a leader
+            key = _position_key(gs)
+            if key in seen:
+                break
+            seen.add(key)
+            p = gs.turn_player
+            ai_take_turn(gs, p, ais[0] if p is gs.p1 else ais[1], step)
+            if gs.result is not None:
+                break
+            end_of_turn(gs)
+            if on_step is not None:
+                on_step(gs)
+    if on_step is not None:
+        on_step(gs)  # the final position, also after a game-ending action
+    if gs.result is not None:
+        return gs.result.winner
+    for p in (gs.p1, gs.p2):
+        if not _leader_on_board(p):
+            return _opponent_of(gs, p).name
+    return None
+
+
+def simulate_games(
+    narc_cards: List[Card],
+    pcu_cards: List[Card],
+    seeds: Sequence[int],
+    *,
+    threads: int = 1,
+    max_turns: int = 200,
+) -> List[Optional[str]]:
+    """Winner of one AI-vs-AI game per seed (see simulate_game), played on `threads`
+    threads in this interpreter. Each thread deals its own copies of the decks and
+    resets one game between seeds; results are in seed order and do not depend on
+    the number of threads.
+
+    Throughput with the shipped decks and default BeamSearchAIs is about 14 games/s on
+    one thread (CPython 3.11, games average 13.9 turns); search applies and undoes actions
+    in place (_Rollback), rebuilding only the zones and tables an action changed. To
+    benchmark: GSG_MIN_GAMES_PER_S=10 pytest test_engine.py -k throughput."""
+    results: List[Optional[str]] = [None] * len(seeds)
+    errors: List[BaseException] = []
+
+    def play(lane: int) -> None:
+        try:
+            gs: Optional[GameState] = None
+            for i in range(lane, len(seeds), threads):
+                if gs is None:
+                    narc = [_instantiate(c) for c in narc_cards]
+                    pcu = [_instantiate(c) for c in pcu_cards]
+                    gs = setup_game(narc, pcu, seed=seeds[i])
+                else:
+                    reset_game(gs, seed=seeds[i])
+                results[i] = simulate_game(gs, max_turns=max_turns)
+        except BaseException as e:  # re-raised on the calling thread
+            errors.append(e)
+
+    threads = max(1, min(threads, len(seeds)))
+    if threads == 1:
+        play(0)
+    else:
+        workers = [
+            threading.Thread(target=play, args=(lane,), name=f"gsg-game-{lane}")
+            for lane in range(threads)
+        ]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+# ============================== Spectating ==============================
+@dataclass(frozen=True)
+class CardView:
+    name: str
+    rank: Rank
+    wind: int
+    abilities: Tuple[Ability, ...]
+    statuses: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SeatView:
+    name: str
+    board: Tuple[CardView, ...]
+    hand: Tuple[CardView, ...]
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Read-only copy of what the UIs draw; render() accepts it in place of a GameState."""
+
+    p1: SeatView
+    p2: SeatView
+    turn_player: SeatView
+    turn_number: int
+    phase: str
+
+
+def snapshot_state(gs: GameState) -> StateSnapshot:
+    def seat(p: Player) -> SeatView:
+        def view(c: Card) -> CardView:
+            return CardView(c.name, c.rank, c.wind, tuple(c.abilities), tuple(c.statuses))
+
+        return SeatView(p.name, tuple(map(view, p.board)), tuple(map(view, p.hand)))
+
+    p1, p2 = seat(gs.p1), seat(gs.p2)
+    turn = p1 if gs.turn_player is gs.p1 else p2
+    return StateSnapshot(p1, p2, turn, gs.turn_number, gs.phase)
+
+
+class Spectator:
+    """Draws published game states with ui.render on its own thread, at most fps frames/s.
+
+    publish() only takes a snapshot and never waits for drawing. The render thread draws
+    the latest snapshot; ones published in between two frames are dropped. The last one
+    published before close() is always drawn.
+
+        with Spectator(TerminalUI(), fps=10) as spec:
+            simulate_game(gs, on_step=spec.publish)
+    """
+
+    def __init__(self, ui, fps: float = 10.0, file=None):
+        self.ui = ui
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        # Bound now: callers may redirect sys.stdout while we draw.
+        self.file = file if file is not None else sys.stdout
+        self.published = self.rendered = self.dropped = 0
+        self._latest: Optional[StateSnapshot] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="gsg-spectator", daemon=True)
+
+    def __enter__(self) -> "Spectator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start(self) -> "Spectator":
+        self._thread.start()
+        return self
+
+    def publish(self, gs: GameState) -> None:
+        snap = snapshot_state(gs)
+        with self._cond:
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = snap
+            self.published += 1
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Draw the pending snapshot, if any, and stop the render thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        next_frame = 0.0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._latest is not None or self._closed)
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    self._cond.wait_for(lambda: self._closed, timeout=delay)
+                snap, self._latest = self._latest, None
+                if snap is None:
+                    return
+            self.ui.render(snap, file=self.file)
+            self.rendered += 1
+            next_frame = time.monotonic() + self.interval
+
+
+def load_decks() -> Tuple[List[Card], List[Card]]:
+    """Load and build the NARC and PCU decks from the current folder."""
     narc = load_deck_json("narc_deck.json")
     pcu = load_deck_json("pcu_deck.json")
+    return build_cards(narc, faction="NARC"), build_cards(pcu, faction="PCU")
 
-    narc_cards = build_cards(narc, faction="NARC")
-    pcu_cards = build_cards(pcu, faction="PCU")
 
+def setup_game(
+    narc_cards: List[Card],
+    pcu_cards: List[Card],
+    *,
+    seed: Optional[int] = None,
+    first: str = "random",
+) -> GameState:
+    """Put both SLs on board, shuffle, deal opening hands and pick the first player.
+
+    seed keys every random stream of the game (gs.seed; None: a fresh one), so the same
+    seed and decks always give the same game.
+    """
     # --- Robust SL detection ---
     p1_sl = find_squad_leader(narc_cards)
     p2_sl = find_squad_leader(pcu_cards)
@@ -1074,7 +3287,62 @@ def main():
     p1 = Player("NARC", board=[p1_sl], hand=[], deck=p1_deck, retired=[])
     p2 = Player("PCU", board=[p2_sl], hand=[], deck=p2_deck, retired=[])
 
-    parser = argparse.ArgumentParser(add_help=False)
+    gs = GameState(p1=p1, p2=p2, turn_player=p1, phase="start", turn_number=1)
+    gs.seed_streams(seed)
+    gs.roster = ((p1_sl, *p1_deck), (p2_sl, *p2_deck))
+    _deal(gs, first)
+    return gs
+
+
+def _deal(gs: GameState, first: str) -> None:
+    shuffle_deck(gs, gs.p1)
+    shuffle_deck(gs, gs.p2)
+    draw(gs, gs.p1, 6)
+    draw(gs, gs.p2, 6)
+
+    first = first if first != "random" else gs.stream("first").choice(["p1", "p2"])
+    gs.turn_player = gs.p1 if first == "p1" else gs.p2
+    gs.turn_number = 1
+
+
+def reset_game(gs: GameState, *, seed: Optional[int] = None, first: str = "random") -> GameState:
+    """Return a game made by setup_game to its opening position under a new seed, in place.
+
+    The same Card instances, zones, RNG, bus and timers are reused, so running game after
+    game allocates next to nothing. The result matches setup_game() on fresh copies of
+    the decks with the same seed. Works from any state, including a game that ended
+    mid-action.
+    """
+    if gs.roster is None:
+        raise ValueError("only games created by setup_game can be reset")
+    for p, cards in zip((gs.p1, gs.p2), gs.roster):
+        for z in ("board", "hand", "retired", "dead_pool"):
+            getattr(p, z).clear()
+        for c in cards:
+            c.wind = 0
+            c.used_this_turn = 0
+            c.new_this_turn = False
+            if c.statuses:
+                c.statuses.clear()
+        p.board.append(cards[0])
+        p.deck[:] = cards[1:]
+        p.gear = p.meat = p.power = 0
+        p.game = gs
+    gs.shared_dead.clear()
+    gs.events.clear()
+    gs.timers.rebuild(())
+    gs.effects.clear()
+    for p in (gs.p1, gs.p2):
+        gs.events.attach(p, p.board[0])
+    gs.phase = "start"
+    gs.acting = gs.result = None
+    gs.seed_streams(seed)
+    _deal(gs, first)
+    return gs
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Goon Squad Galaxy simulator")
     parser.add_argument("--ui", choices=["cli", "rich"], default=os.environ.get("GSG_UI", "cli"))
     parser.add_argument(
         "--first",
@@ -1083,29 +3351,84 @@ def main():
     )
     parser.add_argument(
         "--ai",
-        choices=["none", "p1", "p2", "both"],
+        type=str.lower,
+        choices=["none", "p1", "p2", "both", "narc", "pcu"],
         default=os.environ.get("GSG_AI", "none"),
+        help="seats played by the beam-search AI (NARC is p1, PCU is p2)",
     )
     # Coerce env seed properly (argparse won't cast default)
     env_seed = os.environ.get("GSG_SEED")
     default_seed = int(env_seed) if env_seed and env_seed.isdigit() else None
     parser.add_argument("--seed", type=int, default=default_seed)
+    parser.add_argument(
+        "--script",
+        metavar="FILE",
+        help="run commands from FILE ('-' for stdin) without redrawing; "
+        "exit status is 1 if any command failed",
+    )
+    parser.add_argument("--moves", help="comma-separated commands, run like --script")
+    parser.add_argument(
+        "--spectate",
+        action="store_true",
+        help="watch an AI-vs-AI game; the engine runs at full speed and frames are skipped",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=10.0, help="frame rate cap for --spectate (default 10)"
+    )
+    parser.add_argument(
+        "--book",
+        metavar="FILE",
+        default=os.environ.get("GSG_BOOK"),
+        help="opening book the AI plays its first turns from (see gsg_book.py)",
+    )
+    parser.add_argument(
+        "--memtrack",
+        action="store_true",
+        help="trace allocations per engine phase and report peak memory and leaks on exit",
+    )
+    return parser
 
-    args, _ = parser.parse_known_args()
 
-    rng = random.Random(args.seed) if args.seed is not None else random.Random()
+def _run_ui(ui, gs: GameState, args) -> int:
+    if args.script or args.moves:
+        if args.moves:
+            lines = args.moves.split(",")
+        elif args.script == "-":
+            lines = sys.stdin
+        else:
+            with open(args.script, "r", encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+        return ui.run_script(gs, lines)
+    try:
+        ui.run_loop(gs)
+    except (KeyboardInterrupt, EOFError):
+        print("\nExiting game.")
+    return 0
 
-    gs = GameState(p1=p1, p2=p2, turn_player=p1, phase="start", turn_number=1)
-    gs.rng = rng
 
-    shuffle_deck(gs, p1)
-    shuffle_deck(gs, p2)
-    draw(gs, p1, 6)
-    draw(gs, p2, 6)
+def _spectate(ui, gs: GameState, args) -> int:
+    with Spectator(ui, fps=args.fps) as spec:
+        winner = simulate_game(gs, on_step=spec.publish)
+    print(
+        f"winner: {winner or 'none'} (turn {gs.turn_number}); "
+        f"{spec.rendered} frames drawn, {spec.dropped} skipped"
+    )
+    return 0
 
-    first = args.first if args.first != "random" else rng.choice(["p1", "p2"])
-    gs.turn_player = p1 if first == "p1" else p2
-    gs.turn_number = 1
+
+def main():
+    # Parse arguments before touching decks or UI libraries: --help and bad flags exit
+    # without paying for deck parsing, and Rich is only imported by the rich UI.
+    args, _ = build_arg_parser().parse_known_args()
+    mt = MemoryTracker().start() if args.memtrack else None
+    if args.book:
+        use_opening_book(args.book)
+
+    # Load decks from local files in current folder
+    narc_cards, pcu_cards = load_decks()
+    gs = setup_game(narc_cards, pcu_cards, seed=args.seed, first=args.first)
+    if mt is not None:
+        mt.begin_game(gs)
 
     # Only draw for active player at start of turn
     start_of_turn(gs)
@@ -1113,13 +3436,27 @@ def main():
     ui = _select_ui("rich" if args.ui == "rich" else "cli")
     if hasattr(ui, "configure_runtime"):
         ui.configure_runtime(ai=args.ai)
-
+    if args.spectate:
+        args.ai = "both"
+    ai_names = [p.name for p in (gs.p1, gs.p2) if _is_ai(args.ai, p is gs.p1)]
+    if ai_names:
+        print(f"AI enabled for: {', '.join(ai_names)}")
+
+    if args.seed is None:
+        print(f"Seed {gs.seed} (pass --seed {gs.seed} to replay this game)")
     print("GSG engine ready. Decks loaded. SLs on board. (Type 'help' to see commands.)")
     try:
-        ui.run_loop(gs)
-    except (KeyboardInterrupt, EOFError):
-        print("\nExiting game.")
-        return
+        status = (_spectate if args.spectate else _run_ui)(ui, gs, args)
+    finally:
+        if mt is not None:
+            mt.end_game(gs)
+            del gs, narc_cards, pcu_cards
+            print(mt.report(), file=sys.stderr)
+            for leak in mt.leaks():
+                print(f"[memtrack] survived game end: {leak}", file=sys.stderr)
+            mt.stop()
+    if status:
+        raise SystemExit(status)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,404 @@
+"""Sharded, resumable AI-vs-AI simulation sweeps over a file-based work queue.
+
+A sweep is a master seed and a number of games. Game i gets a seed derived from the master
+seed and i alone, so a game plays the same no matter which worker runs it or in what
+order. The coordinator splits the game indexes into shards and writes them into a sweep
+directory, which every worker must be able to reach (a local folder, or a shared mount
+for several machines):
+
+    sweep.json                 parameters (master seed, games, shard size, decks, ...)
+    queue/000012.todo          shard 12, waiting
+    queue/000012.<worker>      shard 12, claimed by a worker (an atomic rename)
+    results/000012.jsonl       shard 12, done: one JSON line per game, written atomically
+
+Workers claim shards one at a time and write each finished shard's results, so an
+interrupted sweep resumes from the shards that have no results yet. A worker touches its
+claim after every game; claims idle for --stale seconds (default 600) are put back in the
+queue by init and run, and --requeue-all puts back every claim (only when no worker is
+running). merge_results() reads the shards in game order, so the merged results equal a
+single-process run with the same master seed.
+
+    python gsg_sweep.py init sweeps/balance --games 100000 --seed 7
+    python gsg_sweep.py work sweeps/balance            # on each node, as often as wanted
+    python gsg_sweep.py run sweeps/balance --workers 8 # or: init/resume + local workers
+    python gsg_sweep.py status sweeps/balance
+    python gsg_sweep.py cards sweeps/balance           # per-card impact (gsg_cardstats)
+    python gsg_sweep.py game sweeps/balance 4711       # replay one game on its own
+
+Each finished shard also leaves results/000012.cards.json, the gsg_cardstats.CardStats of
+its games; merge_card_stats() adds them up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from gsg_cardstats import CardStats, CardStatsCollector, format_report
+from gsg_results import ResultsStore
+from gsg_sim import (
+    GameState,
+    build_cards,
+    deck_hash,
+    derive_seed,
+    load_deck_json,
+    reset_game,
+    setup_game,
+    simulate_game,
+    start_of_turn,
+)
+
+SWEEP_VERSION = 2  # 2: games are dealt from gsg_sim.CounterRNG streams
+STALE_AFTER = 600.0  # seconds without a finished game before a claim is requeued
+
+
+@dataclass(frozen=True)
+class SweepParams:
+    master_seed: int
+    games: int
+    shard_size: int = 250
+    max_turns: int = 200
+    decks: str = "."  # folder with narc_deck.json and pcu_deck.json
+    version: int = SWEEP_VERSION
+
+    @property
+    def shards(self) -> int:
+        return -(-self.games // self.shard_size)
+
+    def shard_range(self, shard: int) -> range:
+        start = shard * self.shard_size
+        return range(start, min(start + self.shard_size, self.games))
+
+
+def game_seed(master_seed: int, index: int) -> int:
+    """Seed of game index in a sweep; depends only on the master seed and the index."""
+    return derive_seed(master_seed, index)
+
+
+# --- Playing games ---
+class _Table:
+    """One pooled game per process, reset between games."""
+
+    def __init__(self, params: SweepParams):
+        self.params = params
+        self.narc = load_deck_json(os.path.join(params.decks, "narc_deck.json"))
+        self.pcu = load_deck_json(os.path.join(params.decks, "pcu_deck.json"))
+        self.gs: Optional[GameState] = None
+        self.decks = ""
+        self.cards = CardStatsCollector()
+
+    def play(self, index: int) -> Dict[str, Any]:
+        seed = game_seed(self.params.master_seed, index)
+        if self.gs is None:
+            narc = build_cards(self.narc, faction="NARC")
+            pcu = build_cards(self.pcu, faction="PCU")
+            self.decks = deck_hash(narc, pcu)
+            self.gs = setup_game(narc, pcu, seed=seed)
+        else:
+            reset_game(self.gs, seed=seed)
+        gs = self.gs
+        first = gs.turn_player.name
+        self.cards.begin_game(gs)
+        with gs.quiet():
+            start_of_turn(gs)
+        winner = simulate_game(gs, max_turns=self.params.max_turns)
+        self.cards.end_game(gs, winner)
+        return {
+            "game": index,
+            "seed": seed,
+            "decks": self.decks,
+            "first": first,
+            "winner": winner,
+            "turns": gs.turn_number,
+            "cause": gs.result.reason if gs.result else None,
+        }
+
+
+def run_serial(params: SweepParams) -> List[Dict[str, Any]]:
+    """Every game of the sweep in one process; the reference for merge_results()."""
+    table = _Table(params)
+    return [table.play(i) for i in range(params.games)]
+
+
+# --- The sweep directory ---
+def _queue(root: str) -> str:
+    return os.path.join(root, "queue")
+
+
+def _results(root: str) -> str:
+    return os.path.join(root, "results")
+
+
+def _result_path(root: str, shard: int) -> str:
+    return os.path.join(_results(root), f"{shard:06d}.jsonl")
+
+
+def _cards_path(root: str, shard: int) -> str:
+    return os.path.join(_results(root), f"{shard:06d}.cards.json")
+
+
+def load_params(root: str) -> SweepParams:
+    with open(os.path.join(root, "sweep.json"), "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    if data.get("version") != SWEEP_VERSION:
+        raise ValueError(f"unsupported sweep version {data.get('version')}")
+    return SweepParams(**data)
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def init_sweep(root: str, params: SweepParams, *, stale: float = STALE_AFTER) -> int:
+    """Create the sweep in root, or resume the one there. Returns the shards left to run.
+
+    Shards with results are kept. Claims with no results whose worker has not finished a
+    game for stale seconds go back in the queue (stale=0: all of them, for when no worker
+    is running).
+    Resuming with different parameters raises ValueError.
+    """
+    os.makedirs(_queue(root), exist_ok=True)
+    os.makedirs(_results(root), exist_ok=True)
+    path = os.path.join(root, "sweep.json")
+    if os.path.exists(path):
+        if load_params(root) != params:
+            raise ValueError(f"{root} holds a sweep with other parameters")
+    else:
+        _write_atomic(path, json.dumps(asdict(params), indent=1))
+
+    queued = {}
+    for name in os.listdir(_queue(root)):
+        if name.endswith(".tmp"):
+            continue
+        queued[int(name.split(".", 1)[0])] = name
+    now = time.time()
+    left = 0
+    for shard in range(params.shards):
+        if os.path.exists(_result_path(root, shard)):
+            continue
+        left += 1
+        name = queued.get(shard)
+        todo = os.path.join(_queue(root), f"{shard:06d}.todo")
+        if name is None:
+            _write_atomic(todo, "")
+        elif not name.endswith(".todo"):
+            claim = os.path.join(_queue(root), name)
+            with contextlib.suppress(FileNotFoundError):
+                if now - os.path.getmtime(claim) >= stale:
+                    os.replace(claim, todo)
+    return left
+
+
+def _claim(root: str, worker: str) -> Optional[int]:
+    for name in sorted(os.listdir(_queue(root))):
+        if not name.endswith(".todo"):
+            continue
+        shard = int(name.split(".", 1)[0])
+        claim = os.path.join(_queue(root), f"{shard:06d}.{worker}")
+        try:
+            os.rename(os.path.join(_queue(root), name), claim)
+        except FileNotFoundError:
+            continue  # another worker was faster
+        os.utime(claim)  # touched again after every game: --stale measures inactivity
+        return shard
+    return None
+
+
+def work(
+    root: str,
+    worker: Optional[str] = None,
+    *,
+    max_shards: Optional[int] = None,
+    db: Optional[str] = None,
+) -> int:
+    """Claim and run shards until the queue is empty. Returns the number of shards run.
+
+    With db, each finished shard is also added to that gsg_results database.
+    """
+    params = load_params(root)
+    store = ResultsStore(db) if db else None
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    table = _Table(params)
+    done = 0
+    while max_shards is None or done < max_shards:
+        shard = _claim(root, worker)
+        if shard is None:
+            break
+        table.cards.stats = CardStats()
+        claim = os.path.join(_queue(root), f"{shard:06d}.{worker}")
+        rows = []
+        for i in params.shard_range(shard):
+            rows.append(table.play(i))
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(claim)  # still working on it
+        if store is not None:
+            store.add_many(rows)
+            store.flush()
+        _write_atomic(_cards_path(root, shard), json.dumps(table.cards.stats.to_json()))
+        lines = [json.dumps(r) + "\n" for r in rows]
+        _write_atomic(_result_path(root, shard), "".join(lines))
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(claim)
+        done += 1
+    if store is not None:
+        store.close()
+    return done
+
+
+def iter_results(root: str) -> Iterator[Dict[str, Any]]:
+    """Results of the finished shards, in game order."""
+    params = load_params(root)
+    for shard in range(params.shards):
+        path = _result_path(root, shard)
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                yield json.loads(line)
+
+
+def merge_results(root: str) -> List[Dict[str, Any]]:
+    """All results of a finished sweep, in game order. Raises if shards are missing."""
+    params = load_params(root)
+    results = list(iter_results(root))
+    if len(results) != params.games:
+        raise ValueError(f"sweep incomplete: {len(results)} of {params.games} games done")
+    return results
+
+
+def merge_card_stats(root: str) -> CardStats:
+    """Per-card statistics over the finished shards."""
+    stats = CardStats()
+    for shard in range(load_params(root).shards):
+        if os.path.exists(_result_path(root, shard)):
+            with open(_cards_path(root, shard), "r", encoding="utf-8") as fh:
+                stats.merge(CardStats.from_json(json.load(fh)))
+    return stats
+
+
+def summarize(results: Sequence[Dict[str, Any]]) -> str:
+    if not results:
+        return "games: 0"
+    wins = Counter(r["winner"] for r in results)
+    first = Counter(r["first"] for r in results)
+    won_first = Counter(r["winner"] for r in results if r["winner"] == r["first"])
+    turns = sum(r["turns"] for r in results) / len(results)
+    lines = [f"games: {len(results)}  mean turns: {turns:.1f}"]
+    for name, n in wins.most_common():
+        line = f"  {name or 'draw'}: {n} ({n / len(results):.1%})"
+        if name and first[name]:
+            line += f"  going first: {won_first[name] / first[name]:.1%}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def run_local(
+    root: str,
+    params: SweepParams,
+    workers: Optional[int] = None,
+    *,
+    stale: float = STALE_AFTER,
+    db: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Create or resume the sweep in root (see init_sweep), run it with local worker
+    processes and merge the results."""
+    if init_sweep(root, params, stale=stale):
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            work(root, db=db)
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                for fut in [
+                    pool.submit(work, root, f"local{i}-{os.getpid()}", db=db)
+                    for i in range(workers)
+                ]:
+                    fut.result()
+    return merge_results(root)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sharded AI-vs-AI simulation sweeps")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("init", "run"):
+        p = sub.add_parser(name)
+        p.add_argument("root", help="sweep directory, shared by all workers")
+        p.add_argument("--games", type=int, required=True)
+        p.add_argument("--seed", type=int, default=0, help="master seed")
+        p.add_argument("--shard-size", type=int, default=250)
+        p.add_argument("--max-turns", type=int, default=200)
+        p.add_argument("--decks", default=".", help="folder with the deck JSON files")
+        p.add_argument(
+            "--stale",
+            type=float,
+            default=STALE_AFTER,
+            help="requeue claims whose worker finished no game for this many seconds",
+        )
+        p.add_argument(
+            "--requeue-all",
+            action="store_true",
+            help="requeue every claim (only when no worker is running)",
+        )
+        if name == "run":
+            p.add_argument("--workers", type=int, default=None)
+            p.add_argument("--db", default=None, help="also add results to this database")
+    p = sub.add_parser("work")
+    p.add_argument("root")
+    p.add_argument("--id", default=None, help="worker name (default: host-pid)")
+    p.add_argument("--db", default=None, help="also add results to this gsg_results database")
+    for name in ("status", "merge"):
+        sub.add_parser(name).add_argument("root")
+    p = sub.add_parser("game", help="replay one game of the sweep and print its result")
+    p.add_argument("root")
+    p.add_argument("index", type=int)
+    p = sub.add_parser("cards", help="per-card impact over the finished shards")
+    p.add_argument("root")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--min-games", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.cmd in ("init", "run"):
+        stale = 0.0 if args.requeue_all else args.stale
+        params = SweepParams(
+            args.seed, args.games, args.shard_size, args.max_turns, os.path.abspath(args.decks)
+        )
+        if args.cmd == "init":
+            print(f"{init_sweep(args.root, params, stale=stale)} shard(s) queued")
+            return 0
+        print(summarize(run_local(args.root, params, args.workers, stale=stale, db=args.db)))
+        return 0
+    if args.cmd == "work":
+        print(f"{work(args.root, args.id, db=args.db)} shard(s) done")
+        return 0
+    params = load_params(args.root)
+    if args.cmd == "status":
+        done = sum(os.path.exists(_result_path(args.root, s)) for s in range(params.shards))
+        claimed = [n for n in os.listdir(_queue(args.root)) if not n.endswith((".todo", ".tmp"))]
+        print(f"{done}/{params.shards} shards done, {len(claimed)} claimed")
+        print(summarize(list(iter_results(args.root))))
+        return 0
+    if args.cmd == "game":
+        row = _Table(params).play(args.index)
+        print(json.dumps(row))
+        return 0
+    if args.cmd == "cards":
+        stats = merge_card_stats(args.root)
+        print(format_report(stats, top=args.top, min_games=args.min_games))
+        return 0
+    for r in merge_results(args.root):
+        print(json.dumps(r))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+"""Watch mode for deck design: edit a deck file, see the result of the change in moments.
+
+DeckWatcher polls the deck JSON files. When one changes, it diffs the goon entries
+against the version it built last and rebuilds only the goons that were added or
+changed; untouched goons keep their Card objects. Each new version of the decks plays
+the same small batch of AI-vs-AI games (the same seeds every time, so two versions
+differ only by the edit) and the report shows what changed and how the win rates moved.
+A file that fails to parse, or a deck left without a squad leader, is reported and the
+last good version stays in use.
+
+    python gsg_watch.py --games 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from gsg_sim import (
+    Card,
+    GameState,
+    build_card,
+    deck_hash,
+    derive_seed,
+    reset_game,
+    setup_game,
+    simulate_game,
+    start_of_turn,
+)
+
+DECK_FILES = (("NARC", "narc_deck.json"), ("PCU", "pcu_deck.json"))
+
+
+@dataclass
+class DeckChange:
+    faction: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __str__(self) -> str:
+        parts = [f"+{n}" for n in self.added] + [f"~{n}" for n in self.changed]
+        return f"{self.faction}: " + ", ".join(parts + [f"-{n}" for n in self.removed])
+
+
+class _Deck:
+    """One deck file: its goon entries (as canonical JSON) and the cards built from them."""
+
+    def __init__(self, faction: str, path: str):
+        self.faction = faction
+        self.path = path
+        self.stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of the last read
+        self.entries: Dict[Tuple[str, int], str] = {}
+        self.cards: Dict[Tuple[str, int], Card] = {}
+        self.order: List[Tuple[str, int]] = []
+
+    def stale(self) -> bool:
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size) != self.stamp
+
+    def reload(self) -> DeckChange:
+        """Reread the file and rebuild the goons that differ. Raises ValueError if the file
+        is not a valid deck; only the stamp changes then, so it is not reread until saved
+        again."""
+        st = os.stat(self.path)
+        self.stamp = (st.st_mtime_ns, st.st_size)
+        with open(self.path, "r", encoding="utf-8") as fh:
+            try:
+                goons = json.load(fh).get("goons", [])
+            except (json.JSONDecodeError, AttributeError) as e:
+                raise ValueError(f"{self.path}: {e}") from None
+        entries: Dict[Tuple[str, int], str] = {}
+        raws: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        seen: Counter = Counter()
+        for raw in goons:
+            if not isinstance(raw, dict) or "name" not in raw:
+                raise ValueError(f"{self.path}: goon entry without a name")
+            key = (raw["name"], seen[raw["name"]])  # same-name entries by occurrence
+            seen[raw["name"]] += 1
+            entries[key] = json.dumps(raw, sort_keys=True)
+            raws[key] = raw
+
+        change = DeckChange(self.faction)
+        cards: Dict[Tuple[str, int], Card] = {}
+        for key, text in entries.items():
+            old = self.entries.get(key)
+            if old == text:
+                cards[key] = self.cards[key]
+                continue
+            try:
+                cards[key] = build_card(raws[key], self.faction)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{self.path}: {key[0]}: {e}") from None
+            (change.added if old is None else change.changed).append(key[0])
+        change.removed = [key[0] for key in self.entries if key not in entries]
+        self.entries, self.cards, self.order = entries, cards, list(entries)
+        return change
+
+    def deck(self) -> List[Card]:
+        return [self.cards[key] for key in self.order]
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        return self.entries, self.cards, self.order
+
+    def restore(self, state: Tuple[Any, ...]) -> None:
+        """Back to an earlier snapshot; the stamp stays, as in reload()."""
+        self.entries, self.cards, self.order = state
+
+
+@dataclass
+class BatchResult:
+    games: int
+    wins: Counter
+    turns: float
+    decks: str
+    seconds: float
+
+    def rate(self, name: str) -> float:
+        return self.wins[name] / self.games if self.games else 0.0
+
+
+class DeckWatcher:
+    """Keeps the decks in a folder built, rebuilding only what changed on disk."""
+
+    def __init__(self, folder: str = ".", *, games: int = 8, seed: int = 0, max_turns: int = 200):
+        self.decks = [_Deck(f, os.path.join(folder, name)) for f, name in DECK_FILES]
+        self.games = games
+        self.seed = seed
+        self.max_turns = max_turns
+        self.last: Optional[BatchResult] = None
+
+    def poll(self) -> Optional[List[DeckChange]]:
+        """Reload the deck files that changed since the last poll. Returns the changes
+        (empty if a file was saved without changes), or None if no file was touched."""
+        stale = [d for d in self.decks if d.stale()]
+        if not stale:
+            return None
+        return [change for change in (d.reload() for d in stale) if change]
+
+    def simulate(self) -> BatchResult:
+        """Play the batch of games with the current decks; the same seeds every time."""
+        started = time.perf_counter()
+        narc, pcu = (d.deck() for d in self.decks)
+        wins: Counter = Counter()
+        turns = 0
+        gs: Optional[GameState] = None
+        for i in range(self.games):
+            seed = derive_seed(self.seed, i)
+            if gs is None:
+                gs = setup_game(narc, pcu, seed=seed)
+            reset_game(gs, seed=seed)  # also clears what earlier versions left on cards
+            with gs.quiet():
+                start_of_turn(gs)
+            wins[simulate_game(gs, max_turns=self.max_turns)] += 1
+            turns += gs.turn_number
+        elapsed = time.perf_counter() - started
+        return BatchResult(
+            self.games, wins, turns / max(self.games, 1), deck_hash(narc, pcu), elapsed
+        )
+
+    def report(self, changes: Sequence[DeckChange], result: BatchResult) -> str:
+        lines = ["; ".join(map(str, changes)) if self.last else "decks loaded"]
+        for f, _ in DECK_FILES:
+            line = f"  {f}: {result.wins[f]}/{result.games} ({result.rate(f):.0%})"
+            if self.last is not None:
+                line += f"  {100 * (result.rate(f) - self.last.rate(f)):+.0f} pts"
+            lines.append(line)
+        lines.append(
+            f"  draws {result.wins[None]}, mean turns {result.turns:.1f}, decks {result.decks},"
+            f" {result.seconds:.2f}s"
+        )
+        self.last = result
+        return "\n".join(lines)
+
+    def step(self) -> Optional[str]:
+        """Poll once; if the decks changed, simulate them and return the report."""
+        saved = [d.snapshot() for d in self.decks]
+        try:
+            changes = self.poll()
+            if changes is None or (not changes and self.last is not None):
+                return None
+            result = self.simulate()
+        except (OSError, ValueError, SystemExit) as e:
+            # OSError: a file caught mid-save; SystemExit: setup_game found no squad leader
+            for d, state in zip(self.decks, saved):
+                d.restore(state)
+            return f"error: {e} (still using the last good version)"
+        return self.report(changes, result)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rerun a simulation batch on every deck edit")
+    parser.add_argument("--decks", default=".", help="folder with the deck JSON files")
+    parser.add_argument("--games", type=int, default=8, help="games per deck version")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between polls")
+    args = parser.parse_args(argv)
+
+    watcher = DeckWatcher(args.decks, games=args.games, seed=args.seed)
+    print(f"watching {', '.join(d.path for d in watcher.decks)} (Ctrl-C to stop)")
+    try:
+        while True:
+            report = watcher.step()
+            if report:
+                print(report, flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+"""Win-probability estimates for a game in progress, by parallel AI rollouts.
+
+Each rollout restores the position from a checkpoint, reshuffles both decks (their order
+is hidden information) and plays the game out with the default AI in both seats. Rollouts
+run in batches across a process pool until the confidence interval for each side's win
+rate is narrow enough, so decided positions cost a few dozen games instead of thousands.
+
+    python gsg_winprob.py game.ckpt --tolerance 0.03
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from gsg_sim import (
+    Card,
+    GameState,
+    card_templates,
+    derive_seed,
+    load_checkpoint,
+    load_decks,
+    new_seed,
+    read_checkpoint,
+    save_checkpoint,
+    simulate_game,
+)
+
+
+@dataclass
+class WinEstimate:
+    """Rollout outcome counts and win rates for the two seats of a position."""
+
+    p1: str
+    p2: str
+    p1_wins: int
+    p2_wins: int
+    draws: int
+    confidence: float
+    p1_interval: Tuple[float, float]
+    p2_interval: Tuple[float, float]
+
+    @property
+    def rollouts(self) -> int:
+        return self.p1_wins + self.p2_wins + self.draws
+
+    @property
+    def p1_win(self) -> float:
+        return self.p1_wins / self.rollouts if self.rollouts else 0.0
+
+    @property
+    def p2_win(self) -> float:
+        return self.p2_wins / self.rollouts if self.rollouts else 0.0
+
+    def __str__(self) -> str:
+        lo1, hi1 = self.p1_interval
+        lo2, hi2 = self.p2_interval
+        return (
+            f"{self.p1} {self.p1_win:.1%} [{lo1:.1%}, {hi1:.1%}]  "
+            f"{self.p2} {self.p2_win:.1%} [{lo2:.1%}, {hi2:.1%}]  "
+            f"draws {self.draws}  ({self.rollouts} rollouts, {self.confidence:.0%} CI)"
+        )
+
+
+def wilson_interval(successes: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion; well behaved near 0 and 1."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * ((p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+# --- Worker side: the position is shipped once per process by _init_worker ---
+_POSITION: Optional[Tuple[bytes, Dict[str, Card], int]] = None
+
+
+def _init_worker(data: bytes, templates: Dict[str, Card], horizon: int) -> None:
+    global _POSITION
+    _POSITION = (data, templates, horizon)
+
+
+def rollout(data: bytes, templates: Dict[str, Card], seed: int, horizon: int) -> Optional[str]:
+    """Play one game out from a checkpoint with both decks reshuffled by seed.
+
+    Returns the winner's name, or None if nobody won within horizon more turns.
+    """
+    gs = load_checkpoint(data, templates)
+    gs.seed_streams(seed)
+    for p in (gs.p1, gs.p2):
+        gs.rng.shuffle(p.deck)
+    return simulate_game(gs, max_turns=gs.turn_number + horizon)
+
+
+def _rollout_batch(seeds: Sequence[int]) -> List[Optional[str]]:
+    data, templates, horizon = _POSITION
+    return [rollout(data, templates, s, horizon) for s in seeds]
+
+
+def estimate_win_probability(
+    gs: GameState,
+    templates: Dict[str, Card],
+    *,
+    confidence: float = 0.95,
+    tolerance: float = 0.05,
+    min_rollouts: int = 32,
+    max_rollouts: int = 4096,
+    batch: int = 16,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    horizon: int = 200,
+) -> WinEstimate:
+    """Estimate each side's chance to win from gs by AI rollouts.
+
+    Rollouts run in batches of `batch` until both seats' Wilson intervals have a half-width
+    of at most tolerance (checked as batches finish, after min_rollouts) or max_rollouts
+    is reached. workers=0 runs in this process; None uses one worker per CPU. The same
+    seed gives the same rollouts, though with workers the stopping point may differ.
+    Checking the interval after every batch makes it slightly optimistic; it is a
+    stopping rule, not a significance test.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    data = save_checkpoint(gs)
+    seed = new_seed() if seed is None else seed
+    counts = {gs.p1.name: 0, gs.p2.name: 0, None: 0}
+
+    def estimate() -> WinEstimate:
+        n = sum(counts.values())
+        w1, w2 = counts[gs.p1.name], counts[gs.p2.name]
+        return WinEstimate(
+            gs.p1.name,
+            gs.p2.name,
+            w1,
+            w2,
+            counts[None],
+            confidence,
+            wilson_interval(w1, n, z),
+            wilson_interval(w2, n, z),
+        )
+
+    def settled() -> bool:
+        est = estimate()
+        if est.rollouts >= max_rollouts:
+            return True
+        if est.rollouts < min_rollouts:
+            return False
+        return all((hi - lo) / 2 <= tolerance for lo, hi in (est.p1_interval, est.p2_interval))
+
+    def next_batch(submitted: int) -> List[int]:
+        n = min(batch, max_rollouts - submitted)
+        return [derive_seed(seed, "rollout", k) for k in range(submitted, submitted + n)]
+
+    def record(results: List[Optional[str]]) -> None:
+        for winner in results:
+            counts[winner] += 1
+
+    if workers == 0:
+        submitted = 0
+        _init_worker(data, templates, horizon)
+        while not settled():
+            chunk = next_batch(submitted)
+            submitted += len(chunk)
+            record(_rollout_batch(chunk))
+        return estimate()
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(data, templates, horizon)
+    ) as pool:
+        submitted = 0
+        pending = set()
+        while True:
+            while len(pending) < workers and submitted < max_rollouts and not settled():
+                chunk = next_batch(submitted)
+                submitted += len(chunk)
+                pending.add(pool.submit(_rollout_batch, chunk))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                record(fut.result())
+            if settled():
+                for fut in pending:
+                    fut.cancel()
+                break
+    return estimate()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Estimate win probabilities for a checkpoint")
+    parser.add_argument("checkpoint", help="file written by gsg_sim.write_checkpoint()")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max CI half-width")
+    parser.add_argument("--max-rollouts", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=None, help="0 runs in-process")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    templates = card_templates(*load_decks())
+    gs = read_checkpoint(args.checkpoint, templates)
+    est = estimate_win_probability(
+        gs,
+        templates,
+        confidence=args.confidence,
+        tolerance=args.tolerance,
+        max_rollouts=args.max_rollouts,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(est)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+from dataclasses import replace
+
+from gsg_book import build_book
+from gsg_sim import (
+    BeamSearchAI,
+    OpeningBook,
+    ai_take_turn,
+    build_cards,
+    derive_seed,
+    load_deck_json,
+    reset_game,
+    setup_game,
+    start_of_turn,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def decks():
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    return narc, pcu
+
+
+def test_book_replays_the_deep_search_and_is_bounded_and_tied_to_the_decks(tmp_path):
+    path = str(tmp_path / "book.db")
+    narc, pcu = decks()
+    deep = BeamSearchAI(width=3, depth=2)
+    book = OpeningBook(path, max_turn=2)
+    stats = build_book(book, narc, pcu, games=4, ai=deep)
+    assert stats.searched == len(book) > 0
+    assert build_book(book, narc, pcu, games=4, ai=deep).searched == 0  # all booked now
+
+    # a booked position plays what the deep search plays, under any hand order
+    narc, pcu = decks()  # fresh cards, not the ones build_book played with
+    seed = derive_seed(0, "book", 0)  # build_book's first game: its turn 1 is booked
+    gs = setup_game(narc, pcu, seed=seed)
+    start_of_turn(gs)
+    moves = book.lookup(gs, gs.turn_player)
+    assert moves is not None
+    expected = deep.take_turn(gs, gs.turn_player)
+    board = [(c.name, c.wind) for c in gs.turn_player.board]
+    reset_game(gs, seed=seed)
+    start_of_turn(gs)
+    gs.turn_player.hand[:] = list(reversed(gs.turn_player.hand))
+    played = ai_take_turn(gs, gs.turn_player, BeamSearchAI(width=1, depth=1), book=book)
+    assert [a[0] for a in played] == [a[0] for a in expected] == [m[0] for m in moves]
+    assert [(c.name, c.wind) for c in gs.turn_player.board] == board
+    book.close()
+
+    small = OpeningBook(path, max_entries=2, max_turn=2)
+    build_book(small, narc, pcu, games=2, seed=9, ai=BeamSearchAI(width=1, depth=1))
+    assert len(small) <= 2
+
+    changed = [
+        replace(c, deploy_wind=c.deploy_wind + 1) if i == 3 else c for i, c in enumerate(narc)
+    ]
+    gs = setup_game(changed, pcu, seed=1)
+    start_of_turn(gs)
+    assert small.lookup(gs, gs.turn_player) is None and len(small) == 0
+    small.close()
@@ -0,0 +1,75 @@
+import random
+
+from gsg_cardstats import CardStats, CardStatsCollector, RunningStats
+from gsg_sim import (
+    EventKind,
+    GameEvent,
+    card_template_id,
+    load_decks,
+    reset_game,
+    setup_game,
+    simulate_game,
+    start_of_turn,
+)
+
+
+def test_running_stats_merge_matches_a_single_stream():
+    rng = random.Random(1)
+    xs = [rng.randint(0, 9) for _ in range(101)]
+    whole, left, right = RunningStats(), RunningStats(), RunningStats()
+    for x in xs:
+        whole.add(x)
+    for x in xs[:37]:
+        left.add(x)
+    for x in xs[37:]:
+        right.add(x)
+    merged = left.merge(right)
+    mean = sum(xs) / len(xs)
+    assert merged.n == whole.n == 101
+    assert abs(merged.mean - mean) < 1e-9 and abs(whole.mean - mean) < 1e-9
+    var = sum((x - mean) ** 2 for x in xs) / 100
+    assert abs(merged.variance - var) < 1e-9 and abs(whole.variance - var) < 1e-9
+
+
+def test_collector_counts_played_games_and_round_trips_through_json():
+    narc, pcu = load_decks()
+    gs = setup_game(narc, pcu, seed=2)
+    split = [CardStatsCollector(), CardStatsCollector()]
+    together = CardStatsCollector()
+    winners = []
+    for seed in range(4):
+        reset_game(gs, seed=seed)
+        for collector in (split[seed % 2], together):
+            collector.begin_game(gs)
+        start_of_turn(gs)
+        winner = simulate_game(gs, max_turns=40)
+        winners.append(winner)
+        split[seed % 2].end_game(gs, winner)
+        together.end_game(gs, winner)
+    assert not gs.events._observers  # end_game detaches
+
+    stats = together.stats
+    assert stats.games == 4
+    leaders = [tid for tid, c in stats.cards.items() if c.games == 4]
+    assert len(leaders) >= 2  # the squad leaders are in play every game
+    assert sum(c.uses.mean * c.uses.n for c in stats.cards.values()) > 0
+    assert sum(c.leader_kills for c in stats.cards.values()) <= sum(w is not None for w in winners)
+
+    merged = CardStats.from_json(split[0].stats.to_json()).merge(split[1].stats)
+    assert merged.games == stats.games and merged.cards.keys() == stats.cards.keys()
+    for tid, c in stats.cards.items():
+        m = merged.cards[tid]
+        assert (m.games, m.wins, m.leader_kills) == (c.games, c.wins, c.leader_kills)
+        assert abs(m.wind.mean - c.wind.mean) < 1e-9 and abs(m.uses.m2 - c.uses.m2) < 1e-9
+
+
+def test_only_enemy_wind_is_counted():
+    narc, pcu = load_decks()
+    gs = setup_game(narc, pcu, seed=3)
+    collector = CardStatsCollector()
+    collector.begin_game(gs)
+    leader = gs.p1.board[0]
+    for source, amount in ((gs.p1, 2), (gs.p2, 1), (None, 4)):  # deploy cost, enemy, unknown
+        gs.events.emit(GameEvent(EventKind.WIND_RECEIVED, gs.p1, leader, amount, source))
+    collector.end_game(gs, None)
+    assert collector.stats.card(card_template_id(leader)).wind.mean == 1
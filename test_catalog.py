@@ -0,0 +1,40 @@
+import json
+import os
+
+from gsg_sim import CardCatalog, build_cards, load_deck_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_templates_match_build_cards():
+    path = os.path.join(HERE, "pcu_deck.json")
+    expected = {c.name: c for c in build_cards(load_deck_json(path), faction="PCU")}
+    with CardCatalog(path) as cat:
+        assert cat.names() == list(expected)
+        for name in cat.names():
+            assert cat.template(name) == expected[name]
+        assert cat.template("Krax") is cat.template("Krax")
+
+
+def test_index_ignores_nested_names_and_string_brackets(tmp_path):
+    goons = [
+        {
+            "abilities": [{"name": "NOT A GOON", "text": 'odd } ] [ { "name": x \\'}],
+            "name": 'Quote "Q" [1]',
+            "faction": "narc",
+        },
+        {"name": "Käsekobold", "faction": "pcu", "deploy_cost": ["2w"]},
+    ]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"id": "all", "meta": {"name": "x"}, "goons": goons}, indent=1))
+    idx = tmp_path / "catalog.idx"
+
+    with CardCatalog(str(path), index_path=str(idx)) as cat:
+        assert cat.names() == ['Quote "Q" [1]', "Käsekobold"]
+        assert cat.raw('Quote "Q" [1]') == goons[0]
+        deck = cat.build_deck(["Käsekobold", "Käsekobold"])
+        assert deck[0] is not deck[1] and deck[0].deploy_wind == 2
+        assert deck[0].faction == "PCU"
+    assert idx.exists()
+    with CardCatalog(str(path), index_path=str(idx)) as cat:
+        assert "Käsekobold" in cat and len(cat) == 2
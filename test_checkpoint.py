@@ -0,0 +1,133 @@
+import os
+import random
+
+import pytest
+
+from gsg_sim import (
+    CounterRNG,
+    GameState,
+    Player,
+    Zone,
+    build_cards,
+    card_templates,
+    draw,
+    find_squad_leader,
+    load_checkpoint,
+    load_deck_json,
+    save_checkpoint,
+    setup_game,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_game(seed=7):
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    templates = card_templates(narc, pcu)
+    sl1, sl2 = find_squad_leader(narc), find_squad_leader(pcu)
+    p1 = Player("NARC", board=[sl1], deck=[c for c in narc if c is not sl1])
+    p2 = Player("PCU", board=[sl2], deck=[c for c in pcu if c is not sl2])
+    gs = GameState(p1=p1, p2=p2, turn_player=p2, rng=random.Random(seed))
+    gs.rng.shuffle(p1.deck)
+    gs.rng.shuffle(p2.deck)
+    draw(gs, p1, 6)
+    draw(gs, p2, 6)
+    return gs, templates
+
+
+def snapshot(gs):
+    def zone(cards):
+        return [
+            (c.name, c.rank, c.wind, c.statuses, c.used_this_turn, c.new_this_turn) for c in cards
+        ]
+
+    players = []
+    for p in (gs.p1, gs.p2):
+        zones = [zone(getattr(p, z)) for z in ("board", "hand", "deck", "retired", "dead_pool")]
+        players.append((p.name, p.gear, p.meat, p.power, zones))
+    return (gs.turn_number, gs.phase, gs.turn_player.name, players, zone(gs.shared_dead))
+
+
+def test_round_trip_preserves_state_and_rng():
+    gs, templates = make_game()
+    gs.turn_number, gs.phase = 5, "main"
+    gs.p1.board[0].wind = 3
+    gs.p1.board[0].statuses["cover"] = {"expires": ("start_of_turn", "owner")}
+    gs.p1.board[0].used_this_turn = 1
+    gs.p2.hand[0].new_this_turn = True
+    gs.p2.dead_pool.append(gs.p2.deck.pop())
+    gs.shared_dead.append(gs.p1.deck.pop())
+
+    restored = load_checkpoint(save_checkpoint(gs), templates)
+
+    assert snapshot(restored) == snapshot(gs)
+    assert restored.rng.random() == gs.rng.random()
+    assert restored.p1.board[0] is not gs.p1.board[0]
+
+
+def test_rejects_foreign_and_truncated_data():
+    gs, templates = make_game()
+    blob = save_checkpoint(gs)
+    with pytest.raises(ValueError):
+        load_checkpoint(b"nope" + blob[4:], templates)
+    with pytest.raises(ValueError):
+        load_checkpoint(blob[: len(blob) // 2], templates)
+    with pytest.raises(ValueError):
+        load_checkpoint(blob, {})
+
+
+def test_zones_keep_order_and_card_uids_survive_a_round_trip():
+    gs, templates = make_game()
+    hand = gs.p1.hand
+    first, second = hand[0], hand[1]
+    uids = hand.uids()
+    assert isinstance(hand, Zone) and len(set(uids)) == len(uids)
+    hand.remove(first)
+    assert hand[0] is second and first not in hand and hand.get(first.uid) is None
+    hand.append(first)
+    assert hand.uids() == uids[1:] + uids[:1]
+
+    restored = load_checkpoint(save_checkpoint(gs), templates)
+    assert restored.p1.hand.uids() == hand.uids()
+    assert restored.p1.hand.get(second.uid).name == second.name
+    fresh = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    assert min(c.uid for c in fresh) > max(hand.uids())
+
+
+def test_counter_streams_are_independent_and_survive_a_round_trip():
+    a, b = CounterRNG(7, "deal"), CounterRNG(7, "deal")
+    b.random()  # b is one draw ahead ...
+    assert [a.random() for _ in range(3)][1:] == [b.random() for _ in range(2)]
+    b.setstate(a.getstate())
+    assert a.getrandbits(100) == b.getrandbits(100) and a.getrandbits(100) < 1 << 100
+    deck = list(range(30))
+    CounterRNG(7, "deal").shuffle(deck)
+    assert sorted(deck) == list(range(30)) and deck != list(range(30))
+
+    _, templates = make_game()
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    gs = setup_game(narc, pcu, seed=11)
+    gs.stream("ai").random()
+    first = gs.stream("first").getstate()
+    restored = load_checkpoint(save_checkpoint(gs), templates)
+    assert restored.seed == 11 and restored.stream("first").getstate() == first
+    assert restored.stream("ai").random() == gs.stream("ai").random()
+    assert restored.rng.random() == gs.rng.random()
+    assert gs.stream("other").random() == CounterRNG(11, "other").random()
+
+
+def test_long_non_ascii_names_round_trip_and_wind_is_range_checked():
+    gs, templates = make_game()
+    card = gs.p1.hand[0]
+    card.name = "Käsekobold " * 30  # over 255 UTF-8 bytes, with multibyte characters
+    templates = card_templates(list(templates.values()), [card])
+    gs.p1.name = "Ü" * 200  # 400 bytes: cut to whole characters
+    restored = load_checkpoint(save_checkpoint(gs), templates)
+    assert restored.p1.hand[0].name == card.name
+    assert restored.p1.name == "Ü" * 127
+
+    card.wind = 200
+    with pytest.raises(ValueError):
+        save_checkpoint(gs)
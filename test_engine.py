@@ -0,0 +1,372 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from gsg_sim import (
+    _TRIGGERS,
+    Ability,
+    BeamSearchAI,
+    Effect,
+    EventKind,
+    MemoryTracker,
+    Rank,
+    Spectator,
+    TerminalUI,
+    _instantiate,
+    _Rollback,
+    apply_wind_with_resist,
+    build_cards,
+    card_templates,
+    deploy_from_hand,
+    destroy_if_needed,
+    end_of_turn,
+    enter_play,
+    grant_status,
+    legal_actions,
+    load_checkpoint,
+    load_deck_json,
+    reset_game,
+    save_checkpoint,
+    setup_game,
+    simulate_game,
+    simulate_games,
+    start_of_turn,
+    trigger,
+    use_ability,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Opt-in benchmark: floor for AI-vs-AI games per second on one thread (about 14 measured
+# on a desktop core). Wall-clock checks are flaky on shared runners, so unset skips it.
+MIN_GAMES_PER_S = os.environ.get("GSG_MIN_GAMES_PER_S")
+
+
+def new_game(seed=1, first="p1"):
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    gs = setup_game(narc, pcu, seed=seed, first=first)
+    start_of_turn(gs)
+    return gs, card_templates(narc, pcu)
+
+
+def test_statuses_expire_at_their_scheduled_turn_only():
+    gs, _ = new_game()
+    narc_sl, pcu_sl = gs.p1.board[0], gs.p2.board[0]
+    grant_status(gs, gs.p1, narc_sl, "cover", ("start_of_turn", "owner"))
+    grant_status(gs, gs.p2, pcu_sl, "resist", ("end_of_turn", "owner"))
+    grant_status(gs, gs.p1, narc_sl, "marked")  # no expiry
+
+    end_of_turn(gs)  # -> PCU turn 2
+    assert "cover" in narc_sl.statuses and "resist" in pcu_sl.statuses
+    end_of_turn(gs)  # PCU end_of_turn expires resist -> NARC turn 3 expires cover
+    assert set(narc_sl.statuses) == {"marked"}
+    assert pcu_sl.statuses == {}
+    assert len(gs.timers) == 0
+
+
+def test_regranted_status_keeps_latest_expiry_and_survives_checkpoint():
+    gs, templates = new_game()
+    sl = gs.p1.board[0]
+    grant_status(gs, gs.p1, sl, "cover", ("end_of_turn", "owner"))
+    grant_status(gs, gs.p1, sl, "cover", ("start_of_turn", "owner"))  # re-grant: turn 3
+
+    restored = load_checkpoint(save_checkpoint(gs), templates)
+    for g in (gs, restored):
+        end_of_turn(g)
+        assert "cover" in g.p1.board[0].statuses
+        end_of_turn(g)
+        assert "cover" not in g.p1.board[0].statuses
+
+
+def by_name(cards, name):
+    return next(c for c in cards if c.name == name)
+
+
+def put_in_play(gs, player, name):
+    card = by_name(player.hand + player.deck, name)
+    (player.hand if card in player.hand else player.deck).remove(card)
+    enter_play(gs, player, card)
+    return card
+
+
+def test_destroy_triggers_run_only_for_attached_cards():
+    gs, _ = new_game()
+    pcu = gs.p2
+    krax = put_in_play(gs, pcu, "Krax")
+    dragoon = put_in_play(gs, pcu, "Dragoon")
+    meatjacker = put_in_play(gs, pcu, "Meatjacker")
+    assert gs.events.listener_count(EventKind.DESTROY) == 2
+
+    meatjacker.wind = 4
+    destroy_if_needed(pcu, meatjacker)
+    assert meatjacker in pcu.hand and meatjacker not in pcu.dead_pool
+
+    krax.wind = 4
+    destroy_if_needed(pcu, krax)
+    assert krax in pcu.dead_pool and dragoon in pcu.dead_pool
+    assert pcu.board == [pcu.board[0]]
+    assert gs.events.listener_count(EventKind.DESTROY) == 0
+
+
+def test_linked_destruction_logs_one_destroy_record_per_card():
+    gs, _ = new_game()
+    pcu = gs.p2
+    krax = put_in_play(gs, pcu, "Krax")
+    put_in_play(gs, pcu, "Dragoon")
+    gs.out = io.StringIO()
+    krax.wind = 4
+    destroy_if_needed(pcu, krax)
+    records = [line for line in gs.out.getvalue().splitlines() if line.startswith("[destroy]")]
+    assert sorted(records) == [
+        "[destroy] PCU:Dragoon (linked to Krax)",
+        "[destroy] PCU:Krax -> Dead Pool",
+    ]
+
+
+def test_area_and_multi_target_effects_resolve_in_one_pass():
+    gs, _ = new_game()
+    narc, pcu = gs.p1, gs.p2
+    grim = pcu.board[0]
+    krax = put_in_play(gs, pcu, "Krax")
+    dragoon = put_in_play(gs, pcu, "Dragoon")
+    toad = put_in_play(gs, pcu, "Psychodelic Toad")
+    howler = put_in_play(gs, pcu, "Blood Howler")
+    toad.wind = dragoon.wind = 2
+    quake = Effect("add_wind", {"amount": 2, "targets": "each_enemy", "trait": "organic"})
+    narc.board[0].abilities.append(Ability("QUAKE", {}, [quake]))
+
+    assert use_ability(gs, narc, 0, len(narc.board[0].abilities) - 1)
+    # Resist soaks 1 on Grim and Krax; Krax's wind goes to Dragoon; Howler is mechanical.
+    assert (grim.wind, krax.wind, dragoon.wind, howler.wind) == (1, 0, 3, 0)
+    assert toad in pcu.dead_pool and pcu.board == [grim, krax, dragoon, howler]
+
+    lobber = put_in_play(gs, narc, "Nob Lobber")  # SCATTER LOAD: 1 wind to 2 target Goons
+    assert not use_ability(gs, narc, 1, 0, [1, 2, 3])
+    assert not use_ability(gs, narc, 1, 0, [3, 3])
+    assert use_ability(gs, narc, 1, 0, [2, 3])
+    assert (dragoon.wind, howler.wind) == (4, 1)
+    assert dragoon in pcu.dead_pool and lobber.used_this_turn == 1
+
+
+def test_distributed_wind_is_dealt_out_in_full():
+    gs, templates = new_game()
+    narc, pcu = gs.p1, gs.p2
+    array = templates["NARC:Marine Marauder"].abilities[1].effects[0]
+    assert array.params == {"amount": 3, "count": 3, "distribute": True}
+    goons = [put_in_play(gs, pcu, n) for n in ("Helvis", "Blood Howler", "Psychodelic Toad")]
+    spread = Effect("add_wind", {"amount": 4, "count": 3, "distribute": True})
+    narc.board[0].abilities.append(Ability("SPREAD", {}, [spread]))
+    leader = narc.board[0]
+
+    assert use_ability(gs, narc, 0, len(leader.abilities) - 1, [3, 1, 2])
+    assert [c.wind for c in goons] == [1, 1, 2]  # 4 among 3: the first target takes the rest
+    leader.used_this_turn = 0
+    assert use_ability(gs, narc, 0, len(leader.abilities) - 1, [1])
+    assert goons[0].wind == 5 and goons[0] not in pcu.board  # all 4 on a single target
+
+
+def test_custom_trigger_hears_wind_received():
+    seen = []
+
+    @trigger("Grim", EventKind.WIND_RECEIVED, self_only=True)
+    def _grim_hurt(event, card, owner):
+        seen.append((card.name, event.amount))
+
+    try:
+        gs, _ = new_game()
+        apply_wind_with_resist(gs.p1, gs.p2, gs.p2.board[0], 2)
+        apply_wind_with_resist(gs.p2, gs.p1, gs.p1.board[0], 1)
+    finally:
+        _TRIGGERS["grim"].remove((EventKind.WIND_RECEIVED, True, _grim_hurt))
+    assert seen == [("Grim", 1)]  # Grim's resist icon soaks 1 of the 2
+
+
+def test_memory_tracker_reports_phases_and_survivors():
+    with MemoryTracker() as mt:
+        gs = new_game()[0]
+        mt.begin_game(gs)
+        deploy_from_hand(gs, gs.turn_player, 0)
+        end_of_turn(gs)
+        end_of_turn(gs)
+        kept = gs.p1.board[0]
+        mt.end_game(gs)
+        del gs
+        leaks = mt.leaks()
+    assert {"deploy", "start_of_turn", "end_of_turn"} <= set(mt.phases)
+    assert mt.phases["end_of_turn"][0] == 2
+    assert len(mt.game_peaks) == 1 and mt.game_peaks[0] > 0
+    assert leaks == [f"Card {kept.name} (NARC board)"]
+
+
+def test_beam_search_leaves_game_untouched_and_plays_reproducibly():
+    gs, _ = new_game(seed=5)
+    ai = BeamSearchAI()
+    for _ in range(6):
+        before = save_checkpoint(gs)
+        seq, score = ai.plan(gs, gs.turn_player)
+        assert save_checkpoint(gs) == before
+        assert score >= ai.evaluate(gs, gs.turn_player)
+        ai.take_turn(gs, gs.turn_player)
+        end_of_turn(gs)
+    assert ai.hits > 0
+
+    winners = {simulate_game(new_game(seed=9)[0], max_turns=60) for _ in range(2)}
+    assert len(winners) == 1
+
+
+def test_spectator_draws_latest_snapshot_off_the_engine_thread():
+    class SlowUI(TerminalUI):
+        def __init__(self):
+            self.frames, self.threads = [], set()
+
+        def render(self, gs, file=None):
+            self.threads.add(threading.current_thread().name)
+            self.frames.append(gs.turn_number)
+            super().render(gs, file)
+
+    gs, _ = new_game(seed=5)
+    ui, out = SlowUI(), io.StringIO()
+    with Spectator(ui, fps=5, file=out) as spec:
+        winner = simulate_game(gs, max_turns=40, on_step=spec.publish)
+        ended = gs.turn_number
+    assert winner is not None
+    assert spec.published > spec.rendered and spec.rendered + spec.dropped == spec.published
+    assert ui.frames[-1] == ended and ui.threads == {"gsg-spectator"}
+    assert "Board P1 (NARC)" in out.getvalue()
+
+
+def test_reset_game_reuses_cards_and_matches_a_fresh_setup():
+    gs, _ = new_game(seed=4)
+    cards = {id(c) for p in (gs.p1, gs.p2) for c in p.board + p.hand + p.deck}
+    board = gs.p1.board
+    simulate_game(gs, max_turns=30)
+
+    reset_game(gs, seed=11, first="p2")
+    fresh, _ = new_game(seed=11, first="p2")
+    start_of_turn(gs)
+
+    def position(g):
+        zones = ("board", "hand", "deck", "retired", "dead_pool")
+        return [
+            [(c.name, c.wind, c.statuses) for c in getattr(p, z)]
+            for p in (g.p1, g.p2)
+            for z in zones
+        ], (g.turn_number, g.turn_player.name, len(g.shared_dead), g.rng.getstate())
+
+    assert position(gs) == position(fresh)
+    assert {id(c) for p in (gs.p1, gs.p2) for c in p.board + p.hand + p.deck} == cards
+    assert gs.p1.board is board
+    assert simulate_game(gs, max_turns=40) == simulate_game(fresh, max_turns=40)
+
+
+def test_no_simulated_game_runs_to_max_turns():
+    gs, _ = new_game()
+    for seed in range(20):
+        reset_game(gs, seed=seed)
+        simulate_game(gs)
+        assert gs.turn_number < 60  # stuck games end as repeated positions, not at 200
+
+
+@pytest.mark.skipif(not MIN_GAMES_PER_S, reason="benchmark: set GSG_MIN_GAMES_PER_S to run")
+def test_mass_simulation_throughput():
+    gs, _ = new_game()
+    started = time.perf_counter()
+    for seed in range(40):
+        reset_game(gs, seed=seed)
+        simulate_game(gs)
+    assert 40 / (time.perf_counter() - started) >= float(MIN_GAMES_PER_S)
+
+
+def test_games_on_threads_share_no_state_and_keep_their_own_messages(capsys):
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    seeds = list(range(6))
+    assert simulate_games(narc, pcu, seeds, threads=3, max_turns=40) == simulate_games(
+        narc, pcu, seeds, max_turns=40
+    )
+
+    gs, _ = new_game()
+    gs.out, gs.gamelog = io.StringIO(), io.StringIO()
+    assert not use_ability(gs, gs.turn_player, 99, 0)
+    with gs.quiet(log=True):
+        assert not use_ability(gs, gs.turn_player, 98, 0)
+    assert gs.out.getvalue() == gs.gamelog.getvalue() == "Invalid source index.\n"
+    assert capsys.readouterr().out == ""
+
+
+def test_destroying_a_leader_records_the_result_and_ends_the_game():
+    gs, _ = new_game()
+    leader = gs.p2.board[0]
+    leader.wind = 4
+    destroy_if_needed(gs.p2, leader)  # returns: no SystemExit
+    assert gs.over and gs.result.winner == "NARC" and gs.result.turn == gs.turn_number
+    assert gs.result.reason == f"{leader.name} took 4 wind"
+    turn = gs.turn_number
+    assert not use_ability(gs, gs.turn_player, 0, 0)
+    assert not deploy_from_hand(gs, gs.turn_player, 0)
+    end_of_turn(gs)
+    assert gs.turn_number == turn
+    assert simulate_game(gs) == "NARC"
+
+
+def test_deploy_requirements_are_checked_against_board_counts():
+    gs, templates = new_game()
+    narc = gs.p1
+    enforcer = _instantiate(templates["NARC:Bruut Enforcer"])
+    assert enforcer.requirement.clauses == ((("rank", Rank.SG), 2),)
+    enforcer.deploy_wind = 0  # only the requirement stands in the way
+    narc.hand.extend([enforcer])
+    idx = narc.hand.index(enforcer)
+    assert ("deploy", idx) not in legal_actions(gs, narc)
+    assert not deploy_from_hand(gs, narc, idx)
+
+    goons = [c for c in templates.values() if c.rank == Rank.SG and c.faction == "NARC"][:2]
+    for c in goons:
+        enter_play(gs, narc, _instantiate(templates[f"NARC:{c.name}"]))
+    assert narc.board.counts[("rank", Rank.SG)] == 2
+    assert ("deploy", idx) in legal_actions(gs, narc)
+    narc.board.discard(narc.board[-1])
+    assert narc.board.counts[("rank", Rank.SG)] == 1
+    assert not deploy_from_hand(gs, narc, idx)
+
+    dragoon = _instantiate(templates["PCU:Dragoon"])
+    assert dragoon.requirement.clauses == ((("name", "krax"), 1),)
+    assert not dragoon.requirement.met(gs.p2.board)
+    undo = _Rollback(gs)
+    enter_play(gs, gs.p2, _instantiate(templates["PCU:Krax"]))
+    assert dragoon.requirement.met(gs.p2.board)
+    undo.restore()  # a search rollback puts the counts back with the cards
+    assert not dragoon.requirement.met(gs.p2.board) and len(gs.p2.board) == 1
+
+
+def test_cli_deploy_goes_through_the_engine():
+    from ui.cli import CLI
+
+    gs, _ = new_game()
+    p = gs.turn_player
+    idx = next(a[1] for a in legal_actions(gs, p) if a[0] == "deploy")
+    card = p.hand[idx]
+    seen = []
+    gs.events.observe(lambda e: seen.append((e.kind, e.card)))
+    assert CLI().execute(gs, f"deploy {'p1' if p is gs.p1 else 'p2'} {idx}")
+    assert card in p.board and card.new_this_turn
+    assert (EventKind.DEPLOY, card) in seen
+
+
+def test_rich_ui_passes_every_target_to_the_engine():
+    from rich.console import Console
+
+    from ui.rich_ui import RichUI
+
+    gs, _ = new_game()
+    narc, pcu = gs.p1, gs.p2
+    dragoon = put_in_play(gs, pcu, "Dragoon")
+    howler = put_in_play(gs, pcu, "Blood Howler")
+    put_in_play(gs, narc, "Nob Lobber")  # SCATTER LOAD: 1 wind to 2 target Goons
+    ui = RichUI()
+    ui.console = Console(file=io.StringIO())
+    assert ui._use_ability(gs, narc, 1, 0, [1, 2])
+    assert (dragoon.wind, howler.wind) == (1, 1)
@@ -0,0 +1,50 @@
+import os
+
+import gsg_fuzz
+from gsg_fuzz import check_invariants, fuzz, fuzz_game, load_raw_decks, replay
+from gsg_sim import deploy_from_hand, destroy_if_needed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DECKS = load_raw_decks(HERE)
+
+
+def test_short_fuzz_run_is_clean():
+    report = fuzz(range(12), steps=120, workers=0, decks=DECKS)
+    assert report.games == 12 and report.steps > 12 * 30
+    assert not report.failures, "\n".join(map(str, report.failures.values()))
+
+
+def test_regressions_replay_cleanly():
+    gsg_fuzz._init_worker(DECKS)
+    # deploy_with_cost read a deploy_cost attribute cards did not have
+    assert replay(0, [("deploy_cost", 0, 5, ((0, 0),), (-1,), (0, 0))]) is None
+    # a goon returned to hand kept the wind it was destroyed with
+    gs = gsg_fuzz.new_game(516)
+    total = gsg_fuzz._card_count(gs)
+    pcu = gs.p2
+    jacker = next(c for c in list(pcu.deck) + list(pcu.hand) if c.name == "Meatjacker")
+    if jacker in pcu.deck:
+        pcu.deck.remove(jacker)
+        pcu.hand.append(jacker)
+    assert deploy_from_hand(gs, pcu, pcu.hand.index(jacker))
+    jacker.wind = 4
+    destroy_if_needed(pcu, jacker)
+    assert jacker in pcu.hand and jacker.wind == 0
+    assert deploy_from_hand(gs, pcu, pcu.hand.index(jacker))
+    assert jacker in pcu.board and jacker.wind == 0
+    check_invariants(gs, total)
+
+
+def test_failures_are_shrunk_to_a_minimal_sequence(monkeypatch):
+    gsg_fuzz._init_worker(DECKS)
+    real_end = gsg_fuzz.end_of_turn
+
+    def flaky_end(gs):
+        if gs.turn_number == 3:
+            raise RuntimeError("third end of turn")
+        real_end(gs)
+
+    monkeypatch.setattr(gsg_fuzz, "end_of_turn", flaky_end)
+    steps, failure = fuzz_game(3, 200)
+    assert failure is not None and failure.signature.startswith("RuntimeError at test_fuzz.py")
+    assert failure.actions == [("end",)] * 3 and steps == 3
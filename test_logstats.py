@@ -0,0 +1,91 @@
+import io
+
+import gsg_logstats
+from gsg_logstats import LogStats, format_report, scan_logs
+from gsg_sim import destroy_if_needed, enter_play, load_decks, setup_game
+
+GAME = """=== game start ===
+TURN 1: AI(NARC) begins turn
+NARC deploys Impact Simulant
+NARC pays 1 wind with Lokar Simmons (now 1)
+NARC pays 2 wind with Lokar Simmons (now 3)
+NARC: Lokar Simmons uses RESOURCEFUL — draw 1 card(s)
+AI(PCU) begins turn
+PCU: Krax uses SLAM — add 2 wind
+Vex destroyed → Dead Pool
+[destroy] NARC:Vex -> Dead Pool
+[destroy] NARC:Nives (linked to Vex)
+TURN 3: AI(NARC) begins turn
+PCU: Krax uses SLAM — add 2 wind
+[destroy] NARC:Lokar Simmons -> Dead Pool
+[gameover] leader destroyed: loser=NARC, card=Lokar Simmons, winner=PCU
+=== game end ===
+"""
+
+
+def test_aggregates_one_game():
+    stats = LogStats()
+    gsg_logstats._GameTracker(stats).feed(GAME.encode())
+    assert stats.wind_paid == {"Lokar Simmons": 3}
+    assert stats.deploys == {"Impact Simulant": 1}
+    assert stats.ability_uses == {("Lokar Simmons", "RESOURCEFUL"): 1, ("Krax", "SLAM"): 2}
+    assert stats.destroyed == {
+        ("Vex", "SLAM"): 1,
+        ("Nives", "linked to Vex"): 1,
+        ("Lokar Simmons", "SLAM"): 1,
+    }
+    assert stats.game_lengths == {3: 1} and stats.winners == {"PCU": 1}
+    assert LogStats.from_json(stats.to_json()) == stats
+
+
+def test_a_linked_kill_from_the_engine_counts_once():
+    gs = setup_game(*load_decks(), seed=1)
+    pcu = gs.p2
+    krax, dragoon = (next(c for c in pcu.deck if c.name == n) for n in ("Krax", "Dragoon"))
+    for card in (krax, dragoon):
+        pcu.deck.remove(card)
+        enter_play(gs, pcu, card)
+    gs.out = io.StringIO()
+    krax.wind = 4
+    destroy_if_needed(pcu, krax)
+
+    stats = LogStats()
+    gsg_logstats._GameTracker(stats).feed(gs.out.getvalue().encode())
+    assert stats.destroyed == {("Krax", "unknown"): 1, ("Dragoon", "linked to Krax"): 1}
+
+
+def test_game_lengths_are_a_histogram():
+    stats = LogStats()
+    for turns in (4, 9, 4, 12, 7):
+        stats.game_lengths[turns] += 1
+    assert stats.games == 5
+    assert "turns: mean 7.2, median 7, max 12" in format_report(stats)
+    merged = LogStats.from_json(stats.to_json()).merge(stats)
+    assert merged.game_lengths == {4: 4, 7: 2, 9: 2, 12: 2}
+
+
+def test_rescan_reads_only_appended_lines(tmp_path, monkeypatch):
+    log, idx = tmp_path / "game_log.txt", str(tmp_path / "stats.idx")
+    head, tail = GAME.split("AI(PCU) begins turn\n")
+    log.write_bytes(head.encode())
+    assert scan_logs([str(log)], index_path=idx).games == 0  # game still in progress
+
+    fed = []
+    real_feed = gsg_logstats._GameTracker.feed
+    monkeypatch.setattr(
+        gsg_logstats._GameTracker,
+        "feed",
+        lambda self, chunk: fed.append(len(chunk)) or real_feed(self, chunk),
+    )
+    with open(log, "ab") as fh:
+        fh.write(("AI(PCU) begins turn\n" + tail + "=== game start ===\nNARC pa").encode())
+    stats = scan_logs([str(log)], index_path=idx)
+    assert sum(fed) == len(("AI(PCU) begins turn\n" + tail + "=== game start ===\n").encode())
+    assert stats.games == 1 and stats.game_lengths == {3: 1}
+    assert stats.ability_uses[("Krax", "SLAM")] == 2
+
+    # Rewritten in place: the fingerprint no longer matches, so the log is rescanned.
+    log.write_bytes(GAME.replace("Krax", "Kray").encode())
+    stats = scan_logs([str(log)], index_path=idx)
+    assert stats.ability_uses == {("Lokar Simmons", "RESOURCEFUL"): 1, ("Kray", "SLAM"): 2}
+    assert stats.games == 1
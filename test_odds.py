@@ -0,0 +1,56 @@
+import itertools
+import os
+from fractions import Fraction
+
+from gsg_odds import DrawDeck, at_least, cards_seen, draw_deck, parse_condition, probability
+from gsg_sim import Card, Rank, load_deck_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_probabilities_match_counting_every_hand():
+    cards = [
+        Card("Krax", Rank.SG, "PCU", deploy_wind=1),
+        Card("Grunt", Rank.SG, "PCU", traits={"mechanical"}, deploy_wind=2),
+        Card("Probe", Rank.BG, "PCU", traits={"mechanical"}, deploy_wind=1),
+        Card("Titan", Rank.TITAN, "PCU", deploy_wind=3),
+    ]
+    deck = DrawDeck("PCU", tuple(zip(cards, (2, 3, 2, 1))))
+    pile = [c for c, n in deck.entries for _ in range(n)]
+    queries = [
+        ["wind=1"],
+        ["2x rank=sg"],
+        ["wind<=1", "icon=mechanical"],
+        ["2x icon=mechanical", "name=krax", "rank=titan"],
+    ]
+    for texts in queries:
+        conds = [parse_condition(t) for t in texts]
+        for draws in (1, 3, 5):
+            hands = list(itertools.combinations(pile, draws))
+            hits = sum(
+                all(sum(map(cond.pred, hand)) >= cond.at_least for cond in conds) for hand in hands
+            )
+            assert probability(deck, conds, draws) == Fraction(hits, len(hands)), (texts, draws)
+
+
+def test_deck_is_expanded_by_duplicates_without_the_squad_leader():
+    raw = load_deck_json(os.path.join(HERE, "narc_deck.json"))
+    deck = draw_deck(raw, "NARC")
+    assert deck.size == sum(int(g.get("duplicates", 1)) for g in raw["goons"]) - 1
+    assert all(c.rank != Rank.SL for c, _ in deck.entries)
+    assert draw_deck(raw, "NARC", duplicates=False).size == len(raw["goons"]) - 1
+
+    enforcer = parse_condition("name=Bruut Enforcer")
+    copies = deck.count(enforcer.pred)
+    p = probability(deck, [enforcer], cards_seen(turn=3))
+    assert p == 1 - Fraction(*_misses(deck.size, copies, 9))
+    assert at_least(deck.size, copies, cards_seen(0)) < p < 1
+
+
+def _misses(population, successes, draws):
+    # P(no copy in `draws` cards), as a product of per-draw misses
+    num = den = 1
+    for i in range(draws):
+        num *= population - successes - i
+        den *= population - i
+    return num, den
@@ -0,0 +1,56 @@
+import os
+import random
+
+from gsg_results import ResultsStore
+from gsg_sweep import SweepParams, init_sweep, work
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def fake_results(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        first = rng.choice(["NARC", "PCU"])
+        winner = rng.choice(["NARC", "PCU", None])
+        yield {
+            "seed": rng.getrandbits(64),
+            "decks": "abc" if i % 4 else "xyz",
+            "first": first,
+            "winner": winner,
+            "turns": rng.randrange(2, 40),
+            "cause": (
+                f"{'Grim' if winner == 'NARC' else 'Lokar Simmons'} took 4 wind" if winner else None
+            ),
+        }
+
+
+def test_batched_inserts_and_queries(tmp_path):
+    rows = list(fake_results(3000))
+    db = str(tmp_path / "results.db")
+    with ResultsStore(db, batch=256) as store:
+        store.add_many(rows)
+    with ResultsStore(db) as store:
+        store.add_many(rows[:10])  # already stored: ignored
+        store.flush()
+        assert store.count() == 3000 and store.count(deck_hash="xyz") == 750
+
+        def expect(winner, first=None, tail=rows):
+            games = [r for r in tail if first is None or r["first"] == first]
+            return sum(r["winner"] == winner for r in games), len(games)
+
+        assert store.win_rate("NARC", first="NARC") == expect("NARC", "NARC")
+        assert store.win_rate("PCU", last=500) == expect("PCU", tail=rows[-500:])
+        assert store.causes(top=1)[0][1] == max(expect("NARC")[0], expect("PCU")[0])
+        (hit,) = store.by_seed(rows[7]["seed"])
+        assert (hit["seed"], hit["winner"]) == (rows[7]["seed"], rows[7]["winner"])
+
+
+def test_sweep_workers_write_to_the_store(tmp_path):
+    params = SweepParams(master_seed=2, games=4, shard_size=2, max_turns=40, decks=HERE)
+    root, db = str(tmp_path / "sweep"), str(tmp_path / "results.db")
+    init_sweep(root, params)
+    assert work(root, db=db) == 2
+    with ResultsStore(db) as store:
+        wins = [store.win_rate(side)[0] for side in ("NARC", "PCU")]
+        assert store.count() == 4 and sum(wins) >= 1
+        assert all("took 4 wind" in c or "destroyed" in c for c, _ in store.causes())
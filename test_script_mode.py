@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_script(text, *extra):
+    return subprocess.run(
+        [sys.executable, "gsg_sim.py", "--seed", "5", "--first", "p1", "--script", "-", *extra],
+        input=text,
+        capture_output=True,
+        text=True,
+        cwd=HERE,
+    )
+
+
+def test_script_renders_once_and_succeeds():
+    res = run_script("# opening\nd 0\ne\ne\n")
+    assert res.returncode == 0, res.stderr
+    assert res.stdout.count("Board P1 (NARC)") == 1
+    assert "NARC pays 1 wind" in res.stdout
+
+
+def test_failed_command_sets_exit_status():
+    res = run_script("d 0\nd 99\nfrobnicate\nshow\ne\n")
+    assert res.returncode == 1
+    assert "script line 2 failed: d 99" in res.stderr
+    assert "script line 3 failed: frobnicate" in res.stderr
+    assert res.stdout.count("Board P1 (NARC)") == 2  # 'show' plus the final render
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Cumulative `python -X importtime` budget for `import gsg_sim`, in milliseconds.
+IMPORT_BUDGET_MS = float(os.environ.get("GSG_IMPORT_BUDGET_MS", "250"))
+
+
+def run(*args, cwd=HERE):
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+    )
+
+
+def import_times(stderr):
+    """Parse -X importtime output into {module: cumulative_us}."""
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        out[name.strip()] = int(cumulative)
+    return out
+
+
+def test_import_is_rich_free_and_within_budget():
+    res = run("-X", "importtime", "-c", "import gsg_sim")
+    assert res.returncode == 0, res.stderr
+    times = import_times(res.stderr)
+    assert not [m for m in times if m.split(".")[0] == "rich"]
+    assert times["gsg_sim"] / 1000 <= IMPORT_BUDGET_MS
+
+
+def test_help_skips_rich_and_decks(tmp_path):
+    # No deck files in tmp_path: building decks before parsing --help would exit 1.
+    res = run("-X", "importtime", os.path.join(HERE, "gsg_sim.py"), "--help", cwd=tmp_path)
+    assert res.returncode == 0
+    assert "--ui" in res.stdout
+    assert not [m for m in import_times(res.stderr) if m.split(".")[0] == "rich"]
+    assert "Deck file not found" not in res.stdout
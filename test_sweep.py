@@ -0,0 +1,24 @@
+import os
+
+from gsg_sweep import SweepParams, _claim, init_sweep, merge_results, run_local, run_serial, work
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_interrupted_sweep_resumes_and_matches_a_serial_run(tmp_path):
+    params = SweepParams(master_seed=5, games=7, shard_size=2, max_turns=12, decks=HERE)
+    root = str(tmp_path / "sweep")
+
+    assert init_sweep(root, params) == 4
+    assert work(root, "w1", max_shards=1) == 1  # then the worker stops
+    shard = _claim(root, "crashed")  # and another one dies mid-shard
+    claim = os.path.join(root, "queue", f"{shard:06d}.crashed")
+    assert init_sweep(root, params) == 3 and os.path.exists(claim)  # a live claim stays
+    done = os.path.join(root, "results", "000000.jsonl")
+    mtime = os.stat(done).st_mtime_ns
+
+    merged = run_local(root, params, workers=2, stale=0)  # no worker left: requeue it
+    assert os.stat(done).st_mtime_ns == mtime  # finished shards are not replayed
+    assert [r["game"] for r in merged] == list(range(7))
+    assert merged == run_serial(params)
+    assert init_sweep(root, params) == 0 and merge_results(root) == merged
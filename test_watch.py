@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+
+from gsg_watch import DeckWatcher
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def edit_deck(path, fn):
+    with open(path, "r", encoding="utf-8") as fh:
+        deck = json.load(fh)
+    fn(deck["goons"])
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(deck, fh)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+
+def test_watcher_rebuilds_only_edited_goons_and_keeps_last_good_version(tmp_path):
+    for name in ("narc_deck.json", "pcu_deck.json"):
+        shutil.copy(os.path.join(HERE, name), tmp_path / name)
+    narc_path = str(tmp_path / "narc_deck.json")
+    watcher = DeckWatcher(str(tmp_path), games=2, max_turns=30)
+
+    assert watcher.step().startswith("decks loaded")
+    assert watcher.step() is None  # nothing touched
+    before = dict(watcher.decks[0].cards)
+
+    def tweak(goons):
+        goons[1]["deploy_cost"] = ["1w"]
+        goons.append(dict(goons[0], name="Copy Auditon"))
+
+    edit_deck(narc_path, tweak)
+    report = watcher.step()
+    changed = list(before)[1]
+    assert report.splitlines()[0] == f"NARC: +Copy Auditon, ~{changed[0]}"
+    after = watcher.decks[0].cards
+    assert after[changed] is not before[changed] and after[changed].deploy_wind == 1
+    assert all(after[k] is before[k] for k in before if k != changed)
+    assert "pts" in report and watcher.last.games == 2
+
+    with open(narc_path, "w", encoding="utf-8") as fh:
+        fh.write("{ not json")
+    assert watcher.step().startswith("error:")
+    assert watcher.step() is None  # reported once, not on every poll
+    assert watcher.decks[0].cards == after
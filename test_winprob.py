@@ -0,0 +1,42 @@
+import os
+
+from gsg_sim import build_cards, card_templates, load_deck_json, setup_game, start_of_turn
+from gsg_winprob import estimate_win_probability, wilson_interval
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def new_game(seed=4):
+    narc = build_cards(load_deck_json(os.path.join(HERE, "narc_deck.json")), faction="NARC")
+    pcu = build_cards(load_deck_json(os.path.join(HERE, "pcu_deck.json")), faction="PCU")
+    gs = setup_game(narc, pcu, seed=seed, first="p1")
+    start_of_turn(gs)
+    return gs, card_templates(narc, pcu)
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+    lo, hi = wilson_interval(50, 100, 1.96)
+    assert lo < 0.5 < hi and abs((hi - lo) / 2 - 0.096) < 0.002
+    lo, hi = wilson_interval(20, 20, 1.96)
+    assert hi == 1.0 and 0.8 < lo < 0.9
+
+
+def test_decided_position_stops_at_min_rollouts():
+    gs, templates = new_game()
+    gs.p2.dead_pool.append(gs.p2.board.pop(0))  # PCU's leader is gone
+    est = estimate_win_probability(
+        gs, templates, workers=0, min_rollouts=8, tolerance=0.2, batch=4, seed=1
+    )
+    assert (est.rollouts, est.p1_win, est.p2_wins) == (8, 1.0, 0)
+    assert est.p1_interval[1] == 1.0 and est.p1_interval[0] > 0.6
+
+
+def test_process_pool_respects_max_rollouts():
+    gs, templates = new_game()
+    est = estimate_win_probability(
+        gs, templates, workers=2, min_rollouts=4, max_rollouts=6, batch=2, tolerance=0, seed=3
+    )
+    assert est.rollouts == 6
+    assert est.p1_wins + est.p2_wins + est.draws == 6
+    assert 0 <= est.p1_interval[0] <= est.p1_win <= est.p1_interval[1] <= 1
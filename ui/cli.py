@@ -1,6 +1,7 @@
 # ui/cli.py
 from __future__ import annotations
-from gsg_sim import GameState, Player, Rank, can_target_card, use_ability
+import sys
+from gsg_sim import GameState, Player, Rank, can_target_card, deploy_from_hand, end_of_turn, requirement_met, use_ability
 
 class CLI:
     def render_board(self, gs: GameState) -> None:
@@ -28,52 +29,71 @@ class CLI:
         card = player.hand[hand_idx]
         if card.rank != Rank.SL and not any(c.rank == Rank.SL for c in player.board):
             self.error("Must deploy Squad Leader first."); return False
-        player.board.append(card); player.hand.pop(hand_idx)
+        if not requirement_met(player, card):
+            self.error(f"Requirement not met: {card.requirement.text}"); return False
+        if not deploy_from_hand(gs, player, hand_idx):  # pays the cost, attaches triggers
+            self.error("Deploy failed (cannot pay the deploy cost)."); return False
         self.info(f"Deployed: {card.name}"); return True
 
-    def _use_ability(self, gs: GameState, player: Player, src_idx: int, a_idx: int, tgt_idx: int | None) -> bool:
+    def _use_ability(self, gs: GameState, player: Player, src_idx: int, a_idx: int, tgt_idx: list[int] | int | None) -> bool:
         enemy = gs.p2 if player is gs.p1 else gs.p1
         if not (0 <= src_idx < len(player.board)): self.error("Invalid source index."); return False
         src = player.board[src_idx]
         try: ability = src.abilities[a_idx]
         except Exception: self.error("Invalid ability index."); return False
-        target = None
-        if tgt_idx is not None:
-            if not (0 <= tgt_idx < len(enemy.board)): self.error("Invalid target index."); return False
-            target = enemy.board[tgt_idx]
-            if not can_target_card(gs, src, target, player, enemy, ability):
+        tgts = [] if tgt_idx is None else [tgt_idx] if isinstance(tgt_idx, int) else list(tgt_idx)
+        for t in tgts:
+            if not (0 <= t < len(enemy.board)): self.error("Invalid target index."); return False
+            if not can_target_card(gs, src, enemy.board[t], player, enemy, ability):
                 self.error("Illegal target."); return False
-        ok = use_ability(gs, player, src_idx, a_idx, tgt_idx if target is not None else None)
+        ok = use_ability(gs, player, src_idx, a_idx, tgts[0] if len(tgts) == 1 else (tgts or None))
         self.info("Ability resolved." if ok else "Ability failed.")
         return ok
 
     def run_loop(self, gs: GameState) -> None:
         self.info("\nType 'help' for commands. 'quit' to exit.")
-        while True:
+        while gs.result is None:
             try: line = input("> ").strip()
             except (EOFError, KeyboardInterrupt): print(); break
-            if not line: continue
-            parts = line.split(); cmd = parts[0].lower()
-            if cmd in ("quit", "exit"): break
-            if cmd == "help":
-                print("Commands:\n  show\n  hand p1|p2\n  deploy p1|p2 HAND_IDX\n  use p1|p2 SRC_IDX ABIL_IDX [TGT_IDX]\n  end\n  quit")
-                continue
-            if cmd == "show": self.render_board(gs); continue
-            if cmd == "hand" and len(parts) >= 2:
-                who = gs.p1 if parts[1].lower() == "p1" else gs.p2
-                self.render_hand(who, "P1" if who is gs.p1 else "P2"); continue
-            if cmd == "deploy" and len(parts) >= 3:
-                who = gs.p1 if parts[1].lower() == "p1" else gs.p2
-                try: idx = int(parts[2])
-                except ValueError: self.error("HAND_IDX must be integer."); continue
-                self._deploy_from_hand(gs, who, idx); continue
-            if cmd == "use" and len(parts) >= 4:
-                who = gs.p1 if parts[1].lower() == "p1" else gs.p2
-                try:
-                    sidx = int(parts[2]); aidx = int(parts[3])
-                    tidx = int(parts[4]) if len(parts) >= 5 else None
-                except ValueError: self.error("Indexes must be integers."); continue
-                self._use_ability(gs, who, sidx, aidx, tidx); continue
-            if cmd == "end":
-                self.info("Turn end placeholder."); continue
-            self.error("Unknown command. Type 'help'.")
\ No newline at end of file
+            if self.execute(gs, line) is None: break
+
+    def run_script(self, gs: GameState, lines) -> int:
+        """Apply commands without redrawing between steps ('show' renders on request).
+        Stops when the game ends and renders the board once at the end; returns 0 if every
+        command succeeded, else 1."""
+        failed = 0
+        for n, raw in enumerate(lines, 1):
+            line = raw.strip(); ok = self.execute(gs, line)
+            if ok is None: break
+            if not ok: failed += 1; print(f"script line {n} failed: {line}", file=sys.stderr)
+            if gs.result is not None: break
+        self.render_board(gs)
+        return 1 if failed else 0
+
+    def execute(self, gs: GameState, line: str) -> bool | None:
+        """Apply one command line: True/False for success/failure, None to quit."""
+        if not line or line.startswith("#"): return True
+        parts = line.split(); cmd = parts[0].lower()
+        if cmd in ("quit", "exit"): return None
+        if cmd == "help":
+            print("Commands:\n  show\n  hand p1|p2\n  deploy p1|p2 HAND_IDX\n  use p1|p2 SRC_IDX ABIL_IDX [TGT_IDX ...]\n  end\n  quit")
+            return True
+        if cmd == "show": self.render_board(gs); return True
+        if cmd == "hand" and len(parts) >= 2:
+            who = gs.p1 if parts[1].lower() == "p1" else gs.p2
+            self.render_hand(who, "P1" if who is gs.p1 else "P2"); return True
+        if cmd == "deploy" and len(parts) >= 3:
+            who = gs.p1 if parts[1].lower() == "p1" else gs.p2
+            try: idx = int(parts[2])
+            except ValueError: self.error("HAND_IDX must be integer."); return False
+            return self._deploy_from_hand(gs, who, idx)
+        if cmd == "use" and len(parts) >= 4:
+            who = gs.p1 if parts[1].lower() == "p1" else gs.p2
+            try:
+                sidx = int(parts[2]); aidx = int(parts[3])
+                tidx = [int(x) for x in parts[4:]] or None
+            except ValueError: self.error("Indexes must be integers."); return False
+            return self._use_ability(gs, who, sidx, aidx, tidx)
+        if cmd == "end":
+            end_of_turn(gs); self.info(f"Turn {gs.turn_number}: {gs.turn_player.name}"); return True
+        self.error("Unknown command. Type 'help'."); return False
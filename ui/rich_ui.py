@@ -8,7 +8,7 @@ try:
 except Exception as e:  # guard: if rich missing, this module should not be imported
     raise
 
-from gsg_sim import GameState, Player, Rank, can_target_card, use_ability
+from gsg_sim import GameState, Player, Rank, can_target_card, deploy_from_hand, requirement_met, use_ability
 
 class RichUI:
     def __init__(self) -> None:
@@ -56,28 +56,30 @@ class RichUI:
         card = player.hand[hand_idx]
         if card.rank != Rank.SL and not any(c.rank == Rank.SL for c in player.board):
             self.error("Must deploy Squad Leader first."); return False
-        player.board.append(card); player.hand.pop(hand_idx)
+        if not requirement_met(player, card):
+            self.error(f"Requirement not met: {card.requirement.text}"); return False
+        if not deploy_from_hand(gs, player, hand_idx):  # pays the cost, attaches triggers
+            self.error("Deploy failed (cannot pay the deploy cost)."); return False
         self.info(f"Deployed: {card.name}"); return True
 
-    def _use_ability(self, gs: GameState, player: Player, src_idx: int, a_idx: int, tgt_idx: int | None) -> bool:
+    def _use_ability(self, gs: GameState, player: Player, src_idx: int, a_idx: int, tgt_idx: list[int] | int | None) -> bool:
         enemy = gs.p2 if player is gs.p1 else gs.p1
         if not (0 <= src_idx < len(player.board)): self.error("Invalid source index."); return False
         src = player.board[src_idx]
         try: ability = src.abilities[a_idx]
         except Exception: self.error("Invalid ability index."); return False
-        target = None
-        if tgt_idx is not None:
-            if not (0 <= tgt_idx < len(enemy.board)): self.error("Invalid target index."); return False
-            target = enemy.board[tgt_idx]
-            if not can_target_card(gs, src, target, player, enemy, ability):
+        tgts = [] if tgt_idx is None else [tgt_idx] if isinstance(tgt_idx, int) else list(tgt_idx)
+        for t in tgts:
+            if not (0 <= t < len(enemy.board)): self.error("Invalid target index."); return False
+            if not can_target_card(gs, src, enemy.board[t], player, enemy, ability):
                 self.error("Illegal target."); return False
-        ok = use_ability(gs, player, src_idx, a_idx, tgt_idx if target is not None else None)
+        ok = use_ability(gs, player, src_idx, a_idx, tgts[0] if len(tgts) == 1 else (tgts or None))
         self.info("Ability resolved." if ok else "Ability failed.")
         return ok
 
     def run_loop(self, gs: GameState) -> None:
         self.info("[bold]Rich UI[/bold] ready. Type 'help', 'quit' to exit.")
-        while True:
+        while gs.result is None:
             try:
                 line = self.console.input("[bold cyan]> [/bold cyan]").strip()
             except (EOFError, KeyboardInterrupt):
@@ -88,7 +90,7 @@ class RichUI:
             if cmd in ("quit", "exit"): break
             if cmd == "help":
                 self.console.print(
-                    "[yellow]Commands[/yellow]: show | hand p1|p2 | deploy p1|p2 HAND_IDX | use p1|p2 SRC_IDX ABIL_IDX [TGT_IDX] | end | quit"
+                    "[yellow]Commands[/yellow]: show | hand p1|p2 | deploy p1|p2 HAND_IDX | use p1|p2 SRC_IDX ABIL_IDX [TGT_IDX ...] | end | quit"
                 ); continue
             if cmd == "show": self.render_board(gs); continue
             if cmd == "hand" and len(parts) >= 2:
@@ -103,7 +105,7 @@ class RichUI:
                 who = gs.p1 if parts[1].lower() == "p1" else gs.p2
                 try:
                     sidx = int(parts[2]); aidx = int(parts[3])
-                    tidx = int(parts[4]) if len(parts) >= 5 else None
+                    tidx = [int(x) for x in parts[4:]] or None
                 except ValueError: self.error("Indexes must be integers."); continue
                 self._use_ability(gs, who, sidx, aidx, tidx); continue
             if cmd == "end":